@@ -1,16 +1,38 @@
-from python import functions, constants, home_page, team_page, year_page, champion_page, week_page, espn_data
+import argparse
+
+from python import build, profiling
 
 # Call the database building functions
+# from python import espn_data
 # version = 4
 # espn_data.fetch_new_data(year=2025, version=version)
-# espn_data.construct_dataframes(version=version)
-# espn_data.create_database(version=version)
+# espn_data.update_database(version=version)
 # espn_data.database_views()
 # espn_data.write_csvs()
 
 # Call the constructing functions
-# home_page.home_page(week=6)
-# champion_page.champion_page()
-# week_page.week_pages()
-# team_page.team_pages()
-# year_page.year_pages()
\ No newline at end of file
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Build every page of the fantasy football website')
+    parser.add_argument('--jobs', type=int, default=1, help='number of worker processes used to render pages (default 1)')
+    parser.add_argument('--force', action='store_true', help='rebuild every page, even if its inputs are unchanged')
+    parser.add_argument('--week', type=int, default=None, help='current week shown on the home page (default: latest week in the data)')
+    parser.add_argument('--no-api', action='store_true', help='do not write the JSON API under api/')
+    parser.add_argument('--no-compress', action='store_true', help='do not write .gz/.br copies of the pages and assets')
+    parser.add_argument('--profile', action='store_true', help=f'time every build stage in one process and write {profiling.REPORT_PATH}')
+    parser.add_argument('--profile-page', metavar='PATH', default=None, help='only render the page at PATH under cProfile and tracemalloc and print the results')
+    args = parser.parse_args()
+
+    if args.profile_page:
+        print(build.profile_page(args.profile_page, week=args.week))
+    elif args.profile:
+        # Pages rendered by worker processes would not be recorded
+        profiling.start()
+        result = build.build(week=args.week, jobs=1, force=args.force, json_api=not args.no_api, compress=not args.no_compress)
+        profile = profiling.stop()
+        profiling.write_report(profile)
+
+        print(build.report(result))
+        print(profiling.summary(profile))
+    else:
+        result = build.build(week=args.week, jobs=args.jobs, force=args.force, json_api=not args.no_api, compress=not args.no_compress)
+        print(build.report(result))
@@ -0,0 +1,63 @@
+import os
+import time
+import argparse
+import tempfile
+
+import pandas as pd
+
+from python import espn_data
+from benchmarks import synthetic, construct_dataframes_baseline
+
+# Times espn_data.construct_dataframes() on a synthetic raw data store, next to the row by row implementation
+# it replaced (see construct_dataframes_baseline.py), after checking that both give the same dataframes
+# Run from the repository root: python -m benchmarks.construct_dataframes
+
+VERSION = 0
+
+def best_time(func, repeat: int):
+    '''
+    Returns the best time of func() over repeat runs in seconds, and the last result
+    '''
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+
+    return best, result
+
+def run(seasons: int = 10, repeat: int = 3) -> dict:
+    '''
+    Builds a synthetic store of the given number of seasons in a temporary folder and returns the best time of
+    construct_dataframes() and of the baseline over repeat runs, with the number of rows they produced.
+
+    Raises AssertionError if the two implementations give different dataframes
+    '''
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            synthetic.write_store(VERSION, years=list(range(2025 - seasons + 1, 2026)))
+
+            seconds, tables = best_time(lambda: espn_data.construct_dataframes(version=VERSION), repeat)
+            baseline_seconds, baseline_tables = best_time(lambda: construct_dataframes_baseline.construct_dataframes(version=VERSION), repeat)
+        finally:
+            os.chdir(cwd)
+
+    for table, data in tables.items():
+        pd.testing.assert_frame_equal(data, baseline_tables[table][data.columns], check_dtype=False)
+
+    return {'seconds':seconds, 'baseline seconds':baseline_seconds, 'rows':{table:len(data) for table, data in tables.items()}}
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark construct_dataframes on a synthetic league history')
+    parser.add_argument('--seasons', type=int, default=10, help='number of synthetic seasons (default 10)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs, the best is reported (default 3)')
+    args = parser.parse_args()
+
+    result = run(seasons=args.seasons, repeat=args.repeat)
+    print(f"construct_dataframes: {result['seconds'] * 1000:.0f} ms for {args.seasons} seasons, "
+          f"baseline {result['baseline seconds'] * 1000:.0f} ms ({result['baseline seconds'] / result['seconds']:.1f}x)")
+    for table, rows in result['rows'].items():
+        print(f'  {table}: {rows} rows')
@@ -0,0 +1,195 @@
+import uuid
+
+import pandas as pd
+
+from python import constants, database, raw_store
+
+# espn_data.construct_dataframes() as it was before it appended to column buffers: one dict per row,
+# and the owner name fix-ups and uuid5s repeated for every row.
+# Kept unchanged as the baseline of benchmarks.construct_dataframes, so the speedup can be measured again.
+
+# Rows of the season tables (teams, drafts, players) from a raw store season payload
+def season_records(year: int, season: dict) -> dict[str, list[dict]]:
+    '''
+    Converts a season payload into rows of the teams, drafts and players tables.
+
+    Every id is a uuid5 of the row's natural key, so loading the same payload twice gives the same rows.
+
+    Returns
+    -------
+    Dict : [Str, List[Dict]]
+    '''
+    records = {'teams':[], 'drafts':[], 'players':[]}
+
+    for pick in season['draft']:
+        team_name = pick['owner']
+        if team_name == 'The':
+            team_name = 'Klapp'
+        elif team_name == 'Noah ':
+            team_name = 'Noah'
+
+        records['drafts'].append(
+            {
+                'draft_pick_id':str(uuid.uuid5(namespace=constants.NAMESPACE, name=f'draft-{year}-{pick["round"]}-{pick["pick"]}')),
+                'player_id':str(uuid.uuid5(namespace=constants.NAMESPACE, name=str(pick['player_id']))),
+                'team_id':str(uuid.uuid5(namespace=constants.NAMESPACE, name=team_name)),
+                'year':year,
+                'round':pick['round'],
+                'pick':pick['pick']
+            }
+        )
+
+    for team in season['teams']:
+        team_name = team['owner']
+        if team_name == 'The':
+            team_name = 'Klapp'
+        elif team_name == 'Noah ':
+            team_name = 'Noah'
+        records['teams'].append(
+            {
+                'team_id':str(uuid.uuid5(namespace=constants.NAMESPACE, name=team_name)),
+                'team_name':team_name
+            }
+        )
+
+    for player in season['players']:
+        if player['default_position_id'] not in [1, 2, 3, 4, 5, 16]:
+            continue
+
+        records['players'].append(
+            {
+                'player_id':str(uuid.uuid5(namespace=constants.NAMESPACE, name=str(player['id']))),
+                'player_name':player['full_name'],
+                'position':constants.DEFAULT_POSITION_MAP[player['default_position_id']]
+            }
+        )
+
+    return records
+
+# Rows of the weekly tables (matchups, games, player_games) from a raw store week payload
+def week_records(year: int, week: int, payload: dict) -> dict[str, list[dict]]:
+    '''
+    Converts a week payload into rows of the matchups, games and player_games tables.
+
+    Ids are uuid5s of (year, week, team) for matchups, (year, week, team, opponent) for games
+    and (year, week, team, player) for player games, so reloading an unchanged week gives the same rows.
+
+    Returns
+    -------
+    Dict : [Str, List[Dict]]
+    '''
+    records = {'matchups':[], 'games':[], 'player_games':[]}
+
+    for matchup in payload['matchups']:
+        home_team = matchup['home_owner']
+        if home_team == 'The':
+            home_team = 'Klapp'
+        elif home_team == 'Noah ':
+            home_team = 'Noah'
+
+        if matchup['away_owner'] is None:
+            away_team = 'Bye'
+        else:
+            away_team = matchup['away_owner']
+        if away_team == 'The':
+            away_team = 'Klapp'
+        elif away_team == 'Noah ':
+            away_team = 'Noah'
+
+        # A team plays at most one matchup a week, but several teams can have a bye in the playoffs
+        matchup_id = str(uuid.uuid5(constants.NAMESPACE, name=f'matchup-{year}-{week}-{home_team}'))
+        home_game_id = str(uuid.uuid5(constants.NAMESPACE, name=f'game-{year}-{week}-{home_team}-{away_team}'))
+        away_game_id = str(uuid.uuid5(constants.NAMESPACE, name=f'game-{year}-{week}-{away_team}-{home_team}'))
+
+        records['matchups'].append(
+            {
+                'matchup_id':matchup_id,
+                'year':year,
+                'week':week,
+                'matchup_type':matchup['matchup_type'],
+                'playoff_flag':matchup['is_playoff'],
+                'home_team_id':str(uuid.uuid5(constants.NAMESPACE, name=home_team)),
+                'home_score':matchup['home_score'],
+                'away_team_id':str(uuid.uuid5(constants.NAMESPACE, name=away_team)),
+                'away_score':matchup['away_score']
+            }
+        )
+
+        records['games'].append(
+            {
+                'game_id':home_game_id,
+                'matchup_id':matchup_id,
+                'team_id':str(uuid.uuid5(constants.NAMESPACE, name=home_team)),
+                'score':matchup['home_score'],
+                'opp_score':matchup['away_score'],
+                'win_flag':int(matchup['home_score'] > matchup['away_score']),
+                'margin':round(matchup['home_score'] - matchup['away_score'], 2)
+            }
+        )
+
+        records['games'].append(
+            {
+                'game_id':away_game_id,
+                'matchup_id':matchup_id,
+                'team_id':str(uuid.uuid5(constants.NAMESPACE, name=away_team)),
+                'score':matchup['away_score'],
+                'opp_score':matchup['home_score'],
+                'win_flag':int(matchup['away_score'] > matchup['home_score']),
+                'margin':round(matchup['away_score'] - matchup['home_score'], 2)
+            }
+        )
+
+        if year > 2018:
+            for team, game_id, lineup in [(home_team, home_game_id, matchup['home_lineup']), (away_team, away_game_id, matchup['away_lineup'])]:
+                for player in lineup:
+                    records['player_games'].append(
+                        {
+                            'player_game_id':str(uuid.uuid5(constants.NAMESPACE, name=f'player-game-{year}-{week}-{team}-{player["player_id"]}')),
+                            'matchup_id':matchup_id,
+                            'game_id':game_id,
+                            'team_id':str(uuid.uuid5(constants.NAMESPACE, name=team)),
+                            'player_id':str(uuid.uuid5(constants.NAMESPACE, name=str(player['player_id']))),
+                            'points':player['points'],
+                            'projected_points':player['projected_points'],
+                            'slot_position':player['slot_position'],
+                            'active_status':player['active_status'],
+                            'bye_week_flag':player['on_bye_week']
+                        }
+                    )
+
+    return records
+
+# Use the raw data store to build a dataframe for each eventual database table
+def construct_dataframes(version: int) -> dict[str, pd.DataFrame]:
+    '''
+    Reads the raw data store one season at a time and produces the following dataframes:
+     - teams
+     - drafts
+     - matchups
+     - games
+     - player_games
+     - players
+    All of which will be converted into tables in the database
+
+    Returns
+    -------
+    Dict : [Str, DataFrame]
+    '''
+    data = {table:[] for table in database.TABLES}
+
+    for year, season, box_scores in raw_store.iter_seasons(version=version):
+        for table, rows in season_records(year, season).items():
+            data[table] += rows
+
+        for week, payload in box_scores.items():
+            for table, rows in week_records(year, week, payload).items():
+                data[table] += rows
+
+    df_teams = pd.DataFrame(data['teams']).drop_duplicates().reset_index(drop=True)
+    df_drafts = pd.DataFrame(data['drafts'])
+    df_players = pd.DataFrame(data['players']).drop_duplicates('player_id', keep='last').reset_index(drop=True)
+    df_matchups = pd.DataFrame(data['matchups'])
+    df_games = pd.DataFrame(data['games'])
+    df_player_games = pd.DataFrame(data['player_games'])
+
+    return {'teams':df_teams, 'drafts':df_drafts, 'matchups':df_matchups, 'games':df_games, 'player_games':df_player_games, 'players':df_players}
@@ -0,0 +1,79 @@
+import os
+import sys
+import time
+import shutil
+import sqlite3
+import argparse
+import tempfile
+
+from python import database, espn_data
+
+# Times reading every CSV view of the database without indexes, with indexes and with the heavy views materialized
+# Run from the repository root: python -m benchmarks.database_views [path to database]
+
+VIEWS = ['game_data', 'matchup_data', 'draft_data', 'player_matchup_data', 'player_game_data']
+
+def time_views(path: str, repeat: int = 3) -> dict[str, float]:
+    '''
+    Best time in seconds of reading every row of each view, over repeat runs
+    '''
+    conn = sqlite3.connect(path)
+
+    timings = {}
+    for view in VIEWS:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            conn.execute(f'SELECT * FROM {view}').fetchall()
+            best = min(best, time.perf_counter() - start)
+        timings[view] = best
+
+    conn.close()
+
+    return timings
+
+def run(path: str, repeat: int = 3) -> dict[str, dict[str, float]]:
+    '''
+    Benchmarks a copy of the database at path in three configurations. The database itself is not changed
+    '''
+    results = {}
+
+    with tempfile.TemporaryDirectory() as directory:
+        copy = os.path.join(directory, 'benchmark.db')
+        shutil.copyfile(path, copy)
+
+        conn = database.connect(copy)
+        database.drop_indexes(conn)
+        conn.close()
+        espn_data.database_views(path=copy)
+        results['no indexes'] = time_views(copy, repeat=repeat)
+
+        conn = database.connect(copy)
+        database.create_indexes(conn)
+        conn.execute('ANALYZE')
+        conn.close()
+        results['indexes'] = time_views(copy, repeat=repeat)
+
+        espn_data.database_views(materialize=True, path=copy)
+        results['materialized'] = time_views(copy, repeat=repeat)
+
+    return results
+
+def report(results: dict[str, dict[str, float]]) -> str:
+    configurations = list(results)
+    lines = [f"{'view':<22}" + ''.join(f'{configuration:>15}' for configuration in configurations)]
+    for view in VIEWS:
+        lines.append(f'{view:<22}' + ''.join(f'{results[configuration][view] * 1000:>12.1f} ms' for configuration in configurations))
+
+    return '\n'.join(lines)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the CSV views of the fantasy football database')
+    parser.add_argument('path', nargs='?', default=database.DATABASE_PATH, help=f'database to benchmark (default {database.DATABASE_PATH})')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per query, the best is reported (default 3)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.path):
+        sys.exit(f'{args.path} does not exist, build it with espn_data.update_database() first')
+
+    print(report(run(args.path, repeat=args.repeat)))
@@ -0,0 +1,273 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from python import constants, functions, standings, build, week_page, playoff_odds, all_play
+from benchmarks import synthetic
+
+# Times the hot paths of the site build on a synthetic league of any size, e.g. 50 seasons of 32 teams,
+# and stores the results so runs before and after a change can be compared.
+#
+# Run from the repository root:
+#     python -m benchmarks.suite --seasons 50 --teams 32
+#     python -m benchmarks.suite --compare benchmarks/results/<earlier run>.json
+#
+# Results are written to benchmarks/results/{time}-{commit}.json
+
+RESULTS_DIR = 'benchmarks/results'
+
+# Files the pages link to, copied next to the synthetic data so the full build can run
+SITE_FILES = ['style.css', 'script.js', 'Assets/Fantasy-Football-App-LOGO.png']
+
+def measure(func, repeat: int) -> dict:
+    '''
+    Runs func repeat times and returns the best and mean time in milliseconds
+    '''
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    return {'best_ms':round(min(times) * 1000, 3), 'mean_ms':round(sum(times) / len(times) * 1000, 3), 'runs':repeat}
+
+def setup(directory: str, seasons: int, teams: int, seed: int) -> None:
+    '''
+    Writes the synthetic data tables and the site's static files into directory and makes it the working directory
+    '''
+    for path in SITE_FILES:
+        os.makedirs(os.path.join(directory, os.path.dirname(path)), exist_ok=True)
+        shutil.copyfile(path, os.path.join(directory, path))
+
+    os.chdir(directory)
+    frames = synthetic.league_frames(seasons=seasons, teams=teams, seed=seed)
+    synthetic.write_csvs(frames)
+
+    constants.COLOR_DICT.update(synthetic.team_colors(synthetic.team_names(teams)))
+    constants.reload()
+
+def benchmarks() -> dict:
+    '''
+    {name: function} of every benchmark, run on the loaded synthetic tables. Functions returning dominate tags
+    are rendered too, since that is part of their cost in a page build
+    '''
+    game_data = constants.GAME_DATA
+    years = [year for year, _ in constants.YEARS_WEEKS]
+    last_year, last_week = constants.YEARS_WEEKS[-1]
+    seasons = [standings.standings(year=year) for year in years]
+    all_seasons = pd.concat(seasons)
+    player_games = constants.PLAYER_GAME_DATA
+
+    def summary_tables():
+        for year, weeks in constants.YEARS_WEEKS:
+            functions.summary_table(game_data, year=year)
+            functions.summary_table(game_data, year=year, week=weeks // 2)
+
+    def scatter():
+        for data in seasons:
+            functions.df_to_svg(data, x_col='Points For', y_col='Points Against', chart_type='scatter').render()
+
+    def bar():
+        for team in constants.TEAMS:
+            data = all_seasons.loc[all_seasons['Team'] == team]
+            functions.df_to_svg(data, x_col='Year', y_col='Luck Score', chart_type='bar', x_tick_spacing=1, y_tick_spacing=2).render()
+
+    def line():
+        for team in constants.TEAMS:
+            data = all_seasons.loc[all_seasons['Team'] == team]
+            functions.df_to_svg(data, x_col='Year', y_col='Points For', chart_type='line', x_tick_spacing=1).render()
+
+    def all_play_seasons():
+        for year in years:
+            all_play.season_arrays(year)
+
+    def brackets():
+        for year in years:
+            functions.playoff_bracket_svg(constants.MATCHUP_DATA, year=year).render()
+
+    return {
+        'summary_table':summary_tables,
+        'standings_cube':lambda: functions.standings_cube(game_data),
+        'df_to_table standings':lambda: [functions.df_to_table(data, champ_class=True).render() for data in seasons],
+        'df_to_table player games':lambda: functions.df_to_table(player_games.loc[player_games['Year'] == last_year]).render(),
+        'df_to_svg scatter':scatter,
+        'df_to_svg bar':bar,
+        'df_to_svg line':line,
+        'playoff_bracket_svg':brackets,
+        'all_play seasons':all_play_seasons,
+        'playoff_odds 10k':lambda: playoff_odds.season_odds(last_year, max(1, last_week // 2), simulations=10000, seed=0),
+        'week page':lambda: week_page.week_html(year=last_year, week=last_week)
+    }
+
+def build_benchmarks(repeat: int) -> dict:
+    '''
+    Times a full build from freshly loaded tables, then a build in which every page is unchanged
+    '''
+    def full():
+        constants.reload()
+        build.build(force=True, jobs=1, json_api=False, compress=False)
+
+    results = {'full build':measure(full, repeat)}
+    results['unchanged build'] = measure(lambda: build.build(jobs=1, json_api=False, compress=False), repeat)
+    results['full build']['pages'] = len(build.page_tasks(week=constants.YEARS_WEEKS[-1][1]))
+
+    return results
+
+def construct_dataframes_benchmark(seasons: int, repeat: int) -> dict:
+    '''
+    Times espn_data.construct_dataframes(), which needs the espn_api package, see benchmarks.construct_dataframes
+    '''
+    try:
+        from benchmarks import construct_dataframes
+    except ImportError as error:
+        return {'skipped':str(error)}
+
+    result = construct_dataframes.run(seasons=seasons, repeat=repeat)
+
+    return {
+        'best_ms':round(result['seconds'] * 1000, 3),
+        'baseline_ms':round(result['baseline seconds'] * 1000, 3),
+        'runs':repeat,
+        'rows':sum(result['rows'].values())
+    }
+
+def commit() -> str | None:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run(seasons: int = 10, teams: int = 12, repeat: int = 3, seed: int = 0, only: list[str] = None) -> dict:
+    '''
+    Runs the benchmark suite on a synthetic league.
+
+    Parameters
+    ----------
+    seasons, teams : int
+        Size of the synthetic league, see synthetic.league_frames().
+
+    repeat : int, default 3
+        Runs of each benchmark, the best and mean are reported.
+
+    seed : int, default 0
+        Seed of the synthetic league.
+
+    only : list[str], default None
+        Names of the benchmarks to run, e.g. ['df_to_svg bar', 'full build']. If set to None, every benchmark is run.
+
+    Returns
+    -------
+    dict
+        {'config': ..., 'environment': ..., 'results': {benchmark: {'best_ms', 'mean_ms', 'runs', ...}}}
+    '''
+    cwd = os.getcwd()
+    colors = dict(constants.COLOR_DICT)
+    results = {}
+
+    def wanted(name):
+        return only is None or name in only
+
+    with tempfile.TemporaryDirectory() as directory:
+        try:
+            setup(directory, seasons=seasons, teams=teams, seed=seed)
+
+            for name, func in benchmarks().items():
+                if wanted(name):
+                    results[name] = measure(func, repeat)
+
+            if wanted('full build') or wanted('unchanged build'):
+                results.update(build_benchmarks(repeat))
+        finally:
+            os.chdir(cwd)
+            constants.COLOR_DICT.clear()
+            constants.COLOR_DICT.update(colors)
+            constants.reload()
+
+    if wanted('construct_dataframes'):
+        results['construct_dataframes'] = construct_dataframes_benchmark(seasons=seasons, repeat=repeat)
+
+    return {
+        'config':{'seasons':seasons, 'teams':teams, 'repeat':repeat, 'seed':seed},
+        'environment':{
+            'time':datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'commit':commit(),
+            'python':platform.python_version(),
+            'pandas':pd.__version__,
+            'numpy':np.__version__,
+            'machine':platform.machine()
+        },
+        'results':results
+    }
+
+def write_result(result: dict, directory: str = RESULTS_DIR) -> str:
+    '''
+    Writes a run() result as JSON and returns its path
+    '''
+    os.makedirs(directory, exist_ok=True)
+    stamp = result['environment']['time'].replace(':', '').replace('-', '').removesuffix('+0000')
+    path = os.path.join(directory, f"{stamp}-{result['environment']['commit'] or 'nogit'}.json")
+
+    with open(path, 'w') as file:
+        json.dump(result, file, indent=2)
+        file.write('\n')
+
+    return path
+
+def summary(result: dict, baseline: dict = None) -> str:
+    '''
+    Table of a run() result, with the ratio to the best times of baseline when given (below 1 is faster)
+    '''
+    config = result['config']
+    lines = [f"{config['seasons']} seasons, {config['teams']} teams, best of {config['repeat']}"]
+    if baseline is not None:
+        lines.append(f"compared with {baseline['environment']['commit']} ({baseline['environment']['time']})")
+        if baseline['config'] != config:
+            lines.append(f"warning: baseline config differs: {baseline['config']}")
+
+    lines.append(f"{'benchmark':<28}{'best ms':>12}{'mean ms':>12}" + (f"{'baseline':>12}{'ratio':>8}" if baseline else ''))
+    for name, record in result['results'].items():
+        if 'skipped' in record:
+            lines.append(f"{name:<28}  skipped: {record['skipped']}")
+            continue
+
+        line = f"{name:<28}{record['best_ms']:>12.1f}{record.get('mean_ms', record['best_ms']):>12.1f}"
+        previous = (baseline or {}).get('results', {}).get(name, {})
+        if 'best_ms' in previous:
+            line += f"{previous['best_ms']:>12.1f}{record['best_ms'] / previous['best_ms']:>8.2f}"
+        if 'baseline_ms' in record:
+            line += f"  (replaced implementation {record['baseline_ms']:.1f} ms)"
+        lines.append(line)
+
+    return '\n'.join(lines)
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Benchmark the site build on a synthetic league')
+    parser.add_argument('--seasons', type=int, default=10, help='number of synthetic seasons (default 10)')
+    parser.add_argument('--teams', type=int, default=12, help='number of synthetic teams (default 12)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs of each benchmark (default 3)')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the synthetic league (default 0)')
+    parser.add_argument('--only', nargs='+', metavar='NAME', help='benchmarks to run, e.g. "df_to_svg bar" "full build"')
+    parser.add_argument('--compare', metavar='FILE', help='earlier result to compare with')
+    parser.add_argument('--no-save', action='store_true', help=f'do not write the result to {RESULTS_DIR}')
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+
+    result = run(seasons=args.seasons, teams=args.teams, repeat=args.repeat, seed=args.seed, only=args.only)
+    print(summary(result, baseline=baseline))
+
+    if not args.no_save:
+        print(f'Saved {write_result(result)}', file=sys.stderr)
@@ -0,0 +1,252 @@
+import os
+import uuid
+import random
+
+import numpy as np
+import pandas as pd
+
+from python import constants, raw_store
+
+# Synthetic league history at any scale, for the benchmarks:
+#  - season_payloads() / write_store(): raw data store payloads, see raw_store.season_payload() and raw_store.week_payload()
+#  - league_frames() / write_csvs(): the data tables the site is built from, see constants.DATA_FILES
+
+# Owner names include the raw ESPN spellings fixed by constants.OWNER_NAMES
+
+OWNERS = ['Andrew', 'McGwire', 'Tyler', 'Noah ', 'Michael', 'Haris', 'Dante', 'Nathan', 'Kevin', 'Ethan', 'Zach', 'Carter', 'Justin', 'The', 'Jackson']
+
+# Starting slots, then the bench
+SLOTS = ['QB', 'RB', 'RB', 'WR', 'WR', 'TE', 'RB/WR/TE', 'D/ST', 'K'] + ['BE'] * 7
+
+# ESPN defaultPositionId of the pro players, 7 (punter) is filtered out like on ESPN
+POSITION_IDS = [1, 2, 2, 3, 3, 3, 4, 5, 7, 16]
+
+def season_payloads(
+        year: int,
+        teams: int = 12,
+        regular_weeks: int = 14,
+        playoff_weeks: int = 3,
+        players: int = 1200,
+        seed: int = 0
+) -> tuple[dict, dict[int, dict]]:
+    '''
+    Generates one season: the season payload and {week: week payload}.
+
+    Every week each team plays one matchup with a full lineup. In the playoffs the top four teams play in the
+    winners bracket and the rest in the consolation bracket, with a bye for two teams in the first playoff week.
+    '''
+    rng = random.Random(f'{seed}-{year}')
+    owners = rng.sample(OWNERS, teams)
+
+    season = {
+        'year':year,
+        'teams':[{'owner':owner} for owner in owners],
+        'draft':[
+            {'owner':owners[pick % teams], 'player_id':pick, 'round':pick // teams + 1, 'pick':pick % teams + 1}
+            for pick in range(16 * teams)
+        ],
+        'players':[
+            {'id':player, 'full_name':f'Player {player}', 'default_position_id':rng.choice(POSITION_IDS)}
+            for player in range(players)
+        ]
+    }
+
+    def lineup():
+        return [
+            {
+                'player_id':rng.randrange(players),
+                'points':round(rng.uniform(0, 30), 2),
+                'projected_points':round(rng.uniform(0, 25), 2),
+                'slot_position':slot,
+                'active_status':'active',
+                'on_bye_week':False
+            }
+            for slot in SLOTS
+        ]
+
+    def matchup(home, away, matchup_type, is_playoff):
+        return {
+            'matchup_type':matchup_type,
+            'is_playoff':is_playoff,
+            'home_owner':home,
+            'home_score':round(rng.uniform(60, 160), 2),
+            'away_owner':away,
+            'away_score':0 if away is None else round(rng.uniform(60, 160), 2),
+            'home_lineup':lineup(),
+            'away_lineup':[] if away is None else lineup()
+        }
+
+    weeks = {}
+    for week in range(1, regular_weeks + playoff_weeks + 1):
+        order = rng.sample(owners, teams)
+        matchups = []
+
+        if week <= regular_weeks:
+            matchups = [matchup(order[i], order[i + 1], 'NONE', False) for i in range(0, teams - 1, 2)]
+        else:
+            winners, losers = order[:4], order[4:]
+            if week == regular_weeks + 1:
+                matchups += [matchup(winners[0], None, 'WINNERS_BRACKET', True), matchup(winners[1], None, 'WINNERS_BRACKET', True)]
+                matchups += [matchup(winners[2], winners[3], 'WINNERS_BRACKET', True)]
+            else:
+                matchups += [matchup(winners[i], winners[i + 1], 'WINNERS_BRACKET', True) for i in range(0, 4, 2)]
+            matchups += [matchup(losers[i], losers[i + 1], 'LOSERS_CONSOLATION_LADDER', True) for i in range(0, len(losers) - 1, 2)]
+
+        weeks[week] = {'year':year, 'week':week, 'matchups':matchups}
+
+    return season, weeks
+
+def write_store(version: int, years: list[int], seed: int = 0, **kwargs) -> None:
+    '''
+    Writes a synthetic history into the raw data store under the current directory
+    '''
+    index = raw_store.read_index(version)
+    for year in years:
+        season, weeks = season_payloads(year, seed=seed, **kwargs)
+        raw_store.write_season(version, year, season, index=index)
+        for week, payload in weeks.items():
+            raw_store.write_week(version, year, week, payload, index=index)
+
+    raw_store.write_index(version, index)
+
+# Starting lineup as it appears in PLAYER_MATCHUP_DATA, with the slot and player position of each row
+LINEUP_POSITIONS = ['QB', 'RB1', 'RB2', 'WR1', 'WR2', 'TE', 'FLEX', 'D/ST', 'K']
+LINEUP_SLOTS = ['QB', 'RB', 'RB', 'WR', 'WR', 'TE', 'RB/WR/TE', 'D/ST', 'K']
+PLAYER_POSITIONS = ['QB', 'RB', 'RB', 'WR', 'WR', 'TE', 'WR', 'D/ST', 'K']
+BENCH_POSITIONS = ['RB', 'WR', 'QB', 'TE', 'RB', 'WR', 'D/ST']
+
+def team_names(teams: int) -> list[str]:
+    '''
+    Names of the synthetic teams: the league's own teams (those in constants.COLOR_DICT) first, then Team 16, Team 17, ...
+    '''
+    names = [name.capitalize() for name in constants.COLOR_DICT][:teams]
+
+    return names + [f'Team {i}' for i in range(len(names) + 1, teams + 1)]
+
+def team_colors(names: list[str]) -> dict[str, str]:
+    '''
+    Colors for the generated team names missing from constants.COLOR_DICT, to be added to it before rendering
+    '''
+    missing = [name.lower() for name in names if name.lower() not in constants.COLOR_DICT]
+
+    return {name:f'hsl({i * 137 % 360}, 60%, 55%)' for i, name in enumerate(missing)}
+
+def league_frames(
+        seasons: int = 8,
+        teams: int = 12,
+        regular_weeks: int = 14,
+        last_year: int = 2025,
+        players: int = 1500,
+        seed: int = 0
+) -> dict[str, pd.DataFrame]:
+    '''
+    Generates the six data tables of constants.DATA_FILES for a synthetic league, with the same columns and row layout
+    as the CSVs written by espn_data.write_csvs().
+
+    Each season has regular_weeks weeks of random pairings, then a three week, six team playoff
+    in which the top two seeds have a bye in the first week.
+
+    Parameters
+    ----------
+    seasons, teams : int
+        Scale of the league, e.g. 50 seasons of 32 teams. At least 6 teams are needed for the playoff.
+
+    regular_weeks : int
+        Regular season weeks per season.
+
+    last_year : int, default 2025
+        Year of the last season. The home page shows 2025.
+
+    players : int
+        Number of distinct player names.
+
+    seed : int
+        Seed of the random generator, the same arguments always give the same tables.
+
+    Returns
+    -------
+    dict[str, pd.DataFrame]
+        {name: table} with the keys of constants.DATA_FILES.
+    '''
+    rng = np.random.default_rng(seed)
+    names = team_names(teams)
+    player_names = np.array([f'Player {i}' for i in range(players)])
+
+    games, matchups, player_games, player_matchups, drafts = [], [], [], [], []
+
+    def score():
+        return round(float(rng.normal(115, 25)), 2)
+
+    def lineup(year, week, team):
+        starters = rng.choice(players, size=len(LINEUP_SLOTS) + len(BENCH_POSITIONS), replace=False)
+        points = np.round(rng.gamma(2.0, 5.0, size=len(starters)), 2)
+        projected = np.round(rng.normal(10, 4, size=len(starters)).clip(0), 2)
+        for i, player in enumerate(starters):
+            starter = i < len(LINEUP_SLOTS)
+            player_games.append((
+                year, week, team, player_names[player],
+                PLAYER_POSITIONS[i] if starter else BENCH_POSITIONS[i - len(LINEUP_SLOTS)],
+                LINEUP_SLOTS[i] if starter else 'BE',
+                points[i], projected[i]
+            ))
+
+        return player_names[starters[:len(LINEUP_SLOTS)]], points[:len(LINEUP_SLOTS)]
+
+    def play(year, week, playoff, home, away):
+        home_score = score()
+        away_score = 0.0 if away is None else score()
+        matchups.append((year, week, int(playoff), home, home_score, 'Bye' if away is None else away, away_score))
+
+        # Bye teams have no name in GAME_DATA, see the teams join in espn_data.database_views()
+        games.append((year, week, int(playoff), home, home_score, away_score, int(home_score > away_score), round(home_score - away_score, 2)))
+        games.append((year, week, int(playoff), None if away is None else away, away_score, home_score, int(away_score > home_score), round(away_score - home_score, 2)))
+
+        home_players, home_points = lineup(year, week, home)
+        if away is None:
+            player_matchups.extend((year, week, home, player, points, position, None, None, None) for player, points, position in zip(home_players, home_points, LINEUP_POSITIONS))
+        else:
+            away_players, away_points = lineup(year, week, away)
+            player_matchups.extend(
+                (year, week, home, home_player, home_point, position, away_point, away_player, away)
+                for home_player, home_point, position, away_point, away_player in zip(home_players, home_points, LINEUP_POSITIONS, away_points, away_players)
+            )
+
+        return home if home_score >= away_score else away
+
+    for year in range(last_year - seasons + 1, last_year + 1):
+        order = list(rng.permutation(names))
+        for pick in range(16 * teams):
+            drafts.append((year, order[pick % teams], player_names[rng.integers(players)], rng.choice(PLAYER_POSITIONS), pick // teams + 1, pick % teams + 1, pick + 1))
+
+        for week in range(1, regular_weeks + 1):
+            order = list(rng.permutation(names))
+            for i in range(0, teams - 1, 2):
+                play(year, week, False, order[i], order[i + 1])
+
+        seeds = list(rng.permutation(names))[:6]
+        play(year, regular_weeks + 1, True, seeds[0], None)
+        third = play(year, regular_weeks + 1, True, seeds[2], seeds[5])
+        fourth = play(year, regular_weeks + 1, True, seeds[3], seeds[4])
+        play(year, regular_weeks + 1, True, seeds[1], None)
+        first = play(year, regular_weeks + 2, True, seeds[0], fourth)
+        second = play(year, regular_weeks + 2, True, seeds[1], third)
+        play(year, regular_weeks + 3, True, first, second)
+
+    frames = {
+        'MATCHUP_DATA':pd.DataFrame(matchups, columns=['Year','Week','Playoff Flag','Home Team','Home Score','Away Team','Away Score']),
+        'GAME_DATA':pd.DataFrame(games, columns=['Year','Week','Playoff Flag','Team','Score','Opp Score','Win','Margin']),
+        'DRAFT_DATA':pd.DataFrame(drafts, columns=['Year','Team','Player','Position','Round','Pick','Overall Pick']),
+        'PLAYER_MATCHUP_DATA':pd.DataFrame(player_matchups, columns=['Year','Week','Home Team','Home Player','Home Player Points','Position','Away Player Points','Away Player','Away Team']),
+        'PLAYER_GAME_DATA':pd.DataFrame(player_games, columns=['Year','Week','Team','Player','Position','Slot Position','Points','Projected Points']),
+        'TEAM_DATA':pd.DataFrame({'team_id':[str(uuid.uuid5(constants.NAMESPACE, name=name)) for name in names], 'team_name':names})
+    }
+
+    return {name:frames[name].astype(constants.DATA_TYPES[name]) for name in constants.DATA_FILES}
+
+def write_csvs(frames: dict[str, pd.DataFrame]) -> None:
+    '''
+    Writes league_frames() to the paths of constants.DATA_FILES under the current directory
+    '''
+    os.makedirs('database', exist_ok=True)
+    for name, data in frames.items():
+        data.to_csv(constants.DATA_FILES[name], index=False)
@@ -0,0 +1,188 @@
+import numpy as np
+import pandas as pd
+
+from python import constants, cache, data_index, standings
+
+# All-play results: every week each team is compared with every other team's score, as if it had played them all.
+# A season is turned once into arrays indexed by [week, team] (see season_tensors()), from which
+#  - all_play() gives the all-play record and expected wins of each team
+#  - schedule_matrix() gives each team's record had it played every other team's schedule
+# are summed for any week of the season.
+
+def season_arrays(year: int) -> dict:
+    '''
+    Builds the all-play arrays of a season's regular season, see season_tensors()
+    '''
+    season = data_index.year_rows(constants.MATCHUP_DATA, year=year)
+    games = season.loc[(season['Playoff Flag'] == False) & (season['Away Team'].astype(str) != 'Bye')]
+
+    home, away = games['Home Team'].astype(str).values, games['Away Team'].astype(str).values
+    teams = np.unique(np.concatenate([home, away]))
+    weeks = np.unique(games['Week'].values)
+
+    week_positions = np.searchsorted(weeks, games['Week'].values)
+    home, away = np.searchsorted(teams, home), np.searchsorted(teams, away)
+    positions = np.arange(len(teams))
+
+    # scores[w, t] is NaN and opponents[w, t] is t itself when t did not play in week w
+    scores = np.full((len(weeks), len(teams)), np.nan)
+    scores[week_positions, home] = games['Home Score'].values
+    scores[week_positions, away] = games['Away Score'].values
+
+    opponents = np.tile(positions, (len(weeks), 1))
+    opponents[week_positions, home] = away
+    opponents[week_positions, away] = home
+    played = opponents != positions
+
+    # All-play: margins[w, a, b] is a's score minus b's in week w, NaN when either did not play.
+    # A team's margin against itself is 0, hence the played teams taken out of the ties
+    margins = scores[:, :, None] - scores[:, None, :]
+    all_play = {
+        'wins':(margins > 0).sum(axis=2),
+        'losses':(margins < 0).sum(axis=2),
+        'ties':(margins == 0).sum(axis=2) - played
+    }
+
+    # Schedule swap: a playing b's schedule meets b's opponent, or b itself in the week b played a.
+    # The diagonal is the record each team actually had
+    swapped = np.broadcast_to(opponents[:, None, :], (len(weeks), len(teams), len(teams)))
+    swapped = np.where(swapped == positions[None, :, None], positions[None, None, :], swapped)
+    swapped_margins = scores[:, :, None] - np.take_along_axis(scores[:, None, :], swapped, axis=2)
+    swapped_margins[~np.broadcast_to(played[:, None, :], swapped_margins.shape)] = np.nan
+    swap = {
+        'wins':swapped_margins > 0,
+        'losses':swapped_margins < 0,
+        'ties':swapped_margins == 0
+    }
+
+    return {
+        'teams':teams.tolist(),
+        'weeks':weeks,
+        'scores':scores,
+        'opponents':opponents,
+        'opponent count':played.sum(axis=1) - 1,
+        'all play':all_play,
+        'swap':swap
+    }
+
+def season_tensors(year: int) -> dict:
+    '''
+    All-play arrays of a season's regular season, cached by (year, data fingerprint) so each season is only built once.
+
+    Teams are in alphabetical order and weeks in increasing order.
+
+    Returns
+    -------
+    dict
+        'teams' and 'weeks' labelling the arrays, then indexed by [week, team]:
+        'scores' (NaN if the team did not play), 'opponents' (the team itself if it did not play),
+        'opponent count' (teams it could be compared with, per week) and 'all play' ({'wins', 'losses', 'ties'}).
+        'swap' holds {'wins', 'losses', 'ties'} indexed by [week, team, team whose schedule is played].
+        Shared by every caller, do not modify.
+    '''
+    key = (year, cache.fingerprint(constants.MATCHUP_DATA))
+
+    return cache.get('all-play', key, lambda: season_arrays(year))
+
+def week_mask(tensors: dict, week: int = None) -> np.ndarray:
+    if week is None:
+        return np.ones(len(tensors['weeks']), dtype=bool)
+
+    return tensors['weeks'] <= week
+
+def record(wins: np.ndarray, losses: np.ndarray, ties: np.ndarray) -> list[str]:
+    '''
+    'W-L' records, 'W-L-T' when there are ties
+    '''
+    return [
+        f'{win}-{loss}-{tie}' if tie else f'{win}-{loss}'
+        for win, loss, tie in zip(wins.tolist(), losses.tolist(), ties.tolist())
+    ]
+
+def all_play(year: int, week: int = None) -> pd.DataFrame:
+    '''
+    All-play records and expected wins of every team in a season.
+
+    A team's expected wins for a week is the share of the other teams it outscored, ties counting as half.
+
+    Parameters
+    ----------
+    year : int
+        Season to pull the results from.
+
+    week : int, default None
+        Last week counted. If set to None, the whole regular season is counted.
+
+    Returns
+    -------
+    pd.DataFrame
+        Team, Record, All-Play Record, All-Play %, Expected Wins and Wins vs Expected (actual minus expected wins),
+        in standings order.
+    '''
+    tensors = season_tensors(year)
+    weeks = week_mask(tensors, week)
+    diagonal = np.arange(len(tensors['teams']))
+
+    wins, losses, ties = (tensors['all play'][result][weeks].sum(axis=0) for result in ['wins','losses','ties'])
+    actual = {result:tensors['swap'][result][weeks][:, diagonal, diagonal].sum(axis=0) for result in ['wins','losses','ties']}
+
+    shares = (tensors['all play']['wins'][weeks] + tensors['all play']['ties'][weeks] / 2) / tensors['opponent count'][weeks, None].clip(1)
+    expected = shares.sum(axis=0)
+    games = wins + losses + ties
+
+    result = pd.DataFrame({
+        'Team':tensors['teams'],
+        'Record':record(actual['wins'], actual['losses'], actual['ties']),
+        'All-Play Record':record(wins, losses, ties),
+        'All-Play %':[f'{share:.1%}' for share in ((wins + ties / 2) / np.maximum(games, 1)).tolist()],
+        'Expected Wins':expected.round(2),
+        'Wins vs Expected':(actual['wins'] + actual['ties'] / 2 - expected).round(2)
+    })
+
+    order = standings.standings(year=year, week=week)['Team'].astype(str).tolist()
+
+    return result.set_index('Team').reindex(order).dropna().reset_index()
+
+def schedule_matrix(year: int, week: int = None) -> pd.DataFrame:
+    '''
+    Record of every team had it played every other team's schedule, e.g. row Kevin, column Zach: Kevin's record
+    against Zach's opponents, and against Zach himself in the weeks Zach played Kevin.
+
+    Parameters
+    ----------
+    year : int
+        Season to pull the results from.
+
+    week : int, default None
+        Last week counted. If set to None, the whole regular season is counted.
+
+    Returns
+    -------
+    pd.DataFrame
+        One row per team with a Team column, then one column per schedule, in standings order.
+        The diagonal holds the actual records.
+    '''
+    tensors = season_tensors(year)
+    weeks = week_mask(tensors, week)
+    teams = tensors['teams']
+
+    wins, losses, ties = (tensors['swap'][result][weeks].sum(axis=0) for result in ['wins','losses','ties'])
+    records = np.array(record(wins.ravel(), losses.ravel(), ties.ravel()), dtype=object).reshape(len(teams), len(teams))
+
+    order = [team for team in standings.standings(year=year, week=week)['Team'].astype(str) if team in teams]
+    positions = [teams.index(team) for team in order]
+
+    matrix = pd.DataFrame(records[np.ix_(positions, positions)], columns=order)
+    matrix.insert(0, 'Team', order)
+
+    return matrix
+
+def all_play_dependencies(year: int) -> list:
+    '''
+    Data read by all_play() and schedule_matrix() for a season, used by the build manifest of the pages showing them:
+    the season's matchups, and its games for the standings order
+    '''
+    return [
+        data_index.year_rows(constants.MATCHUP_DATA, year=year),
+        data_index.year_rows(constants.GAME_DATA, year=year)
+    ]
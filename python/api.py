@@ -0,0 +1,145 @@
+import os
+import json
+import hashlib
+
+import pandas as pd
+
+from python import functions, constants, data_index, standings, assets
+
+# Static JSON API written next to the site by build.build():
+#
+#     api/manifest.json                       version and the hash of every file below
+#     api/seasons/{year}.json                 final standings and champion of a season
+#     api/seasons/{year}/weeks/{week}.json    standings as of a week and that week's matchups
+#     api/teams/{team}.json                   a team's final standings of every season and all its games
+#
+# Files are compact JSON with a .gz sibling, and a .br sibling when the brotli package is installed.
+# Tables are encoded as {'columns': [...], 'rows': [[...], ...]}.
+# API_VERSION changes whenever the layout of a file changes in a way clients would notice.
+
+API_VERSION = 1
+API_ROOT = 'api'
+MANIFEST_PATH = f'{API_ROOT}/manifest.json'
+
+def encode(payload: dict) -> bytes:
+    return json.dumps(payload, separators=(',',':'), ensure_ascii=False, allow_nan=False).encode()
+
+def table_json(data: pd.DataFrame) -> dict:
+    '''
+    Encodes a DataFrame as columns and rows of plain values, with missing values as null
+    '''
+    data = data.astype(object).where(data.notna(), None)
+
+    return {'columns':list(data.columns), 'rows':data.values.tolist()}
+
+def season_json(year: int) -> dict:
+    final = standings.standings(year=year)
+    champion = final.loc[final['Champ Flag'] == 1, 'Team']
+
+    return {
+        'version':API_VERSION,
+        'year':year,
+        'weeks':dict(constants.YEARS_WEEKS)[year],
+        'champion':champion.item() if len(champion) else None,
+        'standings':table_json(final)
+    }
+
+def week_json(year: int, week: int) -> dict:
+    return {
+        'version':API_VERSION,
+        'year':int(year),
+        'week':int(week),
+        'standings':table_json(standings.standings(year=year, week=week)),
+        'matchups':table_json(data_index.year_week_rows(constants.MATCHUP_DATA, year, week))
+    }
+
+def team_json(team: str) -> dict:
+    seasons = pd.concat([standings.standings(year=year) for year in constants.YEARS])
+
+    return {
+        'version':API_VERSION,
+        'team':team,
+        'seasons':table_json(seasons.loc[seasons['Team'] == team]),
+        'games':table_json(data_index.team_rows(constants.GAME_DATA, team))
+    }
+
+def api_files() -> dict[str, dict]:
+    '''
+    Builds every API file except the manifest as {path: payload}, with paths relative to the site root
+    '''
+    files = {}
+
+    for year, weeks in constants.YEARS_WEEKS:
+        files[f'{API_ROOT}/seasons/{year}.json'] = season_json(year)
+        for week in range(1, weeks + 1):
+            files[f'{API_ROOT}/seasons/{year}/weeks/{week}.json'] = week_json(year, week)
+
+    for team in constants.TEAMS:
+        files[f'{API_ROOT}/teams/{team}.json'] = team_json(team)
+
+    return files
+
+def read_manifest() -> dict:
+    if not os.path.exists(MANIFEST_PATH):
+        return {}
+
+    with open(MANIFEST_PATH) as file:
+        return json.load(file)
+
+def write_encoded(path: str, content: bytes) -> bool:
+    '''
+    Writes content to path with its precompressed .gz (and .br) siblings. Returns whether path changed
+    '''
+    written = functions.write_bytes(path, content)
+    assets.compress(path, content)
+
+    return written
+
+def build_api(force: bool = False) -> dict[str, list[str]]:
+    '''
+    Writes the JSON API from the cached standings and the data index, skipping files whose content is unchanged.
+
+    Parameters
+    ----------
+    force : bool, default False
+        Encode every file again, ignoring the hashes in the existing manifest. Files whose content did not change are still left untouched.
+
+    Returns
+    -------
+    dict[str, list[str]]
+        {'written': paths of rewritten files, 'skipped': paths of unchanged files}
+    '''
+    previous = {} if force else read_manifest().get('files', {})
+
+    written = []
+    skipped = []
+    hashes = {}
+
+    for path, payload in api_files().items():
+        content = encode(payload)
+        name = path.removeprefix(f'{API_ROOT}/')
+        hashes[name] = hashlib.sha256(content).hexdigest()[:16]
+
+        if previous.get(name) == hashes[name] and os.path.exists(path):
+            skipped.append(path)
+        elif write_encoded(path, content):
+            written.append(path)
+        else:
+            skipped.append(path)
+
+    manifest = {
+        'version':API_VERSION,
+        'seasons':{
+            str(year):{
+                'path':f'seasons/{year}.json',
+                'weeks':[f'seasons/{year}/weeks/{week}.json' for week in range(1, weeks + 1)]
+            }
+            for year, weeks in constants.YEARS_WEEKS
+        },
+        'teams':{team:f'teams/{team}.json' for team in constants.TEAMS},
+        'files':hashes
+    }
+
+    write_encoded(MANIFEST_PATH, encode(manifest))
+
+    return {'written':written, 'skipped':skipped}
@@ -0,0 +1,114 @@
+import os
+import re
+import gzip
+import shutil
+import hashlib
+from functools import lru_cache
+
+from python import functions, constants
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Static files referenced by every page. Each is served under a name containing a hash of its content,
+# e.g. style.3f2a9c1e.css, so browsers can cache it indefinitely and still see changes
+ASSETS = ['style.css', 'script.js', 'Assets/Fantasy-Football-App-LOGO.png']
+
+# Only text files are worth compressing, the logo is already compressed
+COMPRESSED_TYPES = ['.html', '.css', '.js', '.json', '.svg']
+
+@lru_cache(maxsize=None)
+def asset_hash(path: str) -> str:
+    with open(path, 'rb') as file:
+        return hashlib.sha256(file.read()).hexdigest()[:8]
+
+def hashed_name(path: str) -> str:
+    '''
+    Fingerprinted name of an asset, e.g. 'style.css' -> 'style.3f2a9c1e.css'
+    '''
+    root, extension = os.path.splitext(path)
+
+    return f'{root}.{asset_hash(path)}{extension}'
+
+def asset_path(path: str) -> str:
+    '''
+    URL of an asset from ASSETS, used by the pages instead of the asset's own name
+    '''
+    return f'{constants.ROOT}{hashed_name(path)}'
+
+def assets_hash() -> str:
+    '''
+    Hash of every asset's content, part of build.shared_hash() since every page links to the hashed names
+    '''
+    return ','.join(hashed_name(path) for path in ASSETS)
+
+def write_assets() -> list[str]:
+    '''
+    Copies every asset to its hashed name and removes copies of older versions. Returns the paths written
+    '''
+    written = []
+
+    for path in ASSETS:
+        target = hashed_name(path)
+        if not os.path.exists(target):
+            shutil.copyfile(path, target)
+            written.append(target)
+
+        # Older versions look like the current one with a different hash
+        root, extension = os.path.splitext(path)
+        folder = os.path.dirname(path) or '.'
+        pattern = re.compile(rf'{re.escape(os.path.basename(root))}\.[0-9a-f]{{8}}{re.escape(extension)}(\.gz|\.br)?')
+        for name in os.listdir(folder):
+            stale = os.path.join(folder, name) if folder != '.' else name
+            if pattern.fullmatch(name) and not stale.startswith(target):
+                os.remove(stale)
+
+    return written
+
+def compress(path: str, content: bytes = None) -> list[str]:
+    '''
+    Writes the precompressed .gz sibling of a file, and a .br sibling when the brotli package is installed.
+    Returns the paths written, siblings which already hold the same content are left alone
+    '''
+    if content is None:
+        with open(path, 'rb') as file:
+            content = file.read()
+
+    # mtime=0 keeps the .gz identical between builds of the same content, so it is not rewritten
+    siblings = {f'{path}.gz':gzip.compress(content, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        siblings[f'{path}.br'] = brotli.compress(content)
+
+    return [sibling for sibling, compressed in siblings.items() if functions.write_bytes(sibling, compressed)]
+
+def compress_files(paths: list[str], force: bool = False) -> list[str]:
+    '''
+    Compresses the given files which are of a COMPRESSED_TYPES type.
+
+    Parameters
+    ----------
+    paths : list[str]
+        Files to compress.
+
+    force : bool, default False
+        Compress every file. Otherwise only files whose .gz sibling is missing or older than the file are compressed.
+
+    Returns
+    -------
+    list[str]
+        Paths of the compressed siblings written.
+    '''
+    written = []
+
+    for path in paths:
+        if os.path.splitext(path)[1] not in COMPRESSED_TYPES:
+            continue
+
+        if not force and os.path.exists(f'{path}.gz') and os.path.getmtime(f'{path}.gz') >= os.path.getmtime(path):
+            continue
+
+        written += compress(path)
+
+    return written
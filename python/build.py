@@ -0,0 +1,296 @@
+import os
+import sys
+import json
+import hashlib
+import warnings
+import multiprocessing
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+from python import functions, constants, cache, standings, document, page_header, api, assets, profiling, writer, playoff_odds, all_play, data_index
+from python import home_page, champion_page, week_page, team_page, year_page
+
+# Records the input hash of every page written by the last build, see build().
+# Kept with the data cache rather than in the site root, which is published as is
+MANIFEST_PATH = os.path.join(constants.DATA_CACHE_DIR, 'build-manifest.json')
+
+# {process id: cache.STATS} of the worker processes of the last build, see render_tasks()
+WORKER_CACHE_STATS = {}
+
+# Modules whose code affects every page
+SHARED_MODULES = [functions, constants, cache, data_index, standings, document, page_header, assets, playoff_odds, all_play]
+
+def page_tasks(week: int) -> list[tuple[str, callable, dict, callable]]:
+    '''
+    Lists every page of the site as (output path, render function, keyword arguments, dependencies function).
+
+    Every render function returns the page HTML as a string and can run independently once the data is loaded.
+    The dependencies function takes the same keyword arguments and returns the data slices the page is built from.
+
+    Parameters
+    ----------
+    week : int
+        Current week of the latest season, used by the home page.
+    '''
+    tasks = [
+        ('index.html', home_page.home_html, {'week':week}, home_page.home_dependencies),
+        ('champion.html', champion_page.champion_html, {}, champion_page.champion_dependencies)
+    ]
+
+    for year, weeks in constants.YEARS_WEEKS:
+        for i in range(1, weeks + 1):
+            tasks.append((f'seasons/{year}/week-{i}.html', week_page.week_html, {'year':year, 'week':i}, week_page.week_dependencies))
+
+    for team in constants.TEAMS:
+        tasks.append((f'teams/{team}.html', team_page.team_html, {'team':team}, team_page.team_dependencies))
+
+    for year in constants.YEARS:
+        tasks.append((f'seasons/{year}/index.html', year_page.year_html, {'year':year}, year_page.year_dependencies))
+
+    return tasks
+
+def source_hash(modules: list) -> str:
+    digest = hashlib.sha256()
+    for module in modules:
+        with open(module.__file__, 'rb') as file:
+            digest.update(file.read())
+
+    return digest.hexdigest()
+
+def shared_hash() -> str:
+    '''
+    Hash of everything every page depends on: the shared code, the site root, the asset names and the navbar contents
+    '''
+    digest = hashlib.sha256()
+    digest.update(source_hash(SHARED_MODULES).encode())
+    digest.update(constants.ROOT.encode())
+    digest.update(assets.assets_hash().encode())
+    digest.update(page_header.nav_fingerprint().encode())
+
+    return digest.hexdigest()
+
+def task_hash(task: tuple[str, callable, dict, callable], shared: str) -> str:
+    '''
+    Hash of a page's inputs: the shared hash, the code of its page module, its arguments and its data slices
+    '''
+    path, render, kwargs, dependencies = task
+
+    digest = hashlib.sha256()
+    digest.update(shared.encode())
+    digest.update(source_hash([sys.modules[render.__module__]]).encode())
+    digest.update(repr(sorted(kwargs.items())).encode())
+    for data in dependencies(**kwargs):
+        digest.update(cache.hash_data(data, index=False).encode())
+
+    return digest.hexdigest()
+
+def read_manifest() -> dict[str, str]:
+    if not os.path.exists(MANIFEST_PATH):
+        return {}
+
+    with open(MANIFEST_PATH) as file:
+        return json.load(file)
+
+def write_manifest(hashes: dict[str, str]) -> None:
+    functions.write_file(MANIFEST_PATH, json.dumps(hashes, indent=2, sort_keys=True) + '\n')
+
+def render_task(task: tuple[str, callable, dict, callable]) -> tuple[str, str]:
+    '''
+    Renders a single page from page_tasks(). Returns the output path and the HTML
+    '''
+    path, render, kwargs, _ = task
+    with profiling.stage(f"page: {render.__module__.split('.')[-1]}"):
+        return path, render(**kwargs)
+
+def worker_render_task(task: tuple[str, callable, dict, callable]) -> tuple[str, str, int, dict]:
+    '''
+    render_task() in a worker process, also returning the worker's process id and cache hit and miss counts
+    '''
+    path, html = render_task(task)
+
+    return path, html, os.getpid(), cache.STATS
+
+@contextmanager
+def render_pool(tasks: list, jobs: int = 1):
+    '''
+    Starts the worker processes of render_tasks(), or gives None when the pages are rendered in this process.
+
+    Every worker is forked before the pool is handed over, so before build() starts the writer thread:
+    a process forked while another thread holds a lock, e.g. the writer queue's, inherits that lock locked
+    '''
+    if jobs <= 1 or len(tasks) <= 1:
+        yield None
+        return
+
+    # Workers forked from this process share the loaded DataFrames copy-on-write
+    # Where fork is unavailable, each worker loads the data on first use instead
+    preload()
+    if 'fork' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('fork')
+    else:
+        context = multiprocessing.get_context()
+
+    # Workers start with empty cache counts, the counts inherited from this process are reported by build()
+    with ProcessPoolExecutor(max_workers=jobs, mp_context=context, initializer=cache.reset_stats) as pool:
+        # With fork, the first call submitted starts every worker
+        pool.submit(os.getpid).result()
+        yield pool
+
+def render_tasks(tasks: list, pool: ProcessPoolExecutor = None, jobs: int = 1):
+    '''
+    Renders the pages, yielding (path, HTML) in the order of tasks as each page is ready.
+
+    With a pool from render_pool(), the pages are rendered by its jobs worker processes and sent back
+    to this process to be written, with the cache counts of each worker kept in WORKER_CACHE_STATS
+    '''
+    if pool is None:
+        yield from map(render_task, tasks)
+        return
+
+    for path, html, pid, stats in pool.map(worker_render_task, tasks, chunksize=max(1, len(tasks) // (jobs * 4))):
+        WORKER_CACHE_STATS[pid] = stats
+        yield path, html
+
+def preload() -> None:
+    '''
+    Loads every table, the standings cube and season summaries, the all-play arrays and the page shells,
+    so forked workers inherit them instead of computing their own copies
+    '''
+    with profiling.stage('load data'):
+        for name in constants.DATA_FILES:
+            constants.load(name)
+        standings.standings_cube()
+        for year, weeks in constants.YEARS_WEEKS:
+            for week in [*range(1, weeks + 1), None]:
+                standings.standings(year=year, week=week)
+        for year in constants.YEARS:
+            all_play.season_tensors(year=year)
+        for key in page_header.nav_keys():
+            document.page_shell(active_year=key)
+
+def build(week: int = None, jobs: int = 1, force: bool = False, json_api: bool = True, compress: bool = True) -> dict:
+    '''
+    Builds the pages of the site whose inputs changed since the last build.
+
+    Each page's inputs (its data slices, its code and the shared code and navbar) are hashed and compared
+    with the manifest written by the previous build. Pages with the same hash whose file still exists are skipped.
+    The other pages are rendered and handed to a background writer (see writer.py), which leaves pages
+    whose HTML did not change untouched.
+
+    Parameters
+    ----------
+    week : int, default None
+        Current week of the latest season, used by the home page. If set to None, the last week in GAME_DATA is used.
+
+    jobs : int, default 1
+        Number of worker processes. With 1 the pages are rendered one after another in this process.
+
+    force : bool, default False
+        Rebuild every page, ignoring the manifest.
+
+    json_api : bool, default True
+        Also write the JSON API, see api.build_api().
+
+    compress : bool, default True
+        Write .gz (and .br) siblings of the pages and assets whose siblings are missing or out of date,
+        see assets.compress_files(). The JSON API is always compressed.
+
+    Returns
+    -------
+    dict
+        {'written': paths of rewritten pages, 'identical': paths of rebuilt pages whose HTML did not change,
+        'bytes written': size of the rewritten pages, 'skipped': paths of pages with unchanged inputs,
+        'api written': paths of rewritten API files, 'api skipped': paths of unchanged API files,
+        'compressed': paths of the compressed siblings written,
+        'cache': {namespace: {'hits', 'misses'}} of this process and the workers, see cache.get()}
+    '''
+    cache.reset_stats()
+    WORKER_CACHE_STATS.clear()
+
+    with profiling.stage('build'):
+        if week is None:
+            week = constants.YEARS_WEEKS[-1][1]
+
+        tasks = page_tasks(week=week)
+
+        with profiling.stage('hash inputs'):
+            manifest = {} if force else read_manifest()
+            shared = shared_hash()
+            hashes = {task[0]:task_hash(task, shared=shared) for task in tasks}
+
+        changed = [task for task in tasks if manifest.get(task[0]) != hashes[task[0]] or not os.path.exists(task[0])]
+        changed_paths = {task[0] for task in changed}
+        skipped = [task[0] for task in tasks if task[0] not in changed_paths]
+
+        # While profiling, pages are written in this thread so that the write file stage is timed
+        with profiling.stage('render pages'), render_pool(changed, jobs=jobs) as pool:
+            writer.start(background=not profiling.ENABLED)
+            try:
+                for path, html in render_tasks(changed, pool=pool, jobs=jobs):
+                    writer.submit(path, html)
+            except BaseException:
+                # The render error is the one raised, a write error on top of it is only reported
+                try:
+                    writer.stop()
+                except Exception as error:
+                    warnings.warn(f'Page writer failed after a render error ({type(error).__name__}: {error})')
+                raise
+            written = writer.stop()
+        write_manifest(hashes)
+        assets.write_assets()
+
+        result = {**written, 'skipped':skipped, 'api written':[], 'api skipped':[], 'compressed':[]}
+        if json_api:
+            with profiling.stage('json api'):
+                api_result = api.build_api(force=force)
+            result['api written'] = api_result['written']
+            result['api skipped'] = api_result['skipped']
+
+        if compress:
+            paths = [task[0] for task in tasks] + [assets.hashed_name(path) for path in assets.ASSETS]
+            with profiling.stage('compress'):
+                result['compressed'] = assets.compress_files(paths, force=force)
+
+        result['cache'] = cache.combine_stats(cache.STATS, *WORKER_CACHE_STATS.values())
+
+        return result
+
+def report(result: dict) -> str:
+    '''
+    Summary of a build() result, listing the rewritten pages
+    '''
+    lines = [f"Wrote {len(result['written'])} pages ({result['bytes written'] / 1024:.0f} KiB), skipped {len(result['skipped'])} unchanged pages"]
+    lines += [f'  {path}' for path in result['written']]
+    if result['identical']:
+        lines.append(f"Rebuilt {len(result['identical'])} pages whose HTML did not change, left them untouched")
+    if result['api written'] or result['api skipped']:
+        lines.append(f"Wrote {len(result['api written'])} API files, skipped {len(result['api skipped'])} unchanged API files")
+    if result['compressed']:
+        lines.append(f"Compressed {len(result['compressed'])} files")
+    if result['cache']:
+        lines.append('Cache: ' + ', '.join(f"{namespace} {count['misses']} computed, {count['hits']} reused" for namespace, count in result['cache'].items()))
+
+    return '\n'.join(lines)
+
+def profile_page(path: str, week: int = None) -> str:
+    '''
+    Renders one page from page_tasks() under cProfile and tracemalloc without writing it, see profiling.profile_call()
+
+    Parameters
+    ----------
+    path : str
+        Output path of the page, e.g. 'seasons/2024/week-3.html'.
+
+    week : int, default None
+        Current week used by the home page. If set to None, the last week in GAME_DATA is used.
+    '''
+    if week is None:
+        week = constants.YEARS_WEEKS[-1][1]
+
+    tasks = {task[0]:task for task in page_tasks(week=week)}
+    if path not in tasks:
+        raise KeyError(f'{path} is not a page of the site')
+
+    _, render, kwargs, _ = tasks[path]
+
+    return profiling.profile_call(render, **kwargs)
@@ -0,0 +1,114 @@
+import hashlib
+
+import pandas as pd
+
+# Process-wide cache shared by the page builders, split into namespaces
+# {namespace: {key: value}}
+STORE = {}
+# {namespace: {'hits': int, 'misses': int}}
+STATS = {}
+# {id(data): (data, fingerprint)}, data is kept so the id cannot be reused while cached
+FINGERPRINTS = {}
+
+def fingerprint(data: pd.DataFrame) -> str:
+    '''
+    Returns a short hash of a DataFrame's contents, used as part of cache keys.
+
+    The hash is remembered for the lifetime of the DataFrame object. If a DataFrame is modified in place, call invalidate() so the hash is recomputed.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        DataFrame to be hashed.
+
+    Returns
+    -------
+    str
+    '''
+    if id(data) in FINGERPRINTS:
+        return FINGERPRINTS[id(data)][1]
+
+    result = hash_data(data)
+    FINGERPRINTS[id(data)] = (data, result)
+
+    return result
+
+def hash_data(data: pd.DataFrame, index: bool = True) -> str:
+    '''
+    Hashes a DataFrame's columns and values (and index if index is True) without remembering the result. Used by fingerprint()
+    '''
+    digest = hashlib.sha256()
+    digest.update(str(list(data.columns)).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=index).values.tobytes())
+
+    return digest.hexdigest()[:16]
+
+def get(namespace: str, key, compute):
+    '''
+    Returns the cached value for key in namespace, calling compute() and caching the result on a miss.
+
+    Parameters
+    ----------
+    namespace : str
+        Name of the cache section, e.g. 'summary'.
+
+    key : hashable
+        Key within the namespace. Should include the fingerprint of any data the value depends on.
+
+    compute : callable
+        Function with no arguments which produces the value.
+    '''
+    store = STORE.setdefault(namespace, {})
+    stats = STATS.setdefault(namespace, {'hits':0, 'misses':0})
+
+    if key in store:
+        stats['hits'] += 1
+        return store[key]
+
+    stats['misses'] += 1
+    store[key] = compute()
+
+    return store[key]
+
+def invalidate(namespace: str = None) -> None:
+    '''
+    Clears a namespace of the cache, or the whole cache (including data fingerprints) if namespace is None.
+
+    Hit and miss counts are kept, see reset_stats().
+    '''
+    if namespace is None:
+        STORE.clear()
+        FINGERPRINTS.clear()
+    else:
+        STORE.pop(namespace, None)
+
+def stats(namespace: str = None) -> dict:
+    '''
+    Returns hit, miss and size counts for a namespace, or for every namespace if namespace is None.
+
+    Returns
+    -------
+    dict
+        {'hits': int, 'misses': int, 'size': int} or {namespace: {...}}
+    '''
+    if namespace is not None:
+        counts = STATS.get(namespace, {'hits':0, 'misses':0})
+        return {**counts, 'size':len(STORE.get(namespace, {}))}
+
+    return {name:stats(name) for name in sorted(set(STATS) | set(STORE))}
+
+def reset_stats() -> None:
+    STATS.clear()
+
+def combine_stats(*counts: dict) -> dict:
+    '''
+    Adds up STATS-like {namespace: {'hits': int, 'misses': int}} counts, e.g. those of several worker processes
+    '''
+    combined = {}
+    for namespace_counts in counts:
+        for namespace, count in namespace_counts.items():
+            total = combined.setdefault(namespace, {'hits':0, 'misses':0})
+            total['hits'] += count['hits']
+            total['misses'] += count['misses']
+
+    return dict(sorted(combined.items()))
@@ -1,7 +1,7 @@
 from dominate.tags import *
 import pandas as pd
 
-from python import functions, constants, document, page_header
+from python import functions, constants, document, standings
 
 def champion_content() -> div:
     '''
@@ -17,7 +17,7 @@ def champion_content() -> div:
 
     champions = []
     for year in constants.YEARS:
-        data = functions.summary_table(data=constants.GAME_DATA, year=year)
+        data = standings.standings(year=year)
         champions.append(data.loc[data['Champ Flag'] == 1])
 
     champions_df = pd.concat(champions)
@@ -34,12 +34,19 @@ def champion_content() -> div:
 
     return container
 
-def champion_page():
-    doc = document.document()
-    doc.add(page_header.page_header(active_year='champion'))
+def champion_dependencies() -> list:
+    '''
+    Data read by champion_content(), used by the build manifest to decide whether the page has to be rebuilt
+
+    Only seasons which have a champion are shown, so a season in progress does not affect the page.
+    '''
+    game_data = constants.GAME_DATA
+    finished = [year for year in constants.YEARS if functions.season_champion(game_data, year) is not None]
+
+    return [game_data.loc[game_data['Year'].isin(finished)]]
 
-    doc.add(champion_content())
-    doc.add(script(src=f'{constants.ROOT}script.js'))
+def champion_html() -> str:
+    return document.page_html(champion_content(), active_year='champion')
 
-    with open('champion.html','w') as file:
-        file.write(doc.render())
\ No newline at end of file
+def champion_page():
+    functions.write_file('champion.html', champion_html())
\ No newline at end of file
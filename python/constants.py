@@ -1,24 +1,159 @@
+import os
 import uuid
+import pickle
+import warnings
 import pandas as pd
 
-from python import secret
+from python import cache
 
 NAMESPACE = uuid.UUID('05859822-9e6e-4612-91ff-c714fa7e40f6')
 
 ROOT = '/'
 
-MATCHUP_DATA = pd.read_csv('database/fantasy-football-matchup-data.csv')
-GAME_DATA = pd.read_csv('database/fantasy-football-game-data.csv')
-DRAFT_DATA = pd.read_csv('database/fantasy-football-draft-data.csv')
-PLAYER_MATCHUP_DATA = pd.read_csv('database/fantasy-football-player-matchup-data.csv')
-PLAYER_GAME_DATA = pd.read_csv('database/fantasy-football-player-game-data.csv')
-TEAMS = pd.read_csv('database/fantasy-football-team-data.csv')['team_name'].values
-YEARS = GAME_DATA['Year'].unique()
-YEARS_WEEKS = [(year, GAME_DATA.loc[(GAME_DATA['Year'] == year) & (GAME_DATA['Playoff Flag'] == False), 'Week'].max()) for year in YEARS]
-
 LEAGUE_ID = 565994
-ESPN_S2 = secret.ESPN_S2
-SWID = secret.SWID
+
+# Team name of owners whose ESPN first name is not the name used on the site
+OWNER_NAMES = {
+    'The':'Klapp',
+    'Noah ':'Noah'
+}
+
+# Data tables are read from their CSV on first access (e.g. constants.GAME_DATA) and then kept in LOADED
+DATA_FILES = {
+    'MATCHUP_DATA':'database/fantasy-football-matchup-data.csv',
+    'GAME_DATA':'database/fantasy-football-game-data.csv',
+    'DRAFT_DATA':'database/fantasy-football-draft-data.csv',
+    'PLAYER_MATCHUP_DATA':'database/fantasy-football-player-matchup-data.csv',
+    'PLAYER_GAME_DATA':'database/fantasy-football-player-game-data.csv',
+    'TEAM_DATA':'database/fantasy-football-team-data.csv'
+}
+LOADED = {}
+
+# Typed binary copies of the CSVs, written by write_data_cache() and read instead of the CSV when newer than it
+DATA_CACHE_DIR = 'database/cache'
+
+# Compact column types, used both for the CSVs and the binary cache
+DATA_TYPES = {
+    'MATCHUP_DATA':{
+        'Year':'int16', 'Week':'int8', 'Playoff Flag':'int8',
+        'Home Team':'category', 'Away Team':'category'
+    },
+    'GAME_DATA':{
+        'Year':'int16', 'Week':'int8', 'Playoff Flag':'int8',
+        'Team':'category', 'Win':'int8'
+    },
+    'DRAFT_DATA':{
+        'Year':'int16', 'Team':'category', 'Player':'category', 'Position':'category',
+        'Round':'int8', 'Pick':'int8', 'Overall Pick':'int16'
+    },
+    'PLAYER_MATCHUP_DATA':{
+        'Year':'int16', 'Week':'int8', 'Home Team':'category', 'Home Player':'category',
+        'Position':'category', 'Away Player':'category', 'Away Team':'category'
+    },
+    'PLAYER_GAME_DATA':{
+        'Year':'int16', 'Week':'int8', 'Team':'category', 'Player':'category',
+        'Position':'category', 'Slot Position':'category'
+    },
+    'TEAM_DATA':{}
+}
+
+def data_cache_path(name: str) -> str:
+    return os.path.join(DATA_CACHE_DIR, f'{name.lower()}.pkl')
+
+# Errors of pd.read_pickle() on a truncated or corrupt file, or one written by an incompatible pandas version
+DATA_CACHE_ERRORS = (pickle.UnpicklingError, EOFError, ImportError, AttributeError, TypeError, ValueError)
+
+def read_data(name: str) -> pd.DataFrame:
+    '''
+    Reads a data table from the binary cache if it is at least as new as the CSV, otherwise from the CSV.
+
+    An unreadable cache file is reported with a warning and rewritten from the CSV, so later builds can use it again
+    '''
+    csv_path = DATA_FILES[name]
+    cache_path = data_cache_path(name)
+
+    if os.path.exists(cache_path) and os.path.getmtime(cache_path) >= os.path.getmtime(csv_path):
+        try:
+            data = pd.read_pickle(cache_path)
+        except DATA_CACHE_ERRORS as error:
+            warnings.warn(f'Could not read {cache_path} ({type(error).__name__}: {error}), rewriting it from {csv_path}')
+        else:
+            if isinstance(data, pd.DataFrame):
+                return data
+            warnings.warn(f'{cache_path} does not hold a DataFrame, rewriting it from {csv_path}')
+
+        data = pd.read_csv(csv_path, dtype=DATA_TYPES[name])
+        write_table_cache(name, data)
+
+        return data
+
+    return pd.read_csv(csv_path, dtype=DATA_TYPES[name])
+
+def write_table_cache(name: str, data: pd.DataFrame) -> None:
+    '''
+    Writes the binary cache of one table, through a temporary file so a failed write never leaves a partial cache
+    '''
+    os.makedirs(DATA_CACHE_DIR, exist_ok=True)
+    cache_path = data_cache_path(name)
+    temp_path = f'{cache_path}.{os.getpid()}.tmp'
+
+    try:
+        data.to_pickle(temp_path)
+        os.replace(temp_path, cache_path)
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def write_data_cache() -> None:
+    '''
+    Writes the typed binary cache of every CSV in DATA_FILES. Called by espn_data.write_csvs()
+    '''
+    for name, csv_path in DATA_FILES.items():
+        write_table_cache(name, pd.read_csv(csv_path, dtype=DATA_TYPES[name]))
+
+def load(name: str):
+    '''
+    Returns a data table or derived value by name, reading and caching it on first use.
+
+    Tables are the keys of DATA_FILES. Derived values are TEAMS, YEARS and YEARS_WEEKS.
+    '''
+    if name in LOADED:
+        return LOADED[name]
+
+    if name in DATA_FILES:
+        value = read_data(name)
+    # Derived values are plain Python ints and strs, the compact column types stay inside the tables
+    elif name == 'TEAMS':
+        value = [str(team) for team in load('TEAM_DATA')['team_name']]
+    elif name == 'YEARS':
+        value = [int(year) for year in load('GAME_DATA')['Year'].unique()]
+    elif name == 'YEARS_WEEKS':
+        game_data = load('GAME_DATA')
+        value = [(year, int(game_data.loc[(game_data['Year'] == year) & (game_data['Playoff Flag'] == False), 'Week'].max())) for year in load('YEARS')]
+    else:
+        raise KeyError(name)
+
+    LOADED[name] = value
+
+    return value
+
+def reload() -> None:
+    '''
+    Forgets every loaded table and clears the shared cache, so the next access reads the CSVs again
+    '''
+    LOADED.clear()
+    cache.invalidate()
+
+def __getattr__(name: str):
+    if name in DATA_FILES or name in ['TEAMS','YEARS','YEARS_WEEKS']:
+        return load(name)
+
+    # Only needed when fetching from ESPN, so python/secret.py does not have to exist to build the site
+    if name in ['ESPN_S2','SWID']:
+        from python import secret
+        return getattr(secret, name)
+
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 DEFAULT_POSITION_MAP = {
     1: "QB",
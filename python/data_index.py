@@ -0,0 +1,124 @@
+import numpy as np
+import pandas as pd
+
+from python import cache
+
+def build_index(data: pd.DataFrame) -> dict:
+    '''
+    Builds the row index of a data table, used by the slicing functions below.
+
+    The table is sorted by Year (and Week, if it has one) with a stable sort, so rows keep their
+    original order within each group. Every year and (year, week) is then a contiguous range of rows.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Table with a Year column, e.g. constants.GAME_DATA.
+
+    Returns
+    -------
+    dict
+        'data': the sorted table,
+        'years': {year: (start, stop)},
+        'year_weeks': {(year, week): (start, stop)} (empty if there is no Week column),
+        'week_stops': {year: (weeks, stops)} (empty if there is no Week column),
+        'teams': {team: row positions} (empty if there is no Team column)
+    '''
+    keys = ['Year','Week'] if 'Week' in data.columns else ['Year']
+
+    sorted_data = data
+    key_values = [data[key].values for key in keys]
+    if len(data) > 1 and (np.lexsort(key_values[::-1]) != np.arange(len(data))).any():
+        sorted_data = data.sort_values(keys, kind='stable')
+        key_values = [sorted_data[key].values for key in keys]
+
+    index = {'data':sorted_data, 'years':group_ranges(key_values[:1]), 'year_weeks':{}, 'week_stops':{}, 'teams':{}}
+
+    if 'Week' in data.columns:
+        index['year_weeks'] = group_ranges(key_values)
+
+        # {year: (weeks, stops)}, weeks in ascending order, used by year_through_week_rows()
+        for year in index['years']:
+            weeks = [(week, stop) for (row_year, week), (_, stop) in index['year_weeks'].items() if row_year == year]
+            index['week_stops'][year] = (np.array([week for week, _ in weeks]), np.array([stop for _, stop in weeks]))
+
+    if 'Team' in data.columns:
+        codes, teams = pd.factorize(sorted_data['Team'])
+        order = np.argsort(codes, kind='stable')
+        order = order[codes[order] >= 0]
+        index['teams'] = dict(zip(teams, np.split(order, np.cumsum(np.bincount(codes[order], minlength=len(teams)))[:-1])))
+
+    return index
+
+def group_ranges(key_values: list[np.ndarray]) -> dict:
+    '''
+    Maps each run of equal keys in sorted key arrays to its (start, stop) row range.
+
+    Keys are single values for one array and tuples for several.
+    '''
+    length = len(key_values[0])
+    if length == 0:
+        return {}
+
+    changes = np.zeros(length, dtype=bool)
+    changes[0] = True
+    for values in key_values:
+        changes[1:] |= values[1:] != values[:-1]
+
+    starts = np.flatnonzero(changes)
+    stops = np.append(starts[1:], length)
+
+    if len(key_values) == 1:
+        keys = key_values[0][starts].tolist()
+    else:
+        keys = list(zip(*[values[starts].tolist() for values in key_values]))
+
+    return {key:(start, stop) for key, start, stop in zip(keys, starts.tolist(), stops.tolist())}
+
+def get_index(data: pd.DataFrame) -> dict:
+    '''
+    Returns the index of a data table, building it once per version of the data
+    '''
+    return cache.get('data-index', cache.fingerprint(data), lambda: build_index(data))
+
+def year_rows(data: pd.DataFrame, year: int) -> pd.DataFrame:
+    '''
+    Rows of data for a given year. Same rows and index as data.loc[data['Year'] == year], in (week, original) order
+    for tables with a Week column, so in the same order only when data is sorted by week within each year
+    '''
+    index = get_index(data)
+    start, stop = index['years'].get(year, (0, 0))
+
+    return index['data'].iloc[start:stop]
+
+def year_week_rows(data: pd.DataFrame, year: int, week: int) -> pd.DataFrame:
+    '''
+    Rows of data for a given year and week. Same rows, order and index as data.loc[(data['Year'] == year) & (data['Week'] == week)]
+    '''
+    index = get_index(data)
+    start, stop = index['year_weeks'].get((year, week), (0, 0))
+
+    return index['data'].iloc[start:stop]
+
+def year_through_week_rows(data: pd.DataFrame, year: int, week: int) -> pd.DataFrame:
+    '''
+    Rows of data for a given year up to and including a given week.
+    Same rows as data.loc[(data['Year'] == year) & (data['Week'] <= week)], in (week, original) order.
+    '''
+    index = get_index(data)
+    start, _ = index['years'].get(year, (0, 0))
+    weeks, stops = index['week_stops'].get(year, (np.array([]), np.array([])))
+
+    played = np.searchsorted(weeks, week, side='right')
+    stop = stops[played - 1] if played else start
+
+    return index['data'].iloc[start:stop]
+
+def team_rows(data: pd.DataFrame, team: str) -> pd.DataFrame:
+    '''
+    Rows of data for a given team. Same rows and index as data.loc[data['Team'] == team], in (year, week, original) order.
+    '''
+    index = get_index(data)
+    rows = index['teams'].get(team, np.array([], dtype=int))
+
+    return index['data'].iloc[rows]
@@ -0,0 +1,183 @@
+import sqlite3
+
+DATABASE_PATH = 'database/fantasy-football.db'
+
+# Columns of every table and the key rows are upserted on, in the order create_database() has always written them
+TABLES = {
+    'teams':{
+        'columns':{'team_id':'TEXT', 'team_name':'TEXT'},
+        'key':'team_id'
+    },
+    'drafts':{
+        'columns':{'draft_pick_id':'TEXT', 'player_id':'TEXT', 'team_id':'TEXT', 'year':'INTEGER', 'round':'INTEGER', 'pick':'INTEGER'},
+        'key':'draft_pick_id'
+    },
+    'matchups':{
+        'columns':{
+            'matchup_id':'TEXT', 'year':'INTEGER', 'week':'INTEGER', 'matchup_type':'TEXT', 'playoff_flag':'INTEGER',
+            'home_team_id':'TEXT', 'home_score':'REAL', 'away_team_id':'TEXT', 'away_score':'REAL'
+        },
+        'key':'matchup_id'
+    },
+    'games':{
+        'columns':{'game_id':'TEXT', 'matchup_id':'TEXT', 'team_id':'TEXT', 'score':'REAL', 'opp_score':'REAL', 'win_flag':'INTEGER', 'margin':'REAL'},
+        'key':'game_id'
+    },
+    'player_games':{
+        'columns':{
+            'player_game_id':'TEXT', 'matchup_id':'TEXT', 'game_id':'TEXT', 'team_id':'TEXT', 'player_id':'TEXT',
+            'points':'REAL', 'projected_points':'REAL', 'slot_position':'TEXT', 'active_status':'TEXT', 'bye_week_flag':'INTEGER'
+        },
+        'key':'player_game_id'
+    },
+    'players':{
+        'columns':{'player_id':'TEXT', 'player_name':'TEXT', 'position':'TEXT'},
+        'key':'player_id'
+    }
+}
+
+# Indexes on the join and filter keys of the views in espn_data.database_views()
+# The key of every table is already indexed by its primary key
+INDEXES = {
+    'matchups_year_week':'matchups (year, week)',
+    'matchups_matchup_type':'matchups (matchup_type)',
+    'games_matchup_id':'games (matchup_id)',
+    'games_team_id':'games (team_id)',
+    'player_games_matchup_id':'player_games (matchup_id, team_id)',
+    'player_games_game_id':'player_games (game_id, slot_position)',
+    'player_games_player_id':'player_games (player_id)',
+    'player_games_team_id':'player_games (team_id)',
+    'drafts_year':'drafts (year)',
+    'drafts_player_id':'drafts (player_id)',
+    'drafts_team_id':'drafts (team_id)'
+}
+
+# Views over player_games, stored as tables by espn_data.database_views(materialize=True)
+HEAVY_VIEWS = ['player_matchup_data', 'player_game_data']
+
+def connect(path: str = DATABASE_PATH, read_only: bool = False) -> sqlite3.Connection:
+    '''
+    Opens the database in WAL mode with synchronous=NORMAL, so a load is one fsync per transaction
+    instead of one per statement and readers are not blocked while it runs.
+
+    Transactions are explicit (isolation_level=None), so schema changes can be part of one with BEGIN.
+
+    With read_only=True the database is opened read-only and left in whatever mode it is in,
+    e.g. for one of several connections exporting views at once.
+    '''
+    if read_only:
+        return sqlite3.connect(f'file:{path}?mode=ro', uri=True, isolation_level=None, check_same_thread=False)
+
+    conn = sqlite3.connect(path, isolation_level=None)
+    conn.execute('PRAGMA journal_mode=WAL')
+    conn.execute('PRAGMA synchronous=NORMAL')
+
+    return conn
+
+def create_schema(conn: sqlite3.Connection) -> None:
+    for table, schema in TABLES.items():
+        columns = [f'{column} {kind}' for column, kind in schema['columns'].items()]
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({', '.join(columns)}, PRIMARY KEY ({schema['key']}))")
+
+    # Raw store hash of every season and week last loaded, see espn_data.update_database()
+    conn.execute('CREATE TABLE IF NOT EXISTS load_state (year INTEGER, name TEXT, hash TEXT, PRIMARY KEY (year, name))')
+
+    create_indexes(conn)
+
+def create_indexes(conn: sqlite3.Connection) -> None:
+    for name, columns in INDEXES.items():
+        conn.execute(f'CREATE INDEX IF NOT EXISTS {name} ON {columns}')
+
+def drop_indexes(conn: sqlite3.Connection) -> None:
+    for name in INDEXES:
+        conn.execute(f'DROP INDEX IF EXISTS {name}')
+
+def has_schema(conn: sqlite3.Connection) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'load_state'").fetchone() is not None
+
+def drop_tables(conn: sqlite3.Connection) -> None:
+    for table in [*TABLES, 'load_state']:
+        conn.execute(f'DROP TABLE IF EXISTS {table}')
+
+def upsert(conn: sqlite3.Connection, table: str, columns: dict[str, list]) -> int:
+    '''
+    Inserts rows given as {column: values} into a table with one executemany,
+    updating the existing row where the key already exists. Returns the number of rows written
+    '''
+    names = list(TABLES[table]['columns'])
+    key = TABLES[table]['key']
+    updates = [f'{column} = excluded.{column}' for column in names if column != key]
+
+    conn.executemany(
+        f"INSERT INTO {table} ({', '.join(names)}) VALUES ({', '.join('?' for _ in names)}) "
+        f"ON CONFLICT ({key}) DO UPDATE SET {', '.join(updates)}",
+        zip(*[columns[column] for column in names])
+    )
+
+    return len(columns[key])
+
+def delete_season(conn: sqlite3.Connection, year: int) -> None:
+    '''
+    Deletes the rows which only belong to a season. Teams and players are shared between seasons and are only upserted
+    '''
+    conn.execute('DELETE FROM drafts WHERE year = ?', (year,))
+
+def delete_week(conn: sqlite3.Connection, year: int, week: int) -> None:
+    '''
+    Deletes the matchups of a week with their games and player games, so lineup changes do not leave stale rows
+    '''
+    matchups = 'SELECT matchup_id FROM matchups WHERE year = ? AND week = ?'
+    conn.execute(f'DELETE FROM player_games WHERE matchup_id IN ({matchups})', (year, week))
+    conn.execute(f'DELETE FROM games WHERE matchup_id IN ({matchups})', (year, week))
+    conn.execute('DELETE FROM matchups WHERE year = ? AND week = ?', (year, week))
+
+def read_load_state(conn: sqlite3.Connection) -> dict[tuple[int, str], str]:
+    return {(year, name):hash for year, name, hash in conn.execute('SELECT year, name, hash FROM load_state')}
+
+def write_load_state(conn: sqlite3.Connection, year: int, name: str, hash: str) -> None:
+    conn.execute(
+        'INSERT INTO load_state (year, name, hash) VALUES (?, ?, ?) ON CONFLICT (year, name) DO UPDATE SET hash = excluded.hash',
+        (year, name, hash)
+    )
+
+def drop_relation(conn: sqlite3.Connection, name: str) -> None:
+    '''
+    Drops a table or view by name, whichever it currently is
+    '''
+    row = conn.execute("SELECT type FROM sqlite_master WHERE name = ? AND type IN ('table','view')", (name,)).fetchone()
+    if row is not None:
+        conn.execute(f'DROP {row[0].upper()} {name}')
+
+def create_view(conn: sqlite3.Connection, name: str, select: str, materialize: bool = False) -> None:
+    '''
+    Creates a view from a SELECT statement, replacing any existing view or table of the same name.
+
+    With materialize=True and a name in HEAVY_VIEWS, the query becomes the view {name}_view
+    and name is a table filled from it, see refresh_materialized().
+    '''
+    drop_relation(conn, name)
+    drop_relation(conn, f'{name}_view')
+
+    if not materialize or name not in HEAVY_VIEWS:
+        conn.execute(f'CREATE VIEW {name} AS {select}')
+        return
+
+    conn.execute(f'CREATE VIEW {name}_view AS {select}')
+    conn.execute(f'CREATE TABLE {name} AS SELECT * FROM {name}_view')
+    conn.execute(f'CREATE INDEX {name}_year ON {name} ("Year")')
+
+def refresh_materialized(conn: sqlite3.Connection, years: set[int]) -> None:
+    '''
+    Reloads the given seasons of every materialized view.
+
+    Rows are kept in season order, so every season from the earliest changed one onwards is reloaded.
+    Usually only the latest season changes, which makes this a per-season refresh.
+    '''
+    first = min(years)
+
+    for name in HEAVY_VIEWS:
+        if conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'view' AND name = ?", (f'{name}_view',)).fetchone() is None:
+            continue
+
+        conn.execute(f'DELETE FROM {name} WHERE "Year" >= ?', (first,))
+        conn.execute(f'INSERT INTO {name} SELECT * FROM {name}_view WHERE "Year" >= ?', (first,))
@@ -1,14 +1,63 @@
 import dominate
 from dominate.tags import *
+from dominate.dom_tag import dom_tag
 
 
-from python import constants
+from python import constants, assets, cache, page_header
 # Only use the below import when debugging this file directly
 # import constants
 
+# Stands in for a page's content div while its shell is rendered, see page_shell()
+CONTENT_SLOT = '\0content\0'
+
 def document() -> dominate.document:
     doc = dominate.document(title='Fantasy Football')
-    doc.head.add(link(rel='stylesheet', href=f'{constants.ROOT}style.css'))
-    doc.head.add(link(rel='icon', type='image/png', href=f'{constants.ROOT}Assets/Fantasy-Football-App-LOGO.png'))
+    doc.head.add(link(rel='stylesheet', href=assets.asset_path('style.css')))
+    doc.head.add(link(rel='icon', type='image/png', href=assets.asset_path('Assets/Fantasy-Football-App-LOGO.png')))
+
+    return doc
+
+class content_slot(div):
+    tagname = 'div'
+
+    def _render(self, sb, indent_level, indent_str, pretty, xhtml):
+        sb.append(CONTENT_SLOT)
+        return sb
+
+def page_shell(active_year=None) -> tuple[str, str]:
+    '''
+    Renders everything of a page around its content div: the head, the header and navbar, and the script tag.
+
+    Returns the HTML before and after the content. Cached with the shared build output, so each shell
+    (one per navbar item) is rendered once per build.
+    '''
+    def render():
+        doc = document()
+        doc.add(page_header.page_header(active_year=active_year))
+        doc.add(content_slot())
+        doc.add(script(src=assets.asset_path('script.js')))
+
+        before, after = doc.render().split(CONTENT_SLOT)
+        return before, after
+
+    return cache.get('shell', (constants.ROOT, assets.assets_hash(), page_header.nav_fingerprint(), active_year), render)
+
+def page_html(content: dom_tag, active_year=None) -> str:
+    '''
+    Renders a page: content rendered into the shared page_shell().
+
+    Gives the same HTML as adding page_header.page_header(active_year), content and the script tag
+    to a document() and rendering it.
+
+    Parameters
+    ----------
+    content : dom_tag
+        The page's content div.
+
+    active_year : int or str, default None
+        The navbar item to highlight, see page_header.page_header().
+    '''
+    before, after = page_shell(active_year=active_year)
 
-    return doc
\ No newline at end of file
+    # The content is a child of body, two levels down from html
+    return before + ''.join(content._render([], 2, '  ', True, False)) + after
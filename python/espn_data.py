@@ -1,15 +1,17 @@
-import time
+import csv
 import pickle
-import sqlite3
 import uuid
+from contextlib import closing
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 from espn_api.football import League
 
-from python import constants
+from python import constants, functions, fetcher, raw_store, database
 
 # Function to pull all historical records 2019-2024
-def fetch_api_data(version: int, league_id=constants.LEAGUE_ID, espn_s2=constants.ESPN_S2, swid=constants.SWID):
+def fetch_api_data(version: int, league_id=constants.LEAGUE_ID, espn_s2=None, swid=None):
     '''
     THIS FUNCTION SHOULD ONLY BE RUN ONCE
     -------------------------------------
@@ -19,98 +21,240 @@ def fetch_api_data(version: int, league_id=constants.LEAGUE_ID, espn_s2=constant
     Runs .box_scores method for each week in each season.
     Compiles all box scores into a list of lists.
 
-    Creates dict of list(Leagues) and list(box scores)
-
-    Creates/writes pickle file into database folder.
+    Writes each season and week into the raw data store (see raw_store.py).
 
     THIS FUNCTION SHOULD ONLY BE RUN ONCE
     -------------------------------------
     '''
 
+    espn_s2 = espn_s2 or constants.ESPN_S2
+    swid = swid or constants.SWID
+
     run = input('WARNING: This function should only be run once. Are you sure you want to run it? [NO]/yes: ')
     if run.lower() != 'yes':
         return
     
-    data = {}
-
+    season_lengths = {}
     for year in range(2018,2025):
-        league = League(league_id=league_id, year=year, espn_s2=espn_s2, swid=swid)
-        players = league.espn_request.get_pro_players()
-
         season_length = 17
         if year in [2019,2020]:
             season_length = 16
         elif year == 2018:
             season_length = 15
 
-        matchups = {}
-        for week in range(1, season_length + 1):
-            if year == 2018:
-                box_scores = league.scoreboard(week)
-            else:
-                box_scores = league.box_scores(week)
-
-            matchups[week] = box_scores
-
-            if (week == 1) or (week == season_length):
-                print(f'Year: {year}, Week: {week}')
-            time.sleep(3)
+        season_lengths[year] = season_length
 
-        data[year] = {
-            'League':league,
-            'Players':players,
-            'Box Scores':matchups
-        }
+    data = fetcher.fetch_seasons(
+        season_lengths=season_lengths,
+        league_factory=lambda year: League(league_id=league_id, year=year, espn_s2=espn_s2, swid=swid),
+        fetch_week=fetch_week
+    )
 
-    write_pickle_file(data=data, version=version)
+    for year, season_data in data.items():
+        raw_store.store_season(version=version, year=year, season_data=season_data)
 
-# Function to pull new records and append or overwrite pickle file
+# Function to pull new records and write them into the raw data store
+# Only the season and week files whose contents changed are rewritten
 # Could be used to rerun any given season
 def fetch_new_data(
         year: int,
         version: int,
         league_id=constants.LEAGUE_ID,
-        espn_s2=constants.ESPN_S2,
-        swid=constants.SWID
+        espn_s2=None,
+        swid=None
 ):
-    league = League(league_id=league_id, year=year, espn_s2=espn_s2, swid=swid)
-    players = league.espn_request.get_pro_players()
+    espn_s2 = espn_s2 or constants.ESPN_S2
+    swid = swid or constants.SWID
 
-    matchups = {}
-    for week in range(1, league.current_week):
-        box_scores = league.box_scores(week)
-        matchups[week] = box_scores
+    new_data = fetcher.fetch_seasons(
+        season_lengths={year:None},
+        league_factory=lambda year: League(league_id=league_id, year=year, espn_s2=espn_s2, swid=swid),
+        fetch_week=fetch_week
+    )[year]
 
-        time.sleep(3)
+    written = raw_store.store_season(version=version, year=year, season_data=new_data)
+    print(f'{year}: wrote {written if written else "nothing, no changes"}')
 
-    new_data = {
-        'League':league,
-        'Players':players,
-        'Box Scores':matchups
-    }
+# Fetch the matchups of a single week
+# 2018 box scores are not available from ESPN, so only the scoreboard is used
+def fetch_week(league: League, year: int, week: int) -> list:
+    if year == 2018:
+        return league.scoreboard(week)
 
-    data = read_pickle_file(version=version)
-    data[year] = new_data
-    write_pickle_file(data=data, version=version)
-
-# Write to pickle file
-def write_pickle_file(data, version: int):
-    with open(f'database/espn-data-{version}.pkl', 'wb') as file:
-        pickle.dump(data, file)
-
-    print('Pickle file written')
+    return league.box_scores(week)
 
-# Read in pickle file
+# Read in a pickle file from before the raw data store
 def read_pickle_file(version: int) -> dict[str, list]:
     with open(f'database/espn-data-{version}.pkl', 'rb') as file:
         data = pickle.load(file)
     
     return data
 
-# Use pickle file data to build a dataframe for each eventual database table
+# Move an old espn-data-{version}.pkl file into the raw data store
+def migrate_pickle_file(version: int) -> None:
+    data = read_pickle_file(version=version)
+
+    for year, season_data in data.items():
+        raw_store.store_season(version=version, year=year, season_data=season_data)
+
+    print('Pickle file migrated')
+
+# ESPN defaultPositionId of the players kept in the players table
+PLAYER_POSITION_IDS = [1, 2, 3, 4, 5, 16]
+
+# Canonical team name of an ESPN owner first name, where None is the missing opponent of a bye week
+@lru_cache(maxsize=None)
+def team_name(owner: str | None) -> str:
+    if owner is None:
+        return 'Bye'
+
+    return constants.OWNER_NAMES.get(owner, owner)
+
+@lru_cache(maxsize=None)
+def team_id(owner: str | None) -> str:
+    return str(uuid.uuid5(constants.NAMESPACE, name=team_name(owner)))
+
+@lru_cache(maxsize=None)
+def player_id(espn_id: int) -> str:
+    return str(uuid.uuid5(constants.NAMESPACE, name=str(espn_id)))
+
+# Id of a row from its natural key, e.g. row_id('matchup', 2024, 3, 'Klapp')
+def row_id(*key) -> str:
+    return str(uuid.uuid5(constants.NAMESPACE, name='-'.join(str(part) for part in key)))
+
+# Empty column lists of the given tables, filled by season_records() and week_records()
+def new_buffers(tables: list[str]) -> dict[str, dict[str, list]]:
+    return {table:{column:[] for column in database.TABLES[table]['columns']} for table in tables}
+
+# Rows of the season tables (teams, drafts, players) from a raw store season payload
+def season_records(year: int, season: dict, buffers: dict = None) -> dict[str, dict[str, list]]:
+    '''
+    Converts a season payload into columns of the teams, drafts and players tables.
+
+    Every id is a uuid5 of the row's natural key, so loading the same payload twice gives the same rows.
+
+    Parameters
+    ----------
+    year : int
+    season : dict
+        Payload from raw_store.read_season().
+
+    buffers : dict, default None
+        Columns to append to, see new_buffers(). If set to None, new ones are created.
+
+    Returns
+    -------
+    Dict : [Str, Dict[Str, List]]
+        {table: {column: values}}
+    '''
+    if buffers is None:
+        buffers = new_buffers(['teams','drafts','players'])
+
+    picks = season['draft']
+    drafts = buffers['drafts']
+    drafts['draft_pick_id'] += [row_id('draft', year, pick['round'], pick['pick']) for pick in picks]
+    drafts['player_id'] += [player_id(pick['player_id']) for pick in picks]
+    drafts['team_id'] += [team_id(pick['owner']) for pick in picks]
+    drafts['year'] += [year] * len(picks)
+    drafts['round'] += [pick['round'] for pick in picks]
+    drafts['pick'] += [pick['pick'] for pick in picks]
+
+    teams = buffers['teams']
+    teams['team_id'] += [team_id(team['owner']) for team in season['teams']]
+    teams['team_name'] += [team_name(team['owner']) for team in season['teams']]
+
+    players = [player for player in season['players'] if player['default_position_id'] in PLAYER_POSITION_IDS]
+    buffers['players']['player_id'] += [player_id(player['id']) for player in players]
+    buffers['players']['player_name'] += [player['full_name'] for player in players]
+    buffers['players']['position'] += [constants.DEFAULT_POSITION_MAP[player['default_position_id']] for player in players]
+
+    return buffers
+
+# Rows of the weekly tables (matchups, games, player_games) from a raw store week payload
+def week_records(year: int, week: int, payload: dict, buffers: dict = None) -> dict[str, dict[str, list]]:
+    '''
+    Converts a week payload into columns of the matchups, games and player_games tables.
+
+    Ids are uuid5s of (year, week, team) for matchups, (year, week, team, opponent) for games
+    and (year, week, team, player) for player games, so reloading an unchanged week gives the same rows.
+
+    Parameters
+    ----------
+    year, week : int
+    payload : dict
+        Payload from raw_store.read_week().
+
+    buffers : dict, default None
+        Columns to append to, see new_buffers(). If set to None, new ones are created.
+
+    Returns
+    -------
+    Dict : [Str, Dict[Str, List]]
+        {table: {column: values}}
+    '''
+    if buffers is None:
+        buffers = new_buffers(['matchups','games','player_games'])
+
+    matchups = buffers['matchups']
+    games = buffers['games']
+    player_games = buffers['player_games']
+
+    for matchup in payload['matchups']:
+        home_team = team_name(matchup['home_owner'])
+        away_team = team_name(matchup['away_owner'])
+        home_team_id = team_id(matchup['home_owner'])
+        away_team_id = team_id(matchup['away_owner'])
+        home_score = matchup['home_score']
+        away_score = matchup['away_score']
+
+        # A team plays at most one matchup a week, but several teams can have a bye in the playoffs
+        matchup_id = row_id('matchup', year, week, home_team)
+        home_game_id = row_id('game', year, week, home_team, away_team)
+        away_game_id = row_id('game', year, week, away_team, home_team)
+
+        matchups['matchup_id'].append(matchup_id)
+        matchups['year'].append(year)
+        matchups['week'].append(week)
+        matchups['matchup_type'].append(matchup['matchup_type'])
+        matchups['playoff_flag'].append(matchup['is_playoff'])
+        matchups['home_team_id'].append(home_team_id)
+        matchups['home_score'].append(home_score)
+        matchups['away_team_id'].append(away_team_id)
+        matchups['away_score'].append(away_score)
+
+        games['game_id'] += [home_game_id, away_game_id]
+        games['matchup_id'] += [matchup_id, matchup_id]
+        games['team_id'] += [home_team_id, away_team_id]
+        games['score'] += [home_score, away_score]
+        games['opp_score'] += [away_score, home_score]
+        games['win_flag'] += [int(home_score > away_score), int(away_score > home_score)]
+        games['margin'] += [round(home_score - away_score, 2), round(away_score - home_score, 2)]
+
+        # 2018 matchups come from the scoreboard, which has no lineups
+        if year <= 2018:
+            continue
+
+        for team, game_id, lineup_team_id, lineup in [
+            (home_team, home_game_id, home_team_id, matchup['home_lineup']),
+            (away_team, away_game_id, away_team_id, matchup['away_lineup'])
+        ]:
+            player_games['player_game_id'] += [row_id('player-game', year, week, team, player['player_id']) for player in lineup]
+            player_games['matchup_id'] += [matchup_id] * len(lineup)
+            player_games['game_id'] += [game_id] * len(lineup)
+            player_games['team_id'] += [lineup_team_id] * len(lineup)
+            player_games['player_id'] += [player_id(player['player_id']) for player in lineup]
+            player_games['points'] += [player['points'] for player in lineup]
+            player_games['projected_points'] += [player['projected_points'] for player in lineup]
+            player_games['slot_position'] += [player['slot_position'] for player in lineup]
+            player_games['active_status'] += [player['active_status'] for player in lineup]
+            player_games['bye_week_flag'] += [player['on_bye_week'] for player in lineup]
+
+    return buffers
+
+# Use the raw data store to build a dataframe for each eventual database table
 def construct_dataframes(version: int) -> dict[str, pd.DataFrame]:
     '''
-    Takes in espn-data.pkl file data and produces the following dataframes:
+    Reads the raw data store one season at a time and produces the following dataframes:
      - teams
      - drafts
      - matchups
@@ -119,195 +263,121 @@ def construct_dataframes(version: int) -> dict[str, pd.DataFrame]:
      - players
     All of which will be converted into tables in the database
 
+    Every season and week is appended to one set of column buffers, which become the dataframes at the end.
+
     Returns
     -------
     Dict : [Str, DataFrame]
     '''
-    data = read_pickle_file(version=version)
+    buffers = new_buffers(list(database.TABLES))
 
-    data_teams = []
-    data_drafts = []
-    data_players = []
-    data_matchups = []
-    data_games = []
-    data_player_games = []
-
-    for year in data.keys():
-        league = data[year]['League']
-        players = data[year]['Players']
-        box_scores = data[year]['Box Scores']
-
-        for pick in league.draft:
-            team_name = pick.team.owners[0]['firstName']
-            if team_name == 'The':
-                team_name = 'Klapp'
-            elif team_name == 'Noah ':
-                team_name = 'Noah'
-
-            data_drafts.append(
-                {
-                    'draft_pick_id':str(uuid.uuid4()),
-                    'player_id':str(uuid.uuid5(namespace=constants.NAMESPACE, name=str(pick.playerId))),
-                    'team_id':str(uuid.uuid5(namespace=constants.NAMESPACE, name=team_name)),
-                    'year':year,
-                    'round':pick.round_num,
-                    'pick':pick.round_pick
-                }
-            )
-
-        for team in league.teams:
-            team_name = team.owners[0]['firstName']
-            if team_name == 'The':
-                team_name = 'Klapp'
-            elif team_name == 'Noah ':
-                team_name = 'Noah'
-
-            data_teams.append(
-                    {
-                        'team_id':str(uuid.uuid5(namespace=constants.NAMESPACE, name=team_name)),
-                        'team_name':team_name
-                    }
-                )
-            
-        for player in players:
-            if player['defaultPositionId'] not in [1, 2, 3, 4, 5, 16]:
-                continue
-
-            data_players.append(
-                {
-                    'player_id':str(uuid.uuid5(namespace=constants.NAMESPACE, name=str(player['id']))),
-                    'player_name':player['fullName'],
-                    'position':constants.DEFAULT_POSITION_MAP[player['defaultPositionId']]
-                }
-            )
-
-        for week in box_scores.keys():
-            matchups = box_scores[week]
-
-            for matchup in matchups:
-                matchup_id = str(uuid.uuid4())
-
-                home_team = matchup.home_team.owners[0]['firstName']
-                if home_team == 'The':
-                    home_team = 'Klapp'
-                elif home_team == 'Noah ':
-                    home_team = 'Noah'
-
-                if matchup.away_team == 0:
-                    away_team = 'Bye'
-                else:
-                    away_team = matchup.away_team.owners[0]['firstName']
-                if away_team == 'The':
-                    away_team = 'Klapp'
-                elif away_team == 'Noah ':
-                    away_team = 'Noah'
-
-                data_matchups.append(
-                    {
-                        'matchup_id':matchup_id,
-                        'year':year,
-                        'week':week,
-                        'matchup_type':matchup.matchup_type,
-                        'playoff_flag':matchup.is_playoff,
-                        'home_team_id':str(uuid.uuid5(constants.NAMESPACE, name=home_team)),
-                        'home_score':matchup.home_score,
-                        'away_team_id':str(uuid.uuid5(constants.NAMESPACE, name=away_team)),
-                        'away_score':matchup.away_score
-                    }
-                )
+    for year, season, box_scores in raw_store.iter_seasons(version=version):
+        season_records(year, season, buffers=buffers)
 
-                home_game_id = str(uuid.uuid4())
-                data_games.append(
-                    {
-                        'game_id':home_game_id,
-                        'matchup_id':matchup_id,
-                        'team_id':str(uuid.uuid5(constants.NAMESPACE, name=home_team)),
-                        'score':matchup.home_score,
-                        'opp_score':matchup.away_score,
-                        'win_flag':int(matchup.home_score > matchup.away_score),
-                        'margin':round(matchup.home_score - matchup.away_score, 2)
-                    }
-                )
+        for week, payload in box_scores.items():
+            week_records(year, week, payload, buffers=buffers)
 
-                away_game_id = str(uuid.uuid4())
-                data_games.append(
-                    {
-                        'game_id':away_game_id,
-                        'matchup_id':matchup_id,
-                        'team_id':str(uuid.uuid5(constants.NAMESPACE, name=away_team)),
-                        'score':matchup.away_score,
-                        'opp_score':matchup.home_score,
-                        'win_flag':int(matchup.away_score > matchup.home_score),
-                        'margin':round(matchup.away_score - matchup.home_score, 2)
-                    }
-                )
+    df_teams = pd.DataFrame(buffers['teams']).drop_duplicates().reset_index(drop=True)
+    df_drafts = pd.DataFrame(buffers['drafts'])
+    df_players = pd.DataFrame(buffers['players']).drop_duplicates('player_id', keep='last').reset_index(drop=True)
+    df_matchups = pd.DataFrame(buffers['matchups'])
+    df_games = pd.DataFrame(buffers['games'])
+    df_player_games = pd.DataFrame(buffers['player_games'])
 
-                if year > 2018:
-                    for player in matchup.home_lineup:
-                        data_player_games.append(
-                            {
-                                'player_game_id':str(uuid.uuid4()),
-                                'matchup_id':matchup_id,
-                                'game_id':home_game_id,
-                                'team_id':str(uuid.uuid5(constants.NAMESPACE, name=home_team)),
-                                'player_id':str(uuid.uuid5(constants.NAMESPACE, name=str(player.playerId))),
-                                'points':player.points,
-                                'projected_points':player.projected_points,
-                                'slot_position':player.slot_position,
-                                'active_status':player.active_status,
-                                'bye_week_flag':player.on_bye_week
-                            }
-                        )
-
-                    for player in matchup.away_lineup:
-                        data_player_games.append(
-                            {
-                                'player_game_id':str(uuid.uuid4()),
-                                'matchup_id':matchup_id,
-                                'game_id':away_game_id,
-                                'team_id':str(uuid.uuid5(constants.NAMESPACE, name=away_team)),
-                                'player_id':str(uuid.uuid5(constants.NAMESPACE, name=str(player.playerId))),
-                                'points':player.points,
-                                'projected_points':player.projected_points,
-                                'slot_position':player.slot_position,
-                                'active_status':player.active_status,
-                                'bye_week_flag':player.on_bye_week
-                            }
-                        )
-    df_teams = pd.DataFrame(data_teams).drop_duplicates().reset_index(drop=True)
-    df_drafts = pd.DataFrame(data_drafts)
-    df_players = pd.DataFrame(data_players).drop_duplicates('player_id', keep='last').reset_index(drop=True)
-    df_matchups = pd.DataFrame(data_matchups)
-    df_games = pd.DataFrame(data_games)
-    df_player_games = pd.DataFrame(data_player_games)
+    return {'teams':df_teams, 'drafts':df_drafts, 'matchups':df_matchups, 'games':df_games, 'player_games':df_player_games, 'players':df_players}
 
+# Create the database from scratch and fill it with every season in the raw data store
+def create_database(version: int) -> dict[str, int]:
+    return update_database(version=version, rebuild=True)
 
-    return {'teams':df_teams, 'drafts':df_drafts, 'matchups':df_matchups, 'games':df_games, 'player_games':df_player_games, 'players':df_players}
+# Load the seasons and weeks of the raw data store which changed since the last load
+def update_database(version: int, rebuild: bool = False) -> dict[str, int]:
+    '''
+    Upserts the rows of every season and week whose raw store hash differs from the one recorded
+    in the database's load_state table, all in one transaction.
 
-# Create the database and fill it with the tables from dataframes
-def create_database(version: int) -> None:
-    data_dict = construct_dataframes(version=version)
+    A changed week replaces that week's matchups, games and player games. A changed season
+    replaces that season's draft and upserts its teams and players. So a weekly update
+    writes a few hundred rows instead of reloading every table.
+    Views materialized by database_views() are refreshed for the changed seasons.
+
+    Parameters
+    ----------
+    version : int
+        Raw data store version.
+
+    rebuild : bool, default False
+        Drop every table and load the whole store, e.g. for a database written before load_state existed.
+
+    Returns
+    -------
+    Dict : [Str, Int]
+        Number of rows written to each table.
+    '''
+    conn = database.connect()
+
+    if not rebuild and not database.has_schema(conn):
+        rebuild = True
+
+    written = {table:0 for table in database.TABLES}
+    changed_years = set()
+
+    with conn:
+        conn.execute('BEGIN')
+        if rebuild:
+            database.drop_tables(conn)
+        database.create_schema(conn)
+
+        loaded = database.read_load_state(conn)
+        index = raw_store.read_index(version=version)
+
+        for year in raw_store.years(version=version):
+            hashes = index[str(year)]
+
+            if loaded.get((year, 'season')) != hashes['season']:
+                records = season_records(year, raw_store.read_season(version=version, year=year))
+                database.delete_season(conn, year=year)
+                for table, columns in records.items():
+                    written[table] += database.upsert(conn, table=table, columns=columns)
+                database.write_load_state(conn, year=year, name='season', hash=hashes['season'])
+                changed_years.add(year)
+
+            for week in raw_store.weeks(version=version, year=year):
+                if loaded.get((year, f'week-{week}')) == hashes['weeks'][str(week)]:
+                    continue
+
+                records = week_records(year, week, raw_store.read_week(version=version, year=year, week=week))
+                database.delete_week(conn, year=year, week=week)
+                for table, columns in records.items():
+                    written[table] += database.upsert(conn, table=table, columns=columns)
+                database.write_load_state(conn, year=year, name=f'week-{week}', hash=hashes['weeks'][str(week)])
+                changed_years.add(year)
+
+        if changed_years:
+            database.refresh_materialized(conn, years=changed_years)
 
-    conn = sqlite3.connect('database/fantasy-football.db')
-    
-    data_dict['teams'].to_sql('teams', con=conn, if_exists='replace', index=False)
-    data_dict['drafts'].to_sql('drafts', con=conn, if_exists='replace', index=False)
-    data_dict['matchups'].to_sql('matchups', con=conn, if_exists='replace', index=False)
-    data_dict['games'].to_sql('games', con=conn, if_exists='replace', index=False)
-    data_dict['player_games'].to_sql('player_games', con=conn, if_exists='replace', index=False)
-    data_dict['players'].to_sql('players', con=conn, if_exists='replace', index=False)
-
-    conn.commit()
     conn.close()
 
+    return written
+
 # Connects to database and creates/updates the views which are converted into CSV files
-def database_views() -> None:
-    conn = sqlite3.connect('database/fantasy-football.db')
-    c = conn.cursor()
+def database_views(materialize: bool = False, path: str = database.DATABASE_PATH) -> None:
+    '''
+    Creates the views which are converted into CSV files.
+
+    Parameters
+    ----------
+    materialize : bool, default False
+        Store the views in database.HEAVY_VIEWS as tables, refreshed by update_database() for the seasons it loads,
+        instead of running their joins on every read.
+
+    path : str, default database.DATABASE_PATH
+        Database to create the views in.
+    '''
+    conn = database.connect(path)
+    conn.execute('BEGIN')
 
-    c.execute('DROP VIEW IF EXISTS game_data')
     game_view = '''
-        CREATE VIEW game_data AS
             SELECT
                 m.year AS "Year",
                 m.week AS "Week",
@@ -328,12 +398,15 @@ def database_views() -> None:
 
             WHERE
                 m.matchup_type IN ('NONE','WINNERS_BRACKET')
+
+            ORDER BY
+                m.year,
+                m.week,
+                g.rowid
     '''
-    c.execute(game_view)
+    database.create_view(conn, name='game_data', select=game_view, materialize=materialize)
 
-    c.execute('DROP VIEW IF EXISTS matchup_data')
     matchup_view = '''
-        CREATE VIEW matchup_data AS
             SELECT
                 m.year AS "Year",
                 m.week AS "Week",
@@ -353,12 +426,15 @@ def database_views() -> None:
             
             WHERE
                 m.matchup_type IN ('NONE','WINNERS_BRACKET')
+
+            ORDER BY
+                m.year,
+                m.week,
+                m.rowid
     '''
-    c.execute(matchup_view)
+    database.create_view(conn, name='matchup_data', select=matchup_view, materialize=materialize)
 
-    c.execute('DROP VIEW IF EXISTS draft_data')
     draft_view = '''
-        CREATE VIEW draft_data AS
             SELECT
                 d.year AS "Year",
                 t.team_name AS "Team",
@@ -375,12 +451,15 @@ def database_views() -> None:
 
             LEFT JOIN teams AS t
             ON t.team_id = d.team_id
+
+            ORDER BY
+                d.year,
+                d.round,
+                d.pick
     '''
-    c.execute(draft_view)
+    database.create_view(conn, name='draft_data', select=draft_view, materialize=materialize)
 
-    c.execute('DROP VIEW IF EXISTS player_matchup_data')
     player_matchup_view = '''
-        CREATE VIEW player_matchup_data AS
             WITH
                 pg AS (
                     SELECT
@@ -444,11 +523,9 @@ def database_views() -> None:
                 pg.position_sort,
                 pg.points DESC
     '''
-    c.execute(player_matchup_view)
+    database.create_view(conn, name='player_matchup_data', select=player_matchup_view, materialize=materialize)
 
-    c.execute('DROP VIEW IF EXISTS player_game_data')
     player_game_view = '''
-        CREATE VIEW player_game_data AS
             SELECT
                 m.year AS "Year",
                 m.week AS "Week",
@@ -469,22 +546,66 @@ def database_views() -> None:
 
         LEFT JOIN teams AS t
         ON t.team_id = pg.team_id
+
+        ORDER BY
+            m.year,
+            m.week,
+            pg.rowid
     '''
-    c.execute(player_game_view)
+    database.create_view(conn, name='player_game_data', select=player_game_view, materialize=materialize)
 
-    conn.commit()
+    conn.execute('COMMIT')
     conn.close()
 
+# Views and tables written to the CSV file of each constants.DATA_FILES table
+CSV_VIEWS = {
+    'GAME_DATA':'game_data',
+    'MATCHUP_DATA':'matchup_data',
+    'TEAM_DATA':'teams',
+    'DRAFT_DATA':'draft_data',
+    'PLAYER_MATCHUP_DATA':'player_matchup_data',
+    'PLAYER_GAME_DATA':'player_game_data'
+}
+
+# Rows fetched from the database at a time while writing a CSV
+FETCH_SIZE = 5000
+
 # Write views to csv files
-def write_csvs() -> None:
-    conn = sqlite3.connect('database/fantasy-football.db')
-
-    pd.read_sql('SELECT * FROM game_data', con=conn).to_csv('database/fantasy-football-game-data.csv', index=False)
-    pd.read_sql('SELECT * FROM matchup_data', con=conn).to_csv('database/fantasy-football-matchup-data.csv', index=False)
-    pd.read_sql('SELECT * FROM teams', con=conn).to_csv('database/fantasy-football-team-data.csv', index=False)
-    pd.read_sql('SELECT * FROM draft_data', con=conn).to_csv('database/fantasy-football-draft-data.csv', index=False)
-    pd.read_sql('SELECT * FROM player_matchup_data', con=conn).to_csv('database/fantasy-football-player-matchup-data.csv', index=False)
-    pd.read_sql('SELECT * FROM player_game_data', con=conn).to_csv('database/fantasy-football-player-game-data.csv', index=False)
-
-    conn.commit()
-    conn.close()
\ No newline at end of file
+def write_csvs(path: str = database.DATABASE_PATH, jobs: int = len(CSV_VIEWS)) -> None:
+    '''
+    Streams every view in CSV_VIEWS into its CSV file, then rebuilds the binary data cache.
+
+    Each view is read FETCH_SIZE rows at a time on its own read-only connection and written straight to the file,
+    so memory stays bounded however many seasons there are. Files are replaced atomically once complete.
+
+    Parameters
+    ----------
+    path : str, default database.DATABASE_PATH
+        Database to export.
+
+    jobs : int, default len(CSV_VIEWS)
+        Number of views exported at once.
+    '''
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        list(pool.map(lambda name: write_csv(CSV_VIEWS[name], constants.DATA_FILES[name], path=path), CSV_VIEWS))
+
+    constants.write_data_cache()
+
+def write_csv(view: str, csv_path: str, path: str = database.DATABASE_PATH) -> int:
+    '''
+    Streams a view into a CSV file in the format of DataFrame.to_csv(index=False). Returns the number of rows written
+    '''
+    # The connection is closed even if reading the view or writing the file fails
+    with closing(database.connect(path, read_only=True)) as conn:
+        cursor = conn.execute(f'SELECT * FROM {view}')
+
+        rows = 0
+        with functions.open_atomic(csv_path, newline='') as file:
+            writer = csv.writer(file, lineterminator='\n')
+            writer.writerow([column[0] for column in cursor.description])
+
+            while chunk := cursor.fetchmany(FETCH_SIZE):
+                writer.writerows(chunk)
+                rows += len(chunk)
+
+    return rows
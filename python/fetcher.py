@@ -0,0 +1,160 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from espn_api.requests.espn_requests import ESPNUnknownError
+except ImportError:
+    # espn_api is only needed to reach ESPN, the fetcher itself also runs against stand-in Leagues
+    ESPNUnknownError = None
+
+# Default request budget for the ESPN API
+REQUESTS_PER_SECOND = 1.0
+BURST = 2
+MAX_WORKERS = 4
+RETRIES = 3
+BACKOFF = 2.0
+
+# Transient errors, retried by call_with_retry(): OSError covers connection errors and timeouts, including those
+# raised by requests. espn_api raises ESPNUnknownError for any unexpected HTTP status, e.g. 429 or 5xx.
+# Its ESPNAccessDenied (401) and ESPNInvalidLeague (404) are not retried
+RETRY_ON = (OSError,) if ESPNUnknownError is None else (OSError, ESPNUnknownError)
+
+class TokenBucket:
+    '''
+    Thread-safe token bucket rate limiter.
+
+    Tokens are added at a fixed rate up to capacity, and every request takes one token,
+    waiting until one is available.
+
+    Parameters
+    ----------
+    rate : float
+        Tokens added per second, i.e. the sustained number of requests per second.
+
+    capacity : int, default 1
+        Maximum number of tokens, i.e. how many requests may be sent at once after an idle period.
+
+    clock : callable, default time.monotonic
+    sleep : callable, default time.sleep
+        Replaceable for offline testing.
+    '''
+    def __init__(self, rate: float, capacity: int = 1, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity
+        self.clock = clock
+        self.sleep = sleep
+
+        self.tokens = capacity
+        self.updated = clock()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        while True:
+            with self.lock:
+                now = self.clock()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait = (1 - self.tokens) / self.rate
+
+            self.sleep(wait)
+
+def call_with_retry(func, retries: int = RETRIES, backoff: float = BACKOFF, retry_on: tuple = RETRY_ON, sleep=time.sleep):
+    '''
+    Calls func(), retrying with exponential backoff (backoff, 2 * backoff, 4 * backoff, ... seconds)
+    when it raises one of retry_on, by default RETRY_ON. The last error is raised once the retries are used up.
+    '''
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except retry_on:
+            if attempt == retries:
+                raise
+            sleep(backoff * 2 ** attempt)
+
+def fetch_seasons(
+        season_lengths: dict[int, int | None],
+        league_factory,
+        fetch_week,
+        rate: float = REQUESTS_PER_SECOND,
+        burst: int = BURST,
+        max_workers: int = MAX_WORKERS,
+        retries: int = RETRIES,
+        backoff: float = BACKOFF,
+        retry_on: tuple = RETRY_ON,
+        sleep=time.sleep,
+        clock=time.monotonic
+) -> dict[int, dict]:
+    '''
+    Fetches the league, pro players and every week's box scores of several seasons concurrently.
+
+    Every request (creating a League counts as one) goes through one shared token bucket,
+    so the whole fetch stays within rate requests per second however many workers are used.
+    Failed requests are retried, see call_with_retry().
+
+    Parameters
+    ----------
+    season_lengths : dict[int, int | None]
+        {year: number of weeks to fetch}. None fetches every completed week, up to league.current_week - 1.
+
+    league_factory : callable
+        league_factory(year) returns an espn_api League (or a stand-in with the same interface).
+
+    fetch_week : callable
+        fetch_week(league, year, week) returns the box scores of a week.
+
+    rate, burst : float, int
+        Sustained requests per second and the number of requests allowed at once, see TokenBucket.
+
+    max_workers : int
+        Number of requests in flight at once.
+
+    retries, backoff, retry_on :
+        See call_with_retry().
+
+    sleep, clock : callable, default time.sleep and time.monotonic
+        Replaceable for offline testing, see TokenBucket.
+
+    Returns
+    -------
+    dict[int, dict]
+        {year: {'League': League, 'Players': list, 'Box Scores': {week: box scores}}}
+    '''
+    bucket = TokenBucket(rate=rate, capacity=burst, clock=clock, sleep=sleep)
+
+    def request(func, *args):
+        def limited():
+            bucket.acquire()
+            return func(*args)
+
+        return call_with_retry(limited, retries=retries, backoff=backoff, retry_on=retry_on, sleep=sleep)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        years = list(season_lengths)
+        leagues = dict(zip(years, pool.map(lambda year: request(league_factory, year), years)))
+        weeks = {
+            year:range(1, (leagues[year].current_week - 1 if length is None else length) + 1)
+            for year, length in season_lengths.items()
+        }
+
+        players = {year:pool.submit(request, leagues[year].espn_request.get_pro_players) for year in years}
+        box_scores = {
+            (year, week):pool.submit(request, fetch_week, leagues[year], year, week)
+            for year in years
+            for week in weeks[year]
+        }
+
+        data = {}
+        for year in years:
+            data[year] = {
+                'League':leagues[year],
+                'Players':players[year].result(),
+                'Box Scores':{week:box_scores[(year, week)].result() for week in weeks[year]}
+            }
+
+    return data
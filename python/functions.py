@@ -1,10 +1,145 @@
+import os
+import tempfile
+from contextlib import contextmanager
+
 import pandas as pd
 import numpy as np
 import dominate
 from dominate.tags import *
 from dominate.svg import *
 
-from python import constants
+from python import constants, data_index
+
+def write_file(path: str, text: str) -> bool:
+    '''
+    Writes text to path atomically: the text is written to a temporary file in the same folder, which then replaces path.
+
+    Readers (and a web server) never see a partially written page. See write_bytes()
+    '''
+    return write_bytes(path, text.encode())
+
+def write_bytes(path: str, content: bytes) -> bool:
+    '''
+    Writes content to path atomically, unless path already holds exactly this content.
+
+    Skipped files keep their modification time, so deploys and compress_files() only see files which really changed.
+    Returns whether the file was written
+    '''
+    if file_equals(path, content):
+        return False
+
+    with open_atomic(path, mode='wb') as file:
+        file.write(content)
+
+    return True
+
+def file_equals(path: str, content: bytes) -> bool:
+    try:
+        if os.path.getsize(path) != len(content):
+            return False
+        with open(path, 'rb') as file:
+            return file.read() == content
+    except FileNotFoundError:
+        return False
+
+@contextmanager
+def open_atomic(path: str, newline: str = None, mode: str = 'w'):
+    '''
+    Opens a temporary file in the folder of path for writing ('w' or 'wb'), which replaces path once the with block finishes.
+    If the block raises, the temporary file is removed and path is left untouched. See write_bytes()
+    '''
+    folder = os.path.dirname(path) or '.'
+    os.makedirs(folder, exist_ok=True)
+
+    fd, temp_path = tempfile.mkstemp(dir=folder, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, mode, newline=newline) as file:
+            yield file
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+class table_body(tbody):
+    '''
+    tbody holding its rows as pre-rendered strings (see table_rows()) instead of a tr and td object per cell.
+
+    Renders exactly the same HTML as a tbody of tr(td(...), __pretty=False) rows.
+    '''
+    tagname = 'tbody'
+
+    def __init__(self, rows: list[str], *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rows = rows
+
+    def _render_children(self, sb, indent_level, indent_str, pretty, xhtml):
+        if not self.rows:
+            return True
+
+        if not pretty:
+            sb.extend(self.rows)
+            return True
+
+        newline = '\n' + indent_str * indent_level
+        for row in self.rows:
+            sb.append(newline)
+            sb.append(row)
+
+        return False
+
+def table_rows(
+        data: pd.DataFrame,
+        columns: list[str],
+        row_id_columns: list[str] = None,
+        champ_class: bool = False
+) -> list[str]:
+    '''
+    Renders the tbody rows of df_to_table() as HTML strings, one per row of data.
+
+    Works column by column: each column is converted to a list once and its td class is computed once,
+    then the rows are joined from the escaped cell strings.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Dataframe to be converted.
+
+    columns : list[str]
+        Columns to be displayed, in order.
+
+    row_id_columns : list[str], default None
+        Columns concatenated into each row's id, see df_to_table().
+
+    champ_class : bool, default False
+        Give rows with a Champ Flag of 1 the class "champ".
+
+    Returns
+    -------
+    list[str]
+        '<tr>...</tr>' strings.
+    '''
+    escape = dominate.util.escape
+
+    # Cell text matches dominate: numbers are converted with str(), then all text is escaped
+    cells = []
+    for column in columns:
+        td_open = '<td class="%s">' % escape(str(column).lower().replace(' ','-'), True)
+        cells.append([f'{td_open}{escape(str(value))}</td>' for value in data[column].tolist()])
+    rows = [''.join(row_cells) for row_cells in zip(*cells)] if cells else [''] * len(data)
+
+    row_attributes = [''] * len(data)
+
+    if champ_class:
+        champ_flags = data['Champ Flag'].tolist()
+        row_attributes = [' class="champ"' if flag == 1 else '' for flag in champ_flags]
+
+    if row_id_columns:
+        id_parts = [[('-' + str(value).lower().replace(' ','')) for value in data[column].tolist()] for column in row_id_columns]
+        row_ids = ['row' + ''.join(parts) for parts in zip(*id_parts)]
+        row_attributes = [f'{attributes} id="{escape(row_id, True)}"' for attributes, row_id in zip(row_attributes, row_ids)]
+
+    return [f'<tr{attributes}>{row}</tr>' for attributes, row in zip(row_attributes, rows)]
 
 def df_to_table(
         data: pd.DataFrame,
@@ -43,9 +178,6 @@ def df_to_table(
     '''
     t = table()
     head = thead()
-    body = tbody()
-
-    records = data.to_dict('records')
 
     columns = data.columns
     if custom_columns:
@@ -55,21 +187,8 @@ def df_to_table(
     for column in columns:
         column_row.add(th(column, _class=str(column).lower().replace(' ','-')))
     head.add(column_row)
-    
-    for record in records:
-        data_row = tr(__pretty=False)
-        if champ_class:
-            if record['Champ Flag'] == 1:
-                data_row['class'] = 'champ'
-        if row_id_columns:
-            row_id = 'row'
-            for column in row_id_columns:
-                row_id += ('-' + str(record[column]).lower().replace(' ',''))
-            data_row['id'] = row_id
-
-        for column in columns:
-            data_row.add(td(record[column], _class=str(column).lower().replace(' ','-')))
-        body.add(data_row)
+
+    body = table_body(table_rows(data, columns=columns, row_id_columns=row_id_columns, champ_class=champ_class))
 
     t.add(head)
     t.add(body)
@@ -157,6 +276,100 @@ def close_luck_score(your_score, opp_score) -> int:
 
     return (close_game_flag * win_flag) + (close_game_flag * loss_flag)
 
+def luck_scores(your_score, opp_score, mean=None, std=None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    '''
+    Vectorized form of opp_luck_score(), your_luck_score() and close_luck_score().
+
+    Applies the same formulas to whole arrays of scores at once, so the results are identical to calling the scalar functions row by row.
+
+    Parameters
+    ----------
+    your_score : np.ndarray
+        Score of the team for each game.
+
+    opp_score : np.ndarray
+        Score of the opponent for each game.
+
+    mean : float
+        League average score used as the luck baseline.
+
+    std : float
+        Scaled standard deviation used as the luck step size.
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray, np.ndarray]
+        Integer arrays of the opponent, your and close luck scores.
+
+    Raises
+    ------
+    ValueError, OverflowError
+        Like the scalar functions, when a luck score is NaN or infinite: std is 0 or NaN (e.g. a single game),
+        or an opponent scored exactly the mean.
+    '''
+    your_score = np.asarray(your_score, dtype=float)
+    opp_score = np.asarray(opp_score, dtype=float)
+
+    opp_diff = mean - opp_score
+    opp_luck = (opp_diff / np.absolute(opp_diff)) * np.floor(np.absolute(opp_diff) / std)
+
+    xi = lambda x: np.floor((mean + x) / (2*mean))
+    result = (your_score > opp_score).astype(int)
+    your_luck = np.floor(np.absolute(mean - your_score) / std) * (result * xi(2*mean - your_score) - (1-result) * xi(your_score))
+
+    close_game_flag = (np.absolute(your_score - opp_score) < 3).astype(int)
+    win_flag = (your_score > opp_score).astype(int)
+    loss_flag = -(your_score < opp_score).astype(int)
+    close_luck = (close_game_flag * win_flag) + (close_game_flag * loss_flag)
+
+    # astype(int) turns NaN and infinity into INT_MIN, int() raises on the first game with either, as the scalar functions do
+    invalid = ~(np.isfinite(opp_luck) & np.isfinite(your_luck))
+    if invalid.any():
+        game = np.argmax(invalid)
+        int(opp_luck[game])
+        int(your_luck[game])
+
+    return opp_luck.astype(int), your_luck.astype(int), close_luck
+
+def pairwise_sum(values: pd.Series) -> float:
+    '''
+    Sum of a group's values by numpy's pairwise summation, the same as calling .sum() on the group on its own
+    '''
+    return values.values.sum()
+
+def group_sums(values: np.ndarray, codes: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    '''
+    Sums values for each group code, matching the precision of calling .sum() on each group separately.
+
+    pandas' groupby sum, np.bincount and np.add.reduceat all add the values in another order, so the last bit of a
+    sum can differ and move PF/G or PA/G across a rounding boundary. A groupby with pairwise_sum() gives the same sums
+    but calls Python once per group, which more than doubles the time of standings_cube().
+    This sorts the values by group instead: when every group has the same number of rows they are summed
+    as the rows of a 2D array, otherwise each group is summed on its own.
+
+    Parameters
+    ----------
+    values : np.ndarray
+        Values to be summed.
+
+    codes : np.ndarray
+        Group code (0 to n-1) for each value, e.g. from pd.factorize().
+
+    counts : np.ndarray
+        Number of values in each group, e.g. from np.bincount(codes).
+
+    Returns
+    -------
+    np.ndarray
+        Sum of each group, in group code order.
+    '''
+    values = np.asarray(values)[np.argsort(codes, kind='stable')]
+
+    if (counts == counts[0]).all():
+        return values.reshape(len(counts), -1).sum(axis=1)
+
+    return np.array([group.sum() for group in np.split(values, np.cumsum(counts)[:-1])])
+
 def summary_table(data: pd.DataFrame, year: int, week: int = None) -> pd.DataFrame:
     temp = data.loc[(data['Year'] == year) & (data['Playoff Flag'] == False)].copy()
 
@@ -166,75 +379,201 @@ def summary_table(data: pd.DataFrame, year: int, week: int = None) -> pd.DataFra
     mean = temp['Score'].mean()
     std = temp['Score'].std() * 0.5
 
-    opp_luck = []
-    your_luck = []
-    close_luck = []
-
-    for your_score, opp_score in temp[['Score','Opp Score']].values:
-        opp_luck.append(opp_luck_score(opp_score=opp_score, mean=mean, std=std))
-        your_luck.append(your_luck_score(your_score=your_score, opp_score=opp_score, mean=mean, std=std))
-        close_luck.append(close_luck_score(your_score=your_score, opp_score=opp_score))
+    opp_luck, your_luck, close_luck = luck_scores(
+        your_score=temp['Score'].values,
+        opp_score=temp['Opp Score'].values,
+        mean=mean,
+        std=std
+    )
 
     temp['Opp Luck Score'] = opp_luck
     temp['Your Luck Score'] = your_luck
     temp['Close Luck Score'] = close_luck
 
-    temp['Luck Score'] = temp[['Opp Luck Score','Your Luck Score','Close Luck Score']].sum(axis=1)
+    temp['Luck Score'] = opp_luck + your_luck + close_luck
+    temp['Loss'] = temp['Win'].eq(0).astype(int)
 
-    champ_week = data.loc[data['Year'] == year, 'Week'].max()
-    if champ_week > 14:
-        champ = data.loc[(data['Year'] == year) & (data['Week'] == champ_week) & (data['Win'] == 1), 'Team'].item()
-    else:
-        champ = None
+    champ = season_champion(data, year)
 
     league_pfpg = round(temp['Score'].mean(), 2)
 
-    temp_teams = temp['Team'].unique()
-    weekly_standings = []
-
-    for team in temp_teams:
-        temp_team = temp.loc[temp['Team'] == team]
-        wins = temp_team['Win'].sum()
-        losses = temp_team['Win'].eq(0).sum()
-        record = f'{wins}-{losses}'
-
-        pf = round(temp_team['Score'].sum(), 2)
-        pfpg = round(temp_team['Score'].mean(), 2)
-        pfpg_plus = int(pfpg / league_pfpg * 100)
-        pa = round(temp_team['Opp Score'].sum(), 2)
-        papg = round(temp_team['Opp Score'].mean(), 2)
-        papg_plus = int(papg / league_pfpg * 100)
-        avg_margin = round((pf - pa) / len(temp_team), 2)
-        luck_score = temp_team['Luck Score'].sum()
-
-        champ_flag = int(champ == team)
-
-        weekly_standings.append(
-            {
-                'Week':week,
-                'Year':year,
-                'Team':team,
-                'Wins':wins,
-                'Losses':losses,
-                'Record':record,
-                'Points For':pf,
-                'Points Against':pa,
-                'PF/G':pfpg,
-                'PF/G+':pfpg_plus,
-                'PA/G':papg,
-                'PA/G+':papg_plus,
-                'Avg Margin':avg_margin,
-                'Luck Score':luck_score,
-                'Champ Flag':champ_flag
-            }
-        )
+    # Aggregate every team in one groupby, keeping teams in order of first appearance.
+    # Points are summed with pairwise_sum(), see group_sums()
+    weekly_standings = temp.groupby('Team', sort=False, observed=True).agg(
+        **{
+            'Wins':('Win', 'sum'),
+            'Losses':('Loss', 'sum'),
+            'Points For':('Score', pairwise_sum),
+            'Points Against':('Opp Score', pairwise_sum),
+            'Games':('Score', 'size'),
+            'Luck Score':('Luck Score', 'sum')
+        }
+    ).reset_index()
+    weekly_standings.insert(0, 'Week', week)
+    weekly_standings.insert(1, 'Year', year)
+    weekly_standings = standings_columns(weekly_standings, league_pfpg=league_pfpg, champ=champ)
 
-    weekly_standings = pd.DataFrame(weekly_standings)
     weekly_standings.sort_values(['Wins','Points For'], ascending=False, ignore_index=True, inplace=True)
     weekly_standings['Ranking'] = [i + 1 for i in weekly_standings.index]
 
     return weekly_standings
 
+def season_champion(data: pd.DataFrame, year: int) -> str | None:
+    '''
+    Returns the team which won the championship game in a given year, or None if the season has not finished
+    '''
+    champ_week = data.loc[data['Year'] == year, 'Week'].max()
+    if champ_week > 14:
+        return data.loc[(data['Year'] == year) & (data['Week'] == champ_week) & (data['Win'] == 1), 'Team'].item()
+
+    return None
+
+def standings_columns(standings: pd.DataFrame, league_pfpg: float | np.ndarray, champ: str | None) -> pd.DataFrame:
+    '''
+    Adds the display columns of summary_table() to aggregated team totals.
+
+    Parameters
+    ----------
+    standings : pd.DataFrame
+        One row per team with Week, Year, Team, Wins, Losses, Points For, Points Against, Games and Luck Score.
+        Points For and Points Against should be unrounded sums.
+
+    league_pfpg : float | np.ndarray
+        League points per game (rounded to 2 decimals), either one value or one value per row.
+
+    champ : str | None
+        Champion of the season, used for the Champ Flag column.
+
+    Returns
+    -------
+    pd.DataFrame
+        Standings with the summary_table() columns, unsorted and without Ranking.
+    '''
+    standings['PF/G'] = (standings['Points For'] / standings['Games']).round(2)
+    standings['PA/G'] = (standings['Points Against'] / standings['Games']).round(2)
+    standings['Points For'] = standings['Points For'].round(2)
+    standings['Points Against'] = standings['Points Against'].round(2)
+
+    standings['Record'] = standings['Wins'].astype(str) + '-' + standings['Losses'].astype(str)
+    standings['PF/G+'] = (standings['PF/G'] / league_pfpg * 100).astype(int)
+    standings['PA/G+'] = (standings['PA/G'] / league_pfpg * 100).astype(int)
+    standings['Avg Margin'] = ((standings['Points For'] - standings['Points Against']) / standings['Games']).round(2)
+    standings['Champ Flag'] = (standings['Team'] == champ).astype(int)
+
+    return standings[
+        [
+            'Week',
+            'Year',
+            'Team',
+            'Wins',
+            'Losses',
+            'Record',
+            'Points For',
+            'Points Against',
+            'PF/G',
+            'PF/G+',
+            'PA/G',
+            'PA/G+',
+            'Avg Margin',
+            'Luck Score',
+            'Champ Flag'
+        ]
+    ]
+
+def standings_cube(data: pd.DataFrame) -> pd.DataFrame:
+    '''
+    Builds the standings as of every regular season week of every season.
+
+    Each season is built in one cumulative pass: the luck score of every game as of every week is computed
+    with a single broadcast, then the team totals are accumulated week by week.
+    Each (Year, Week) slice is identical to summary_table(data, year, week).
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Game data, normally constants.GAME_DATA.
+
+    Returns
+    -------
+    pd.DataFrame
+        summary_table() columns plus Ranking, sorted by Year, Week and Ranking and indexed by (Year, Week, Team).
+    '''
+    seasons = [season_standings_cube(data, year) for year in data['Year'].unique()]
+    cube = pd.concat(seasons, ignore_index=True)
+
+    return cube.set_index(['Year','Week','Team'], drop=False).sort_index(level=['Year','Week'], sort_remaining=False)
+
+def season_standings_cube(data: pd.DataFrame, year: int) -> pd.DataFrame:
+    '''
+    Builds the standings as of every regular season week of a single season. Used by standings_cube()
+    '''
+    season = data.loc[(data['Year'] == year) & (data['Playoff Flag'] == False)]
+
+    weeks = season['Week'].values
+    scores = season['Score'].values
+    opp_scores = season['Opp Score'].values
+    wins = season['Win'].values
+    losses = season['Win'].eq(0).astype(int).values
+    codes, teams = pd.factorize(season['Team'])
+
+    # played[i, j] is True if game j had been played by the i-th week of the season
+    season_weeks = np.unique(weeks)
+    played = weeks[None, :] <= season_weeks[:, None]
+
+    means = np.array([season['Score'].loc[mask].mean() for mask in played])
+    stds = np.array([season['Score'].loc[mask].std() * 0.5 for mask in played])
+
+    # Luck score of every game as of every week, shape (weeks, games)
+    luck = sum(
+        luck_scores(
+            your_score=scores[None, :],
+            opp_score=opp_scores[None, :],
+            mean=means[:, None],
+            std=stds[:, None]
+        )
+    )
+
+    totals = {'Wins':[], 'Losses':[], 'Points For':[], 'Points Against':[], 'Games':[], 'Luck Score':[]}
+    for mask, week_luck in zip(played, luck):
+        games = np.bincount(codes[mask], minlength=len(teams))
+
+        totals['Wins'].append(np.bincount(codes[mask], weights=wins[mask], minlength=len(teams)))
+        totals['Losses'].append(np.bincount(codes[mask], weights=losses[mask], minlength=len(teams)))
+        totals['Points For'].append(group_sums(scores[mask], codes=codes[mask], counts=games))
+        totals['Points Against'].append(group_sums(opp_scores[mask], codes=codes[mask], counts=games))
+        totals['Games'].append(games)
+        totals['Luck Score'].append(np.bincount(codes[mask], weights=week_luck[mask], minlength=len(teams)))
+
+    cube = pd.DataFrame({column:np.concatenate(values) for column, values in totals.items()})
+    cube.insert(0, 'Week', np.repeat(season_weeks, len(teams)))
+    cube.insert(1, 'Year', year)
+    cube.insert(2, 'Team', np.tile(teams, len(season_weeks)))
+    cube[['Wins','Losses','Luck Score']] = cube[['Wins','Losses','Luck Score']].astype(int)
+
+    league_pfpg = pd.Series(np.round(means, 2), index=season_weeks)
+    cube = cube.loc[cube['Games'] > 0].reset_index(drop=True)
+    cube = standings_columns(cube, league_pfpg=cube['Week'].map(league_pfpg), champ=season_champion(data, year))
+
+    cube = cube.sort_values(['Week','Wins','Points For'], ascending=[True, False, False], ignore_index=True)
+    cube['Ranking'] = cube.groupby('Week').cumcount() + 1
+
+    return cube
+
+def cube_standings(cube: pd.DataFrame, year: int, week: int = None) -> pd.DataFrame:
+    '''
+    Reads the standings for a given year and week out of standings_cube().
+
+    If week is None, returns the final regular season standings, matching summary_table(data, year).
+    '''
+    if week == None:
+        week = cube.loc[year, 'Week'].max()
+        standings = cube.loc[(year, week)].reset_index(drop=True)
+        standings['Week'] = None
+
+        return standings
+
+    return cube.loc[(year, week)].reset_index(drop=True)
+
 def round_min(value, rounding, min_distance=0.1):
     rounded = np.floor(value / rounding) * rounding
 
@@ -311,6 +650,60 @@ def calculate_ticks(
 
     return x_ticks, y_ticks
 
+class svg_chart(svg):
+    '''
+    svg holding its elements as pre-rendered strings (see df_to_svg()) instead of a dominate object per element.
+
+    Each element is either a string or an (open tag, elements, close tag) group.
+    Renders exactly the same SVG as the equivalent tree of dominate.svg objects.
+    '''
+    tagname = 'svg'
+
+    def __init__(self, elements: list, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.elements = elements
+
+    def _render_children(self, sb, indent_level, indent_str, pretty, xhtml):
+        return render_elements(self.elements, sb, indent_level, indent_str, pretty)
+
+def render_elements(elements: list, sb: list, indent_level: int, indent_str: str, pretty: bool) -> bool:
+    '''
+    Appends the elements of an svg_chart to sb, indented like dominate's pretty output. Returns whether they were rendered inline
+    '''
+    for element in elements:
+        if pretty:
+            sb.append('\n' + indent_str * indent_level)
+
+        if isinstance(element, str):
+            sb.append(element)
+            continue
+
+        open_tag, children, close_tag = element
+        sb.append(open_tag)
+        if not render_elements(children, sb, indent_level + 1, indent_str, pretty):
+            sb.append('\n' + indent_str * indent_level)
+        sb.append(close_tag)
+
+    return not (pretty and elements)
+
+def svg_open(name: str, attributes: dict) -> str:
+    '''
+    Opening tag with the attributes sorted, escaped and filtered like dominate does (False, None and 0 are left out)
+    '''
+    escape = dominate.util.escape
+    rendered = ''.join(f' {attribute}="{escape(str(value), True)}"' for attribute, value in sorted(attributes.items()) if value not in (False, None))
+
+    return f'<{name}{rendered}>'
+
+def svg_tag(name: str, attributes: dict, content=None) -> str:
+    return f"{svg_open(name, attributes)}{'' if content is None else dominate.util.escape(str(content))}</{name}>"
+
+def svg_number(attribute: str, value) -> str:
+    '''
+    Numeric attribute of a mark, left out when 0 like dominate does
+    '''
+    return '' if value in (False, None) else f' {attribute}="{value}"'
+
 def df_to_svg(
         data: pd.DataFrame, 
         x_col: str, 
@@ -320,7 +713,36 @@ def df_to_svg(
         height: int = 300,
         x_tick_spacing: int = 50,
         y_tick_spacing: int = 50
-):
+) -> svg_chart:
+    '''
+    Draws a scatter, line or bar chart of y_col against x_col, with each mark colored by its row's Team.
+
+    Pixel coordinates of all ticks and marks are computed at once with NumPy, and only the marks of the
+    requested chart type are written, as SVG text.
+
+    Parameters
+    ----------
+    data : pd.DataFrame
+        Data to be drawn, with x_col, y_col and Team columns.
+
+    x_col, y_col : str
+        Columns on the x and y axis, also used as the axis titles.
+
+    chart_type : str, default 'scatter'
+        'scatter' (circles), 'line' (circles joined by a line) or 'bar' (bars from zero).
+
+    width, height : int
+        Size of the chart in pixels.
+
+    x_tick_spacing, y_tick_spacing : int
+        Distance between ticks in data units.
+
+    Returns
+    -------
+    svg_chart
+        Renders like any other dominate svg.
+    '''
+    escape = dominate.util.escape
 
     # margin x and y from edges of visual
     m_top, m_bottom, m_left, m_right = 10, 50, 60, 10
@@ -332,153 +754,99 @@ def df_to_svg(
     # Bring in x and y ticks from calculate_ticks function
     include_zero = True if chart_type == 'bar' else False
     xlim, ylim = calculate_limits(data=data, x_col=x_col, y_col=y_col, x_tick_spacing=x_tick_spacing, y_tick_spacing=y_tick_spacing, include_zero=include_zero)
-    # if 'ylim' in kwargs:
-    #     ylim = kwargs.pop('ylim')
 
     x_limit_min, x_limit_max = xlim
     y_limit_min, y_limit_max = ylim
 
     x_ticks, y_ticks = calculate_ticks(xlim=xlim, ylim=ylim, x_tick_spacing=x_tick_spacing, y_tick_spacing=y_tick_spacing)
 
-    d_svg = svg(
-        xmlns='http://www.w3.org/2000/svg',
-        width=width,
-        height=height,
-        viewBox=f'0 0 {width} {height}'
-    )
+    # Data values to pixels, rounded with Python's round() to 3 decimals
+    def x_pixels(values):
+        pixels = m_left + ((np.asarray(values, dtype=float) - x_limit_min) / (x_limit_max - x_limit_min) * P_x)
+        return [round(pixel, 3) for pixel in pixels.tolist()]
 
-    outer_group = g(
-        font_family='Arial',
-        font_size=10,
-        text_anchor='middle',
-        dominant_baseline='hanging'
-    )
-    d_svg.add(outer_group)
+    def y_pixels(values):
+        pixels = (height - m_bottom) - ((np.asarray(values, dtype=float) - y_limit_min) / (y_limit_max - y_limit_min) * P_y)
+        return [round(pixel, 3) for pixel in pixels.tolist()]
 
     border = write_path([0, width, width, 0], [0, 0, height, height], close=True)
-    border_path = path(d=border, fill='white', _id='border')
-    outer_group.add(border_path)
-
-    
-
-    xlabel_group = g()
+    elements = [svg_tag('path', {'d':border, 'fill':'white', 'id':'border'})]
 
+    # Gridlines and labels of the inner x ticks, and of every y tick
     grid_path_d = []
-    for i, xtick in enumerate(x_ticks):
-        if i == 0 or i == (len(x_ticks) - 1):
-            continue
-        x = round(m_left + (xtick - x_limit_min) / (x_limit_max - x_limit_min) * P_x, 3)
 
-        gridline = write_path([x, x], [m_top, height - m_bottom])
-        grid_path_d.append(gridline)
-
-        xtick_label = text(
-            xtick,
-            x=x,
-            y=height - m_bottom + m_tick
-        )
-        xlabel_group.add(xtick_label)
-
-    outer_group.add(xlabel_group)
+    inner_x_ticks = x_ticks[1:-1]
+    xtick_labels = []
+    for xtick, x in zip(inner_x_ticks, x_pixels(inner_x_ticks)):
+        grid_path_d.append(write_path([x, x], [m_top, height - m_bottom]))
+        xtick_labels.append(svg_tag('text', {'x':x, 'y':height - m_bottom + m_tick}, xtick))
+    elements.append(('<g>', xtick_labels, '</g>'))
 
-    ylabel_group = g(
-        text_anchor='end',
-        dominant_baseline='middle'
-    )
-    zero_grid_path = False
+    ytick_labels = []
+    zero_grid_path = None
     zero_ytick = False
-    for ytick in y_ticks:
-        y = round((height - m_bottom) - (ytick - y_limit_min) / (y_limit_max - y_limit_min) * P_y, 3)
-
+    for ytick, y in zip(y_ticks, y_pixels(y_ticks)):
         gridline = write_path([m_left, width - m_right], [y, y])
         grid_path_d.append(gridline)
-
-        ytick_label = text(
-            ytick,
-            x=m_left - m_tick,
-            y=y
-        )
-        ylabel_group.add(ytick_label)
-
+        ytick_labels.append(svg_tag('text', {'x':m_left - m_tick, 'y':y}, ytick))
 
         if ytick == 0:
-            zero_grid_path = path(d=gridline, stroke='black')
+            zero_grid_path = svg_tag('path', {'d':gridline, 'stroke':'black'})
             zero_ytick = y
+    elements.append((svg_open('g', {'dominant-baseline':'middle', 'text-anchor':'end'}), ytick_labels, '</g>'))
 
-    outer_group.add(ylabel_group)
-
-    grid_path = path(
-        d=' '.join(grid_path_d),
-        stroke='lightgrey'
-    )
-    outer_group.add(grid_path)
+    elements.append(svg_tag('path', {'d':' '.join(grid_path_d), 'stroke':'lightgrey'}))
     if zero_grid_path:
-        outer_group.add(zero_grid_path)
-
-    axis_title_group = g(font_size=16)
-    outer_group.add(axis_title_group)
-    xlabel = text(
-        x_col,
-        x=(P_x / 2 + m_left),
-        y=(height - (m_bottom / 2))
-    )
-    ylabel = text(
-        y_col,
-        x=10,
-        y=(P_y / 2 + m_top),
-        transform=f'rotate(-90, {10}, {P_y / 2 + m_top})'
-    )
+        elements.append(zero_grid_path)
+
+    axis_titles = [
+        svg_tag('text', {'x':P_x / 2 + m_left, 'y':height - (m_bottom / 2)}, x_col),
+        svg_tag('text', {'x':10, 'y':P_y / 2 + m_top, 'transform':f'rotate(-90, {10}, {P_y / 2 + m_top})'}, y_col)
+    ]
+    elements.append(('<g font-size="16">', axis_titles, '</g>'))
 
-    axis_title_group.add([xlabel, ylabel])
     axes = write_path([m_left, width - m_right, width - m_right, m_left], [m_top, m_top, height - m_bottom, height - m_bottom], close=True)
-    axes_path = path(d=axes, fill='none', stroke='black', _id='axes')
-    outer_group.add(axes_path)
-
-    x_points = []
-    y_points = []
-    circles_group = g(
-        stroke='black',
-        stroke_width=1.5
-    )
-    bars_group = g(stroke='black')
-    for index, row in data.iterrows():
-        v_x = round(m_left + ((row[x_col] - x_limit_min) / (x_limit_max - x_limit_min) * (P_x)), 3)
-        v_y = round((height - m_bottom) - ((row[y_col] - y_limit_min) / (y_limit_max - y_limit_min) * (P_y)), 3)
+    elements.append(svg_tag('path', {'d':axes, 'fill':'none', 'id':'axes', 'stroke':'black'}))
 
-        bar_y = v_y if row[y_col] > 0 else zero_ytick
-        bar_height = zero_ytick - v_y if row[y_col] > 0 else v_y - zero_ytick
-        bar_width = 25
-
-        bars_group.add(
-            rect(
-                x=v_x - bar_width / 2,
-                y=bar_y,
-                width=bar_width,
-                height=bar_height,
-                fill=constants.COLOR_DICT[row['Team'].lower()]
-            )
-        )
-        circles_group.add(circle(cx=v_x, cy=v_y, r=4, fill=constants.COLOR_DICT[row['Team'].lower()]))
-        
-        x_points.append(v_x)
-        y_points.append(v_y)
+    # Marks, only for the requested chart type
+    x_values, y_values = data[x_col].to_numpy(), data[y_col].to_numpy()
+    x_points, y_points = x_pixels(x_values), y_pixels(y_values)
 
+    team_colors = {team:escape(constants.COLOR_DICT[str(team).lower()], True) for team in data['Team'].unique()}
+    colors = [team_colors[team] for team in data['Team'].tolist()]
 
     if chart_type == 'line':
-        line = write_path(x_points, y_points)
-        line_path = path(d=line, fill='none', stroke='black')
-        outer_group.add(line_path)
+        elements.append(svg_tag('path', {'d':write_path(x_points, y_points), 'fill':'none', 'stroke':'black'}))
 
     if chart_type in ['scatter','line']:
-        outer_group.add(circles_group)
+        circles = [
+            f'<circle{svg_number("cx", x)}{svg_number("cy", y)} fill="{color}" r="4"></circle>'
+            for x, y, color in zip(x_points, y_points, colors)
+        ]
+        elements.append(('<g stroke="black" stroke-width="1.5">', circles, '</g>'))
 
     if chart_type == 'bar':
-        outer_group.add(bars_group)
+        bar_width = 25
+        positive = (y_values > 0).tolist()
 
-    return d_svg
+        bars = []
+        for x, y, color, is_positive in zip(x_points, y_points, colors, positive):
+            bar_y = y if is_positive else zero_ytick
+            bar_height = zero_ytick - y if is_positive else y - zero_ytick
+            bars.append(f'<rect fill="{color}"{svg_number("height", bar_height)} width="{bar_width}"{svg_number("x", x - bar_width / 2)}{svg_number("y", bar_y)}></rect>')
+        elements.append(('<g stroke="black">', bars, '</g>'))
+
+    return svg_chart(
+        [(svg_open('g', {'dominant-baseline':'hanging', 'font-family':'Arial', 'font-size':10, 'text-anchor':'middle'}), elements, '</g>')],
+        xmlns='http://www.w3.org/2000/svg',
+        width=width,
+        height=height,
+        viewBox=f'0 0 {width} {height}'
+    )
 
 def playoff_bracket_svg(data: pd.DataFrame, year: int) -> svg:
-    playoff_matchups = data.loc[(data['Year'] == year) & (data['Playoff Flag'])].copy()
+    season_matchups = data_index.year_rows(data, year=year)
+    playoff_matchups = season_matchups.loc[season_matchups['Playoff Flag'] == True].copy()
     playoff_matchups['Playoff Round'] = (playoff_matchups['Week'] % playoff_matchups['Week'].min()) + 1
 
     round_count = playoff_matchups['Playoff Round'].max()
@@ -1,7 +1,10 @@
 from dominate.tags import *
 import pandas as pd
 
-from python import document, page_header, functions, constants
+from python import document, functions, constants, data_index, playoff_odds
+
+# Season shown in the weekly summary
+YEAR = 2025
 
 def home_content(week: int) -> div:
     '''
@@ -10,6 +13,7 @@ def home_content(week: int) -> div:
     Includes:
     ---------
     * Documentation PDF
+    * Playoff odds of the current season
     '''
     container = div(_class='content')
     container.add(h1('Home'))
@@ -28,12 +32,24 @@ def home_content(week: int) -> div:
 
     container.add(payout_div)
 
+    # Playoff and unplayed weeks show the odds as of the last regular season week
+    odds_week = playoff_odds.odds_week(year=YEAR, week=week)
+    if odds_week is not None:
+        odds_div = functions.content_container(
+            title=f'{YEAR} Playoff Odds',
+            content=functions.df_to_table(
+                data=playoff_odds.odds_table(playoff_odds.playoff_odds(year=YEAR, week=odds_week)),
+                table_id='playoff-odds-table'
+            )
+        )
+        container.add(odds_div)
+
 
     container.add(h2('Weekly Summary'))
 
-    year = 2025
+    year = YEAR
 
-    data = constants.PLAYER_GAME_DATA.loc[(constants.PLAYER_GAME_DATA['Year'] == year) & (constants.PLAYER_GAME_DATA['Week'] == week)].copy()
+    data = data_index.year_week_rows(constants.PLAYER_GAME_DATA, year=year, week=week).copy()
     data['Proj Diff'] = round(data['Points'] - data['Projected Points'], 2)
 
     bench_df = data.loc[data['Slot Position'] == 'BE', ['Team','Player','Position','Points']].copy().sort_values('Points', ascending=False).head(5)
@@ -54,12 +70,19 @@ def home_content(week: int) -> div:
 
     return container
 
-def home_page(week: int):
-    doc = document.document()
-    doc.add(page_header.page_header(active_year='home'))
+def home_dependencies(week: int) -> list:
+    '''
+    Data read by home_content(), used by the build manifest to decide whether the page has to be rebuilt
+    '''
+    dependencies = [data_index.year_week_rows(constants.PLAYER_GAME_DATA, year=YEAR, week=week)]
+    odds_week = playoff_odds.odds_week(year=YEAR, week=week)
+    if odds_week is not None:
+        dependencies += playoff_odds.odds_dependencies(year=YEAR, week=odds_week)
+
+    return dependencies
 
-    doc.add(home_content(week=week))
-    doc.add(script(src=f'{constants.ROOT}script.js'))
+def home_html(week: int) -> str:
+    return document.page_html(home_content(week=week), active_year='home')
 
-    with open('index.html','w') as file:
-        file.write(doc.render())
\ No newline at end of file
+def home_page(week: int):
+    functions.write_file('index.html', home_html(week=week))
\ No newline at end of file
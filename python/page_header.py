@@ -1,13 +1,18 @@
+import hashlib
+
 import numpy as np
 from dominate.tags import *
 
-from python import constants
+from python import constants, assets, cache
+
+# Opening tag of every top level item of the navbar, see nav_parts()
+NAV_ITEM = '<div class="dropdown">'
 
 def page_header(active_year: int = None) -> div:
     '''
     Creates the blue header div, adds in the logo and heading at the top
 
-    Takes an input for the active page in the navbar. This is passed directly to topnav()
+    Takes an input for the active page in the navbar. This is passed directly to nav_fragment()
     
     Parameters
     ----------
@@ -20,11 +25,11 @@ def page_header(active_year: int = None) -> div:
         div container for the entire header
     '''
     container = div(_class='header')
-    logo = img(src=f'{constants.ROOT}Assets/Fantasy-Football-App-LOGO.png', _class='logo')
+    logo = img(src=assets.asset_path('Assets/Fantasy-Football-App-LOGO.png'), _class='logo')
     heading = h1('Fantasy Football Luck Scores')
     menu_button = button('☰', _id='toggle', _class='menu-btn')
 
-    navbar = topnav(active_year=active_year)
+    navbar = nav_fragment(active_year=active_year)
     
     container.add(logo)
     container.add(heading)
@@ -37,7 +42,7 @@ def page_header(active_year: int = None) -> div:
 
 def topnav(active_year: int = None) -> div:
     '''
-    Creates the navbar with dropdowns. Called by the header() function
+    Creates the navbar with dropdowns. Rendered once per build by nav_parts(), pages use nav_fragment()
 
     Parameters
     ----------
@@ -96,4 +101,57 @@ def topnav(active_year: int = None) -> div:
         champions = div(a('Champions', href=f'{constants.ROOT}champion.html'), _class='dropdown')
     container.add(champions)
 
-    return container
\ No newline at end of file
+    return container
+
+def nav_keys() -> list:
+    '''
+    active_year of each top level navbar item, in order
+    '''
+    return ['home'] + [year for year, _ in constants.YEARS_WEEKS] + ['team', 'champion']
+
+def nav_fingerprint() -> str:
+    '''
+    Short hash of the navbar's contents (the seasons and their weeks, and the teams), used in the keys of the cached navbar and page shells
+    '''
+    digest = hashlib.sha256()
+    digest.update(repr(constants.YEARS_WEEKS).encode())
+    digest.update(repr(sorted(constants.TEAMS)).encode())
+
+    return digest.hexdigest()[:16]
+
+def nav_parts(indent_level: int = 2, indent_str: str = '  ', pretty: bool = True, xhtml: bool = False) -> list[str]:
+    '''
+    Renders topnav() without an active item, split at the opening tag of each top level item.
+
+    Cached with the shared build output, so the navbar is rendered once per build (and per indent level it appears at).
+    The default indent level is the one of the navbar in every page's body.
+    '''
+    def render():
+        parts = ''.join(topnav()._render([], indent_level, indent_str, pretty, xhtml)).split(NAV_ITEM)
+        if len(parts) != len(nav_keys()) + 1:
+            raise ValueError(f'{NAV_ITEM} found {len(parts) - 1} times in the navbar, expected {len(nav_keys())}')
+        return parts
+
+    return cache.get('nav', (constants.ROOT, nav_fingerprint(), indent_level, indent_str, pretty, xhtml), render)
+
+class nav_fragment(div):
+    '''
+    Navbar of a page, rendered from the shared nav_parts() with the active item's class added.
+
+    Renders exactly the same HTML as topnav(active_year).
+    '''
+    tagname = 'div'
+
+    def __init__(self, active_year: int = None, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.active_year = active_year
+
+    def _render(self, sb, indent_level, indent_str, pretty, xhtml):
+        parts = nav_parts(indent_level, indent_str, pretty and self.is_pretty, xhtml)
+
+        sb.append(parts[0])
+        for key, part in zip(nav_keys(), parts[1:]):
+            sb.append(NAV_ITEM.replace('dropdown', 'dropdown active') if key == self.active_year else NAV_ITEM)
+            sb.append(part)
+
+        return sb
@@ -0,0 +1,310 @@
+import numpy as np
+import pandas as pd
+
+from python import constants, cache, data_index, standings
+
+# Monte Carlo playoff odds: the rest of a regular season and the playoff bracket are played out many times at once,
+# with every team's scores drawn from a normal distribution fitted to its scores so far (see score_model()).
+# Weeks already in MATCHUP_DATA keep their real pairings, weeks not scheduled yet get random pairings.
+# Seeding follows summary_table(): wins, then points for.
+
+SIMULATIONS = 5000
+SEED = 0
+
+# Number of distinct random pairings a simulated week is drawn from, see simulate()
+PAIRINGS = 512
+
+# Fixed playoff brackets by number of playoff teams. A node is a seed or a (node, node) game, there is no reseeding:
+# with 6 teams, seeds 1 and 2 have a bye and then play the winners of 4-5 and 3-6
+BRACKETS = {
+    4:((1, 4), (2, 3)),
+    6:((1, (4, 5)), (2, (3, 6))),
+    8:(((1, 8), (4, 5)), ((2, 7), (3, 6)))
+}
+DEFAULT_PLAYOFF_TEAMS = 6
+
+# A team's score distribution is blended with the league's as if it had this many extra games at the league average,
+# so early season odds are not driven by one or two games
+PRIOR_GAMES = 3
+
+def bracket_depths(node, depth: int = 0) -> dict[int, int]:
+    '''
+    {seed: number of games between the seed's first game and the final} of a BRACKETS bracket
+    '''
+    if isinstance(node, int):
+        return {node:depth}
+
+    return {**bracket_depths(node[0], depth + 1), **bracket_depths(node[1], depth + 1)}
+
+def bye_seeds(bracket) -> int:
+    '''
+    Number of top seeds which skip the first playoff round
+    '''
+    depths = bracket_depths(bracket)
+
+    return sum(depth < max(depths.values()) for depth in depths.values())
+
+def season_format(year: int) -> tuple[int, int, int]:
+    '''
+    Playoff teams and regular season weeks of a season, read from its first playoff week in MATCHUP_DATA.
+
+    A season still in progress uses the format of the latest season with playoffs.
+
+    Returns
+    -------
+    tuple[int, int, int]
+        (playoff teams, regular season weeks, season the format was read from)
+    '''
+    matchups = constants.MATCHUP_DATA
+    playoff_years = sorted(matchups.loc[matchups['Playoff Flag'] == True, 'Year'].unique())
+    earlier = [playoff_year for playoff_year in playoff_years if playoff_year <= year]
+
+    if not earlier:
+        weeks = max(weeks for _, weeks in constants.YEARS_WEEKS)
+        return DEFAULT_PLAYOFF_TEAMS, weeks, year
+
+    reference = earlier[-1]
+    season = data_index.year_rows(matchups, year=reference)
+    playoffs = season.loc[season['Playoff Flag'] == True]
+    first_round = playoffs.loc[playoffs['Week'] == playoffs['Week'].min()]
+
+    teams = pd.concat([first_round['Home Team'], first_round['Away Team']]).astype(str)
+    playoff_teams = int((teams != 'Bye').sum())
+
+    return playoff_teams, int(first_round['Week'].iloc[0]) - 1, int(reference)
+
+def score_model(games: pd.DataFrame, teams: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    '''
+    Mean and standard deviation of each team's score, from its regular season games blended with the league's
+    (see PRIOR_GAMES). Teams without games get the league's distribution.
+    '''
+    games = games.loc[(games['Playoff Flag'] == False) & games['Team'].notna()]
+    league_mean, league_var = games['Score'].mean(), games['Score'].var()
+
+    grouped = games.groupby(games['Team'].astype(str))['Score']
+    count = grouped.count().reindex(teams, fill_value=0).values
+    mean = grouped.mean().reindex(teams).fillna(league_mean).values
+    var = grouped.var(ddof=0).reindex(teams).fillna(league_var).values
+
+    means = (count * mean + PRIOR_GAMES * league_mean) / (count + PRIOR_GAMES)
+    stds = np.sqrt((count * var + PRIOR_GAMES * league_var) / (count + PRIOR_GAMES))
+
+    return means, stds
+
+def remaining_schedule(year: int, week: int, regular_weeks: int, teams: list[str]) -> list:
+    '''
+    Pairings of the regular season weeks after week: (home, away) team positions for weeks in MATCHUP_DATA,
+    None for weeks which have not been scheduled yet
+    '''
+    positions = {team:i for i, team in enumerate(teams)}
+    schedule = []
+
+    for remaining_week in range(week + 1, regular_weeks + 1):
+        matchups = data_index.year_week_rows(constants.MATCHUP_DATA, year=year, week=remaining_week)
+        pairs = [
+            (positions[home], positions[away])
+            for home, away in zip(matchups['Home Team'].astype(str), matchups['Away Team'].astype(str))
+            if home in positions and away in positions
+        ]
+        schedule.append((np.array([home for home, _ in pairs]), np.array([away for _, away in pairs])) if pairs else None)
+
+    return schedule
+
+def play_bracket(node, seeds: np.ndarray, means: np.ndarray, stds: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    '''
+    Plays a bracket in every simulation at once. seeds holds the team position of each seed, one row per simulation.
+    Returns the winner's team position per simulation
+    '''
+    if isinstance(node, int):
+        return seeds[:, node - 1]
+
+    first = play_bracket(node[0], seeds, means, stds, rng)
+    second = play_bracket(node[1], seeds, means, stds, rng)
+
+    first_score = rng.normal(means[first], stds[first])
+    second_score = rng.normal(means[second], stds[second])
+
+    return np.where(first_score >= second_score, first, second)
+
+def simulate(
+        wins: np.ndarray,
+        points_for: np.ndarray,
+        means: np.ndarray,
+        stds: np.ndarray,
+        schedule: list,
+        playoff_teams: int,
+        simulations: int = SIMULATIONS,
+        seed: int = SEED
+) -> dict[str, np.ndarray]:
+    '''
+    Simulates the rest of a regular season and the playoffs, vectorized over simulations.
+
+    Parameters
+    ----------
+    wins, points_for : np.ndarray
+        Current totals of each team.
+
+    means, stds : np.ndarray
+        Score distribution of each team, see score_model().
+
+    schedule : list
+        Remaining weeks, see remaining_schedule().
+
+    playoff_teams : int
+        Number of playoff teams, a key of BRACKETS.
+
+    simulations : int, default SIMULATIONS
+        Number of simulated seasons.
+
+    seed : int, default SEED
+        Seed of the random generator, the same inputs and seed always give the same odds.
+
+    Returns
+    -------
+    dict[str, np.ndarray]
+        Per team: 'Proj Wins' (mean final wins), 'Playoffs', 'Bye' and 'Champion' probabilities.
+    '''
+    if playoff_teams not in BRACKETS:
+        raise ValueError(f'No playoff bracket for {playoff_teams} teams, expected one of {sorted(BRACKETS)}')
+
+    rng = np.random.default_rng(seed)
+    team_count = len(wins)
+    teams = np.arange(team_count)
+
+    total_wins = np.tile(np.asarray(wins, dtype=float), (simulations, 1))
+    total_points = np.tile(np.asarray(points_for, dtype=float), (simulations, 1))
+
+    # Random pairings are drawn from a pool of PAIRINGS random permutations, in which position i plays position i ^ 1.
+    # With an odd number of teams the last position sits out
+    opponent_positions = teams ^ 1
+    if team_count % 2:
+        opponent_positions[-1] = team_count - 1
+
+    order = rng.permuted(np.tile(teams, (PAIRINGS, 1)), axis=1)
+    pairings = np.empty_like(order)
+    pairings[np.arange(PAIRINGS)[:, None], order] = order[:, opponent_positions]
+
+    for pairs in schedule:
+        # opponents[s, t] is the team t plays in simulation s, or t itself if it does not play
+        if pairs is None:
+            opponents = pairings[rng.integers(PAIRINGS, size=simulations)]
+        else:
+            opponents = teams.copy()
+            opponents[pairs[0]], opponents[pairs[1]] = pairs[1], pairs[0]
+            opponents = np.broadcast_to(opponents, (simulations, team_count))
+
+        scores = means + stds * rng.standard_normal((simulations, team_count), dtype=np.float32)
+        opponent_scores = np.take_along_axis(scores, opponents, axis=1)
+
+        total_wins += scores > opponent_scores
+        total_points += np.where(opponents != teams, scores, 0)
+
+    # Seed order: wins, then points for (points never reach 10^6)
+    seeds = np.argsort(-(total_wins * 1e6 + total_points), axis=1, kind='stable')
+
+    bracket = BRACKETS[playoff_teams]
+    byes = bye_seeds(bracket)
+    champions = play_bracket(bracket, seeds, means, stds, rng)
+
+    share = lambda positions: np.bincount(positions.ravel(), minlength=team_count) / simulations
+
+    return {
+        'Proj Wins':total_wins.mean(axis=0),
+        'Playoffs':share(seeds[:, :playoff_teams]),
+        'Bye':share(seeds[:, :byes]),
+        'Champion':share(champions)
+    }
+
+def odds_week(year: int, week: int) -> int:
+    '''
+    Week the odds are simulated from when week is shown: week itself, or the last regular season week played by then
+    for a playoff or unplayed week. None if no regular season week of the season has been played by week
+    '''
+    cube = standings.standings_cube()
+    if year not in cube.index.get_level_values('Year'):
+        return None
+
+    played = [int(played_week) for played_week in cube.loc[year, 'Week'].unique() if played_week <= week]
+
+    return max(played, default=None)
+
+def season_odds(year: int, week: int, simulations: int, seed: int) -> pd.DataFrame:
+    current = standings.standings(year=year, week=week)
+    teams = current['Team'].astype(str).tolist()
+
+    playoff_teams, regular_weeks, _ = season_format(year)
+    means, stds = score_model(data_index.year_through_week_rows(constants.GAME_DATA, year=year, week=week), teams)
+
+    odds = simulate(
+        wins=current['Wins'].values,
+        points_for=current['Points For'].values,
+        means=means,
+        stds=stds,
+        schedule=remaining_schedule(year, week, regular_weeks, teams),
+        playoff_teams=playoff_teams,
+        simulations=simulations,
+        seed=seed
+    )
+
+    result = pd.DataFrame({'Year':year, 'Week':week, 'Team':teams, 'Record':current['Record'].values, **odds})
+    result['Proj Wins'] = result['Proj Wins'].round(1)
+
+    return result.sort_values(['Playoffs','Bye','Champion','Proj Wins'], ascending=False, kind='stable', ignore_index=True)
+
+def playoff_odds(year: int, week: int, simulations: int = SIMULATIONS, seed: int = SEED) -> pd.DataFrame:
+    '''
+    Playoff, bye and championship probabilities of every team as of a regular season week.
+
+    Cached by (year, week, simulations, seed and data fingerprints), so each week is only simulated once per build.
+
+    Parameters
+    ----------
+    year : int
+        Season to simulate.
+
+    week : int
+        Last week played, the weeks after it are simulated.
+
+    simulations : int, default SIMULATIONS
+        Number of simulated seasons.
+
+    seed : int, default SEED
+        Seed of the random generator.
+
+    Returns
+    -------
+    pd.DataFrame
+        Year, Week, Team, Record, Proj Wins and the Playoffs, Bye and Champion probabilities (0 to 1),
+        in standings-like order: by playoff, bye and championship odds, then projected wins. A copy, safe to modify.
+    '''
+    key = (year, week, simulations, seed, cache.fingerprint(constants.GAME_DATA), cache.fingerprint(constants.MATCHUP_DATA))
+    odds = cache.get('playoff-odds', key, lambda: season_odds(year, week, simulations=simulations, seed=seed))
+
+    return odds.copy()
+
+def odds_table(odds: pd.DataFrame) -> pd.DataFrame:
+    '''
+    playoff_odds() for display: probabilities as percentages, without the Bye column when no team gets a bye
+    '''
+    table = odds[['Team','Record','Proj Wins','Playoffs','Bye','Champion']].copy()
+    for column in ['Playoffs','Bye','Champion']:
+        table[column] = [f'{probability:.1%}' for probability in table[column]]
+
+    if (odds['Bye'] == 0).all():
+        table = table.drop(columns='Bye')
+
+    return table
+
+def odds_dependencies(year: int, week: int) -> list:
+    '''
+    Data read by playoff_odds(), used by the build manifest of the pages showing the odds
+    '''
+    reference = season_format(year)[2]
+    dependencies = [
+        data_index.year_through_week_rows(constants.GAME_DATA, year=year, week=week),
+        data_index.year_rows(constants.MATCHUP_DATA, year=year)
+    ]
+    if reference != year:
+        dependencies.append(data_index.year_rows(constants.MATCHUP_DATA, year=reference))
+
+    return dependencies
@@ -0,0 +1,164 @@
+import io
+import json
+import time
+import pstats
+import cProfile
+import tracemalloc
+from contextlib import contextmanager
+
+from python import constants, functions, document
+
+# Per-stage timing of a build, switched on by start() (auto-creation.py --profile)
+# {stage: {'calls': int, 'seconds': float, 'peak_bytes': int}}
+STAGES = {}
+ENABLED = False
+
+# Peak memory of the running stages, innermost last, see stage()
+PEAKS = []
+
+# Functions timed as stages of their own while profiling: (module or class, attribute, stage name)
+INSTRUMENTED = [
+    (constants, 'read_data', 'load csv'),
+    (functions, 'standings_cube', 'standings cube'),
+    (functions, 'cube_standings', 'standings'),
+    (functions, 'df_to_table', 'df_to_table'),
+    (functions, 'df_to_svg', 'df_to_svg'),
+    (functions, 'write_bytes', 'write file'),
+    (document, 'page_html', 'page html')
+]
+# {(owner, attribute): own attribute before start(), None if it was inherited}
+ORIGINALS = {}
+
+REPORT_PATH = 'build-profile.json'
+
+@contextmanager
+def stage(name: str):
+    '''
+    Times the with block as one call of a stage. Does nothing unless profiling was started.
+
+    Stages can be nested, e.g. 'df_to_table' inside 'page: week_page'. Each stage's time and peak traced memory
+    include those of the stages inside it.
+    '''
+    if not ENABLED:
+        yield
+        return
+
+    # The peak is reset for every stage, so the running stages keep the highest peak seen so far
+    if PEAKS:
+        PEAKS[-1] = max(PEAKS[-1], tracemalloc.get_traced_memory()[1])
+    tracemalloc.reset_peak()
+    PEAKS.append(0)
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        seconds = time.perf_counter() - start
+        peak = max(PEAKS.pop(), tracemalloc.get_traced_memory()[1])
+        if PEAKS:
+            PEAKS[-1] = max(PEAKS[-1], peak)
+        tracemalloc.reset_peak()
+
+        record = STAGES.setdefault(name, {'calls':0, 'seconds':0.0, 'peak_bytes':0})
+        record['calls'] += 1
+        record['seconds'] += seconds
+        record['peak_bytes'] = max(record['peak_bytes'], peak)
+
+def timed(name: str, func):
+    def wrapper(*args, **kwargs):
+        with stage(name):
+            return func(*args, **kwargs)
+
+    wrapper.__wrapped__ = func
+
+    return wrapper
+
+def start() -> None:
+    '''
+    Starts recording stages and traced memory, and wraps the INSTRUMENTED functions as stages
+    '''
+    global ENABLED
+
+    STAGES.clear()
+    ENABLED = True
+    tracemalloc.start()
+
+    for owner, attribute, name in INSTRUMENTED:
+        if (owner, attribute) not in ORIGINALS:
+            ORIGINALS[(owner, attribute)] = vars(owner).get(attribute)
+            setattr(owner, attribute, timed(name, getattr(owner, attribute)))
+
+def stop() -> dict:
+    '''
+    Stops recording, restores the INSTRUMENTED functions and returns the report, see report()
+    '''
+    global ENABLED
+
+    for (owner, attribute), original in ORIGINALS.items():
+        if original is None:
+            delattr(owner, attribute)
+        else:
+            setattr(owner, attribute, original)
+    ORIGINALS.clear()
+
+    tracemalloc.stop()
+    ENABLED = False
+
+    return report()
+
+def report() -> dict:
+    '''
+    Recorded stages as {'stages': {stage: {'calls', 'seconds', 'mean_ms', 'peak_mib'}}}, slowest first
+    '''
+    stages = sorted(STAGES.items(), key=lambda item: item[1]['seconds'], reverse=True)
+
+    return {
+        'stages':{
+            name:{
+                'calls':record['calls'],
+                'seconds':round(record['seconds'], 4),
+                'mean_ms':round(record['seconds'] / record['calls'] * 1000, 3),
+                'peak_mib':round(record['peak_bytes'] / 2**20, 2)
+            }
+            for name, record in stages
+        }
+    }
+
+def write_report(result: dict, path: str = REPORT_PATH) -> None:
+    functions.write_file(path, json.dumps(result, indent=2) + '\n')
+
+def summary(result: dict) -> str:
+    '''
+    Human readable table of a report()
+    '''
+    lines = [f"{'stage':<28}{'calls':>8}{'total s':>10}{'mean ms':>10}{'peak MiB':>10}"]
+    for name, record in result['stages'].items():
+        lines.append(f"{name:<28}{record['calls']:>8}{record['seconds']:>10.3f}{record['mean_ms']:>10.2f}{record['peak_mib']:>10.2f}")
+
+    return '\n'.join(lines)
+
+def profile_call(func, *args, top: int = 30, **kwargs) -> str:
+    '''
+    Runs func(*args, **kwargs) once under cProfile and tracemalloc.
+
+    Returns the top functions by cumulative time and the top lines by allocated memory, as text
+    '''
+    profiler = cProfile.Profile()
+    tracemalloc.start()
+
+    profiler.enable()
+    func(*args, **kwargs)
+    profiler.disable()
+
+    snapshot = tracemalloc.take_snapshot()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    output = io.StringIO()
+    pstats.Stats(profiler, stream=output).sort_stats('cumulative').print_stats(top)
+
+    output.write(f'\nPeak traced memory: {peak / 2**20:.2f} MiB\nTop allocations:\n')
+    for statistic in snapshot.statistics('lineno')[:top]:
+        output.write(f'  {statistic}\n')
+
+    return output.getvalue()
@@ -0,0 +1,195 @@
+import os
+import json
+import hashlib
+
+from python import functions
+
+# Raw ESPN data store, one JSON file per season and per week:
+#
+#     database/espn-data-{version}/
+#         index.json              {year: {'season': hash, 'weeks': {week: hash}}}
+#         {year}/season.json      teams, draft picks and pro players
+#         {year}/week-{week}.json matchups and lineups
+#
+# Payloads are plain dicts built from the espn_api objects by season_payload() and week_payload(),
+# so they can be read without espn_api and updated one week at a time.
+
+def store_path(version: int, *parts) -> str:
+    return os.path.join('database', f'espn-data-{version}', *[str(part) for part in parts])
+
+def payload_hash(payload: dict) -> str:
+    return hashlib.sha256(dump(payload).encode()).hexdigest()[:16]
+
+def dump(payload: dict) -> str:
+    return json.dumps(payload, separators=(',',':'), sort_keys=True)
+
+# Convert espn_api objects into plain payloads
+def season_payload(year: int, league, players: list[dict]) -> dict:
+    '''
+    Teams, draft picks and pro players of a season, from an espn_api League and its get_pro_players() result
+    '''
+    return {
+        'year':year,
+        'teams':[{'owner':team.owners[0]['firstName']} for team in league.teams],
+        'draft':[
+            {
+                'owner':pick.team.owners[0]['firstName'],
+                'player_id':pick.playerId,
+                'round':pick.round_num,
+                'pick':pick.round_pick
+            }
+            for pick in league.draft
+        ],
+        'players':[
+            {
+                'id':player['id'],
+                'full_name':player['fullName'],
+                'default_position_id':player['defaultPositionId']
+            }
+            for player in players
+        ]
+    }
+
+def week_payload(year: int, week: int, box_scores: list) -> dict:
+    '''
+    Matchups and lineups of a week, from espn_api box scores (or scoreboard matchups, which have no lineups)
+    '''
+    lineup = lambda players: [
+        {
+            'player_id':player.playerId,
+            'points':player.points,
+            'projected_points':player.projected_points,
+            'slot_position':player.slot_position,
+            'active_status':player.active_status,
+            'on_bye_week':player.on_bye_week
+        }
+        for player in players
+    ]
+
+    matchups = []
+    for matchup in box_scores:
+        matchups.append(
+            {
+                'matchup_type':matchup.matchup_type,
+                'is_playoff':matchup.is_playoff,
+                'home_owner':matchup.home_team.owners[0]['firstName'],
+                'home_score':matchup.home_score,
+                # ESPN gives a bye week an away team of 0
+                'away_owner':None if matchup.away_team == 0 else matchup.away_team.owners[0]['firstName'],
+                'away_score':matchup.away_score,
+                'home_lineup':lineup(getattr(matchup, 'home_lineup', [])),
+                'away_lineup':lineup(getattr(matchup, 'away_lineup', []))
+            }
+        )
+
+    return {'year':year, 'week':week, 'matchups':matchups}
+
+# Read and write the store
+def read_index(version: int) -> dict:
+    path = store_path(version, 'index.json')
+    if not os.path.exists(path):
+        return {}
+
+    with open(path) as file:
+        return json.load(file)
+
+def write_index(version: int, index: dict) -> None:
+    functions.write_file(store_path(version, 'index.json'), json.dumps(index, indent=2, sort_keys=True) + '\n')
+
+def write_payload(version: int, year: int, name: str, payload: dict, index: dict = None) -> bool:
+    '''
+    Writes a season ('season') or week ('week-{week}') payload and records its hash in the index.
+
+    Returns False without writing if the stored payload has the same hash.
+
+    Parameters
+    ----------
+    index : dict, default None
+        Index from read_index() to record the hash in. The caller writes it with write_index() once all its
+        payloads are written, see store_season(). If set to None, the index is read and written for this payload alone.
+    '''
+    if index is None:
+        index = read_index(version)
+        if not write_payload(version, year, name, payload, index=index):
+            return False
+        write_index(version, index)
+        return True
+
+    season = index.setdefault(str(year), {'season':None, 'weeks':{}})
+
+    new_hash = payload_hash(payload)
+    if name == 'season':
+        old_hash = season['season']
+        season['season'] = new_hash
+    else:
+        week = name.removeprefix('week-')
+        old_hash = season['weeks'].get(week)
+        season['weeks'][week] = new_hash
+
+    if old_hash == new_hash and os.path.exists(store_path(version, year, f'{name}.json')):
+        return False
+
+    functions.write_file(store_path(version, year, f'{name}.json'), dump(payload))
+
+    return True
+
+def write_season(version: int, year: int, payload: dict, index: dict = None) -> bool:
+    return write_payload(version, year, 'season', payload, index=index)
+
+def write_week(version: int, year: int, week: int, payload: dict, index: dict = None) -> bool:
+    return write_payload(version, year, f'week-{week}', payload, index=index)
+
+def read_season(version: int, year: int) -> dict:
+    with open(store_path(version, year, 'season.json')) as file:
+        return json.load(file)
+
+def read_week(version: int, year: int, week: int) -> dict:
+    with open(store_path(version, year, f'week-{week}.json')) as file:
+        return json.load(file)
+
+def years(version: int) -> list[int]:
+    return sorted(int(year) for year in read_index(version))
+
+def weeks(version: int, year: int) -> list[int]:
+    return sorted(int(week) for week in read_index(version).get(str(year), {'weeks':{}})['weeks'])
+
+def iter_seasons(version: int, years_filter: list[int] = None):
+    '''
+    Yields (year, season payload, {week: week payload}) one season at a time, so only one season is held in memory.
+
+    Parameters
+    ----------
+    version : int
+        Store version.
+
+    years_filter : list[int], default None
+        Only yield these seasons. If set to None, every stored season is yielded.
+    '''
+    for year in years(version):
+        if years_filter is not None and year not in years_filter:
+            continue
+
+        weekly = {week:read_week(version, year, week) for week in weeks(version, year)}
+        yield year, read_season(version, year), weekly
+
+def store_season(version: int, year: int, season_data: dict) -> list[str]:
+    '''
+    Converts one season fetched by fetcher.fetch_seasons() into payloads and writes the ones which changed.
+    The index is written once, after the payloads.
+
+    Returns the names of the written files, e.g. ['season', 'week-5'].
+    '''
+    index = read_index(version)
+    written = []
+
+    if write_season(version, year, season_payload(year, season_data['League'], season_data['Players']), index=index):
+        written.append('season')
+
+    for week, box_scores in season_data['Box Scores'].items():
+        if write_week(version, year, week, week_payload(year, week, box_scores), index=index):
+            written.append(f'week-{week}')
+
+    if written:
+        write_index(version, index)
+
+    return written
@@ -0,0 +1,46 @@
+import pandas as pd
+
+from python import functions, constants, cache
+
+def standings_cube() -> pd.DataFrame:
+    '''
+    Returns the standings cube for constants.GAME_DATA, building it once per version of the data.
+
+    See functions.standings_cube() for the layout.
+    '''
+    data = constants.GAME_DATA
+
+    return cache.get('standings-cube', cache.fingerprint(data), lambda: functions.standings_cube(data))
+
+def standings(year: int, week: int = None) -> pd.DataFrame:
+    '''
+    Standings for a given year as of a given week, read from the standings cube.
+
+    Same output as functions.summary_table(constants.GAME_DATA, year, week).
+    Summaries are cached by (year, week, data fingerprint), so each one is only computed once per build.
+
+    Parameters
+    ----------
+    year : int
+        Season to pull standings from.
+
+    week : int, default None
+        Week of the season. If set to None, returns the final regular season standings.
+
+    Returns
+    -------
+    pd.DataFrame
+        A copy of the cached summary, safe to modify.
+    '''
+    key = (year, week, cache.fingerprint(constants.GAME_DATA))
+    summary = cache.get('summary', key, lambda: functions.cube_standings(standings_cube(), year=year, week=week))
+
+    return summary.copy()
+
+def invalidate() -> None:
+    '''
+    Drops the cached standings. Must be called after constants.GAME_DATA is modified in place.
+    '''
+    cache.invalidate('standings-cube')
+    cache.invalidate('summary')
+    cache.FINGERPRINTS.pop(id(constants.GAME_DATA), None)
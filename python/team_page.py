@@ -1,14 +1,13 @@
 from dominate.tags import *
 import pandas as pd
-from matplotlib import pyplot as plt
 
-from python import functions, constants, document, page_header
+from python import functions, constants, document, standings, data_index, all_play
 
 def team_content(team: str) -> div:
     container = div(_class='content')
     container.add(h1(f'{team} Data'))
 
-    seasons = [functions.summary_table(constants.GAME_DATA, year=year) for year in constants.YEARS]
+    seasons = [standings.standings(year=year) for year in constants.YEARS]
     seasons_df = pd.concat(seasons)
     seasons_df = seasons_df.loc[seasons_df['Team'] == team]
     seasons_table = functions.df_to_table(
@@ -35,7 +34,19 @@ def team_content(team: str) -> div:
         content=line_chart_svg
     )
     
-    draft_data = constants.DRAFT_DATA.loc[constants.DRAFT_DATA['Team'] == team].copy()
+    all_play_df = pd.concat([all_play.all_play(year=year).assign(Year=year) for year in constants.YEARS])
+    all_play_df = all_play_df.loc[all_play_df['Team'] == team]
+    all_play_table = functions.df_to_table(
+        data=all_play_df,
+        custom_columns=['Year','Record','All-Play Record','All-Play %','Expected Wins','Wins vs Expected'],
+        table_id='team-all-play-table'
+    )
+    all_play_div = functions.content_container(
+        title='All-Play by Season',
+        content=all_play_table
+    )
+
+    draft_data = data_index.team_rows(constants.DRAFT_DATA, team=team).copy()
     draft_table = functions.df_to_table(
         data=draft_data,
         row_id_columns=['Year','Round','Pick'],
@@ -50,17 +61,22 @@ def team_content(team: str) -> div:
 
     container.add(summary_div)
     container.add(line_chart_div)
+    container.add(all_play_div)
     container.add(draft_div)
 
     return container
 
-def team_pages():
-    for team in constants.TEAMS:
-        doc = document.document()
-        doc.add(page_header.page_header(active_year='team'))
+def team_dependencies(team: str) -> list:
+    '''
+    Data read by team_content(), used by the build manifest to decide whether the page has to be rebuilt
+    '''
+    all_play_data = [data for year in constants.YEARS for data in all_play.all_play_dependencies(year=year)]
+
+    return [constants.GAME_DATA, data_index.team_rows(constants.DRAFT_DATA, team=team)] + all_play_data
 
-        doc.add(team_content(team=team))
-        doc.add(script(src=f'{constants.ROOT}script.js'))
+def team_html(team: str) -> str:
+    return document.page_html(team_content(team=team), active_year='team')
 
-        with open(f'teams/{team}.html','w') as file:
-            file.write(doc.render())
\ No newline at end of file
+def team_pages():
+    for team in constants.TEAMS:
+        functions.write_file(f'teams/{team}.html', team_html(team=team))
\ No newline at end of file
@@ -1,7 +1,7 @@
 from dominate.tags import *
 import numpy as np
 
-from python import functions, constants, document, page_header
+from python import functions, constants, document, standings, data_index, playoff_odds
 
 def week_content(year: int, week: int) -> div:
     '''
@@ -13,6 +13,8 @@ def week_content(year: int, week: int) -> div:
         Simply shows each of the matchups in the week
     * Updated Standings
         Table which shows the standings as of that week
+    * Playoff Odds
+        Simulated playoff, bye and championship chances as of that week
 
     Parameters
     ----------
@@ -30,7 +32,7 @@ def week_content(year: int, week: int) -> div:
     title = h1(f'{year} Week {week}')
 
     # Create scoreboard table of the matchups that week
-    scoreboard = constants.MATCHUP_DATA.loc[(constants.MATCHUP_DATA['Year'] == year) & (constants.MATCHUP_DATA['Week'] == week), ['Home Team','Home Score','Away Score','Away Team']].copy()    
+    scoreboard = data_index.year_week_rows(constants.MATCHUP_DATA, year=year, week=week)[['Home Team','Home Score','Away Score','Away Team']].copy()
     scoreboard_div = functions.content_container(
         title='Weekly Scoreboard',
         content=functions.df_to_table(
@@ -39,7 +41,7 @@ def week_content(year: int, week: int) -> div:
         )
     )
 
-    lineup_data = constants.PLAYER_MATCHUP_DATA.loc[(constants.PLAYER_MATCHUP_DATA['Year'] == year) & (constants.PLAYER_MATCHUP_DATA['Week'] == week)].copy()
+    lineup_data = data_index.year_week_rows(constants.PLAYER_MATCHUP_DATA, year=year, week=week).copy()
     lineup_data['Matchup Lookup'] = lineup_data['Home Team'].astype(str) + ' vs ' + lineup_data['Away Team'].astype(str)
     lineup_table = functions.df_to_table(
         data=lineup_data,
@@ -56,7 +58,7 @@ def week_content(year: int, week: int) -> div:
 
     # Create the weekly recap stats section
     # This temp df needs to look at only the current week
-    temp = constants.GAME_DATA.loc[(constants.GAME_DATA['Year'] == year) & (constants.GAME_DATA['Week'] == week)].copy()
+    temp = data_index.year_week_rows(constants.GAME_DATA, year=year, week=week).copy()
 
 
     highest_scorer = temp.sort_values('Score', ascending=False, ignore_index=True).loc[0,['Team','Score']].values
@@ -74,9 +76,9 @@ def week_content(year: int, week: int) -> div:
     stats_div.add([stats_title, stats_list])
 
     # Create the live standings table
-    standings = functions.summary_table(constants.GAME_DATA, year = year, week = week)
+    week_standings = standings.standings(year=year, week=week)
     standings_table = functions.df_to_table(
-        data=standings,
+        data=week_standings,
         custom_columns=['Team','Record','Ranking','Points For','Points Against','Luck Score'],
         table_id='standings-table'
     )
@@ -85,15 +87,38 @@ def week_content(year: int, week: int) -> div:
         content=standings_table,
     )
 
+    # Chances of every team as of this week, from simulating the rest of the season
+    odds_div = functions.content_container(
+        title='Playoff Odds',
+        content=functions.df_to_table(
+            data=playoff_odds.odds_table(playoff_odds.playoff_odds(year=year, week=week)),
+            table_id='playoff-odds-table'
+        )
+    )
+
     container.add(title)
     container.add(scoreboard_div)
     if year > 2018:
         container.add(lineup_div)
     container.add(stats_div)
     container.add(standings_div)
+    container.add(odds_div)
 
     return container
 
+def week_dependencies(year: int, week: int) -> list:
+    '''
+    Data read by week_content(), used by the build manifest to decide whether the page has to be rebuilt
+    '''
+    return [
+        data_index.year_through_week_rows(constants.GAME_DATA, year=year, week=week),
+        data_index.year_week_rows(constants.MATCHUP_DATA, year=year, week=week),
+        data_index.year_week_rows(constants.PLAYER_MATCHUP_DATA, year=year, week=week)
+    ] + playoff_odds.odds_dependencies(year=year, week=week)
+
+def week_html(year: int, week: int) -> str:
+    return document.page_html(week_content(year=year, week=week), active_year=year)
+
 def week_pages():
     # years = np.arange(2019, 2025)
 
@@ -104,11 +129,4 @@ def week_pages():
         #     weeks = np.arange(1,15)
 
         for week in range(1, weeks+1):
-            doc = document.document()
-            doc.add(page_header.page_header(active_year=year))
-
-            doc.add(week_content(year=year, week=week))
-            doc.add(script(src=f'{constants.ROOT}script.js'))
-
-            with open(f'seasons/{year}/week-{week}.html','w') as file:
-                file.write(doc.render())
\ No newline at end of file
+            functions.write_file(f'seasons/{year}/week-{week}.html', week_html(year=year, week=week))
\ No newline at end of file
@@ -0,0 +1,104 @@
+import queue
+import threading
+
+from python import functions
+
+# Writes the generated pages from a background thread while the next pages render, see build.build()
+#
+#     writer.start()
+#     writer.submit('index.html', html)
+#     result = writer.stop()
+#
+# Files are written atomically and only when their content changed, see functions.write_bytes()
+
+QUEUE = queue.Queue()
+THREAD = None
+
+# Files handled by the writer since start(), see stop()
+STATS = {'written':[], 'identical':[], 'bytes written':0}
+ERRORS = []
+
+# Largest number of files written per wake up of the background thread
+BATCH_SIZE = 32
+
+def write(path: str, text: str) -> None:
+    content = text.encode()
+    if functions.write_bytes(path, content):
+        STATS['written'].append(path)
+        STATS['bytes written'] += len(content)
+    else:
+        STATS['identical'].append(path)
+
+def run() -> None:
+    '''
+    Background thread: writes queued files in batches until the None sent by stop() is reached
+    '''
+    while True:
+        batch = [QUEUE.get()]
+        while len(batch) < BATCH_SIZE and batch[-1] is not None:
+            try:
+                batch.append(QUEUE.get_nowait())
+            except queue.Empty:
+                break
+
+        for item in batch:
+            if item is None:
+                return
+
+            # Keep going after a failed write, the error is raised by stop()
+            try:
+                write(*item)
+            except Exception as error:
+                ERRORS.append(error)
+
+def start(background: bool = True) -> None:
+    '''
+    Starts a new writer. With background False files are written by submit() itself, e.g. while profiling
+    '''
+    global THREAD
+
+    if THREAD is not None:
+        raise RuntimeError('writer is already running')
+
+    STATS.update({'written':[], 'identical':[], 'bytes written':0})
+    ERRORS.clear()
+
+    if background:
+        THREAD = threading.Thread(target=run, name='page-writer', daemon=True)
+        THREAD.start()
+
+def submit(path: str, text: str) -> None:
+    '''
+    Queues text to be written to path
+    '''
+    if THREAD is None:
+        write(path, text)
+    else:
+        QUEUE.put((path, text))
+
+def stop() -> dict:
+    '''
+    Waits for every queued file to be written and stops the writer.
+
+    Returns
+    -------
+    dict
+        {'written': paths written, 'identical': paths left alone because they already held the content,
+        'bytes written': total size of the written files}
+
+    Raises
+    ------
+    Exception
+        The first error raised while writing, after the other files have been written.
+    '''
+    global THREAD
+
+    if THREAD is not None:
+        QUEUE.put(None)
+        THREAD.join()
+        THREAD = None
+
+    if ERRORS:
+        raise ERRORS[0]
+
+    return {'written':list(STATS['written']), 'identical':list(STATS['identical']), 'bytes written':STATS['bytes written']}
@@ -1,14 +1,13 @@
 import dominate
 from dominate.tags import *
-from matplotlib import pyplot as plt
 
-from python import functions, constants, document, page_header
+from python import functions, constants, document, standings, data_index, all_play
 
 def year_content(year: int) -> div:
     container = div(_class='content')
     container.add(h1(f'{year} Data'))
 
-    data = functions.summary_table(constants.GAME_DATA, year = year)
+    data = standings.standings(year=year)
 
     scatter_svg = functions.df_to_svg(
         data=data,
@@ -32,6 +31,24 @@ def year_content(year: int) -> div:
         content=summary_table
     )
 
+    all_play_table = functions.df_to_table(
+        data=all_play.all_play(year=year),
+        table_id='all-play-table'
+    )
+    all_play_div = functions.content_container(
+        title='All-Play Record',
+        content=all_play_table
+    )
+
+    schedule_table = functions.df_to_table(
+        data=all_play.schedule_matrix(year=year),
+        table_id='schedule-swap-table'
+    )
+    schedule_div = functions.content_container(
+        title='Record With Every Schedule',
+        content=schedule_table
+    )
+
     # playoff_matchups = constants.MATCHUP_DATA.loc[(constants.MATCHUP_DATA['Year'] == year) & (constants.MATCHUP_DATA['Playoff Flag'])].copy()
     # playoff_matchups['Playoff Round'] = (playoff_matchups['Week'] % playoff_matchups['Week'].min()) + 1
 
@@ -66,7 +83,7 @@ def year_content(year: int) -> div:
         bracket = functions.playoff_bracket_svg(constants.MATCHUP_DATA, year=year)
         bracket_div = functions.content_container(title='Playoff Bracket', content=bracket)
 
-    draft_data = constants.DRAFT_DATA.loc[constants.DRAFT_DATA['Year'] == year].copy()
+    draft_data = data_index.year_rows(constants.DRAFT_DATA, year=year).copy()
     draft_table = functions.df_to_table(
         data=draft_data,
         row_id_columns=['Team','Round','Pick'],
@@ -82,6 +99,8 @@ def year_content(year: int) -> div:
 
     container.add(summary_div)
     container.add(scatter_div)
+    container.add(all_play_div)
+    container.add(schedule_div)
     if year < 2025:
         container.add(bracket_div)
     container.add(draft_div)
@@ -89,13 +108,16 @@ def year_content(year: int) -> div:
     return container
 
 
-def year_pages():
-    for year in constants.YEARS:
-        doc = document.document()
-        doc.add(page_header.page_header(active_year=year))
+def year_dependencies(year: int) -> list:
+    '''
+    Data read by year_content(), used by the build manifest to decide whether the page has to be rebuilt
+    '''
+    # The all-play slices are the season's games and matchups, which also cover the standings and bracket
+    return all_play.all_play_dependencies(year=year) + [data_index.year_rows(constants.DRAFT_DATA, year=year)]
 
-        doc.add(year_content(year))
-        doc.add(script(src=f'{constants.ROOT}script.js'))
+def year_html(year: int) -> str:
+    return document.page_html(year_content(year), active_year=year)
 
-        with open(f'seasons/{year}/index.html','w') as file:
-            file.write(doc.render())
\ No newline at end of file
+def year_pages():
+    for year in constants.YEARS:
+        functions.write_file(f'seasons/{year}/index.html', year_html(year=year))
\ No newline at end of file
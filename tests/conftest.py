@@ -0,0 +1,8 @@
+import os
+import sys
+
+# The data tables are read from paths relative to the repository root, see constants.DATA_FILES
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
@@ -0,0 +1,99 @@
+import threading
+import time
+
+# Offline stand-in for the ESPN API, used by the fetcher tests: StubESPN.league() replaces the espn_api League
+# constructor and StubESPN.fetch_week() replaces espn_data.fetch_week()
+
+class StubRequest:
+    '''
+    Stand-in for League.espn_request
+    '''
+    def __init__(self, espn: 'StubESPN', year: int):
+        self.espn = espn
+        self.year = year
+
+    def get_pro_players(self) -> list[dict]:
+        self.espn.request(('players', self.year))
+        return [{'id':player, 'fullName':f'Player {player}'} for player in range(3)]
+
+class StubLeague:
+    '''
+    Stand-in for espn_api.football.League, with the attributes read by fetcher.fetch_seasons()
+    '''
+    def __init__(self, espn: 'StubESPN', year: int, current_week: int):
+        self.year = year
+        self.current_week = current_week
+        self.espn_request = StubRequest(espn, year)
+
+class StubESPN:
+    '''
+    Records every request with the time it was made and the number of requests in flight.
+
+    Parameters
+    ----------
+    current_week : int, default 15
+        current_week of every league.
+
+    clock : callable, default time.monotonic
+        Clock the request times are read from.
+
+    delay : float, default 0
+        Seconds every request takes, in real time.
+
+    failures : dict, default None
+        {request: [exceptions]}, raised in order by the first calls of that request, e.g.
+        {('week', 2024, 3): [ConnectionError()]}. Requests are ('league', year), ('players', year) and ('week', year, week).
+    '''
+    def __init__(self, current_week: int = 15, clock=time.monotonic, delay: float = 0, failures: dict = None):
+        self.current_week = current_week
+        self.clock = clock
+        self.delay = delay
+        self.failures = {request:list(errors) for request, errors in (failures or {}).items()}
+
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def request(self, request: tuple) -> None:
+        with self.lock:
+            self.requests.append((request, self.clock()))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            errors = self.failures.get(request)
+            error = errors.pop(0) if errors else None
+
+        try:
+            if self.delay:
+                time.sleep(self.delay)
+            if error is not None:
+                raise error
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+    def league(self, year: int) -> StubLeague:
+        self.request(('league', year))
+        return StubLeague(self, year, current_week=self.current_week)
+
+    def fetch_week(self, league: StubLeague, year: int, week: int) -> list[str]:
+        self.request(('week', year, week))
+        return [f'box score {year}-{week}']
+
+class FakeClock:
+    '''
+    Clock which only moves when sleep() is called, shared by every thread
+    '''
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+        self.lock = threading.Lock()
+
+    def __call__(self) -> float:
+        with self.lock:
+            return self.now
+
+    def sleep(self, seconds: float) -> None:
+        with self.lock:
+            self.now += seconds
+            self.sleeps.append(seconds)
@@ -0,0 +1,91 @@
+import os
+import sys
+import shutil
+import inspect
+import multiprocessing
+
+import pytest
+
+from python import build, cache, constants
+
+# Files the pages link to, see benchmarks.suite.SITE_FILES
+SITE_FILES = ['style.css', 'script.js', 'Assets/Fantasy-Football-App-LOGO.png']
+
+@pytest.fixture
+def site(tmp_path):
+    '''
+    Empty output directory with the site's static files, the data tables loaded from the repository
+    '''
+    for name in constants.DATA_FILES:
+        constants.load(name)
+    for path in SITE_FILES:
+        os.makedirs(tmp_path / os.path.dirname(path), exist_ok=True)
+        shutil.copyfile(path, tmp_path / path)
+
+    cwd = os.getcwd()
+    os.chdir(tmp_path)
+    cache.invalidate()
+    try:
+        yield tmp_path
+    finally:
+        os.chdir(cwd)
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_build_computes_each_summary_once(site, jobs):
+    result = build.build(jobs=jobs, json_api=False, compress=False)
+
+    season_weeks = sum(weeks + 1 for _, weeks in constants.YEARS_WEEKS)
+    assert result['cache']['standings-cube']['misses'] == 1
+    assert result['cache']['summary']['misses'] == season_weeks
+    assert result['cache']['summary']['hits'] > 0
+    assert 'Cache: ' in build.report(result)
+
+def test_build_forks_workers_before_writer_thread(site, monkeypatch):
+    start = build.writer.start
+    children = []
+
+    def checked_start(*args, **kwargs):
+        children.append(len(multiprocessing.active_children()))
+        return start(*args, **kwargs)
+
+    monkeypatch.setattr(build.writer, 'start', checked_start)
+    build.build(jobs=2, json_api=False, compress=False)
+
+    assert children == [2]
+
+def test_page_hashes_follow_season_matchups(site, monkeypatch):
+    tasks = {path:task for path, *task in build.page_tasks(week=1)}
+    year = constants.YEARS[0]
+    paths = [f'seasons/{year}/index.html', f'seasons/{constants.YEARS[-1]}/index.html', f'teams/{constants.TEAMS[0]}.html']
+    before = {path:build.task_hash((path, *tasks[path]), shared='') for path in paths}
+
+    matchups = constants.MATCHUP_DATA.copy()
+    matchups.loc[matchups['Year'] == year, 'Home Score'] += 1
+    monkeypatch.setattr(constants, 'MATCHUP_DATA', matchups)
+    after = {path:build.task_hash((path, *tasks[path]), shared='') for path in paths}
+
+    assert [before[path] != after[path] for path in paths] == [True, False, True]
+
+def test_shared_modules_cover_page_imports():
+    pages = {sys.modules[render.__module__] for _, render, _, _ in build.page_tasks(week=1)}
+    imported = {
+        value for page in pages for value in vars(page).values()
+        if inspect.ismodule(value) and value.__name__.startswith('python.')
+    }
+
+    assert imported - pages <= set(build.SHARED_MODULES)
+
+def test_build_raises_render_error_over_write_error(site, monkeypatch):
+    def failing_render(tasks, pool=None, jobs=1):
+        yield tasks[0][0], '<html></html>'
+        raise RuntimeError('render failed')
+
+    def failing_write(path, text):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(build, 'render_tasks', failing_render)
+    monkeypatch.setattr(build.writer, 'write', failing_write)
+
+    with pytest.warns(UserWarning, match='disk full'), pytest.raises(RuntimeError, match='render failed'):
+        build.build(json_api=False, compress=False)
+    assert build.writer.THREAD is None
@@ -0,0 +1,48 @@
+import os
+
+import pandas as pd
+import pytest
+
+from python import constants
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(constants, 'DATA_CACHE_DIR', str(tmp_path))
+    return tmp_path
+
+def test_read_data_uses_cache(cache_dir):
+    constants.write_data_cache()
+    cached = pd.read_pickle(constants.data_cache_path('GAME_DATA'))
+
+    pd.testing.assert_frame_equal(constants.read_data('GAME_DATA'), cached)
+
+@pytest.mark.parametrize('corruption', ['garbage', 'empty', 'truncated'])
+def test_read_data_rewrites_corrupt_cache(cache_dir, corruption):
+    constants.write_data_cache()
+    path = constants.data_cache_path('GAME_DATA')
+    with open(path, 'rb') as file:
+        content = {'garbage':b'not a pickle', 'empty':b'', 'truncated':file.read()[:1000]}[corruption]
+    with open(path, 'wb') as file:
+        file.write(content)
+
+    with pytest.warns(UserWarning, match='rewriting it'):
+        data = constants.read_data('GAME_DATA')
+
+    expected = pd.read_csv(constants.DATA_FILES['GAME_DATA'], dtype=constants.DATA_TYPES['GAME_DATA'])
+    pd.testing.assert_frame_equal(data, expected)
+    pd.testing.assert_frame_equal(pd.read_pickle(path), expected)
+    assert [name for name in os.listdir(cache_dir) if name.endswith('.tmp')] == []
+
+def test_read_data_rewrites_cache_without_dataframe(cache_dir):
+    pd.to_pickle({'not':'a table'}, constants.data_cache_path('TEAM_DATA'))
+
+    with pytest.warns(UserWarning, match='does not hold a DataFrame'):
+        data = constants.read_data('TEAM_DATA')
+
+    pd.testing.assert_frame_equal(pd.read_pickle(constants.data_cache_path('TEAM_DATA')), data)
+
+def test_derived_values_are_plain_python():
+    assert all(type(team) is str for team in constants.TEAMS)
+    assert all(type(year) is int for year in constants.YEARS)
+    assert all(type(year) is int and type(weeks) is int for year, weeks in constants.YEARS_WEEKS)
+    assert constants.GAME_DATA['Year'].dtype == 'int16'
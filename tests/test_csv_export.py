@@ -0,0 +1,69 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('espn_api')
+
+from python import espn_data, database, functions
+
+@pytest.fixture
+def database_path(tmp_path):
+    path = str(tmp_path / 'league.db')
+    conn = sqlite3.connect(path)
+    conn.execute('CREATE TABLE games (year INTEGER, team TEXT, score REAL)')
+    conn.executemany('INSERT INTO games VALUES (?, ?, ?)', [(2024, f'Team {i}', i * 1.5) for i in range(25)])
+    conn.execute('CREATE VIEW game_view AS SELECT year AS "Year", team AS "Team", score AS "Score" FROM games')
+    conn.commit()
+    conn.close()
+
+    return path
+
+@pytest.fixture
+def connections(monkeypatch):
+    '''
+    Every connection opened by database.connect(), to check that they are closed
+    '''
+    opened = []
+    connect = database.connect
+
+    def tracked(*args, **kwargs):
+        opened.append(connect(*args, **kwargs))
+        return opened[-1]
+
+    monkeypatch.setattr(database, 'connect', tracked)
+
+    return opened
+
+def is_closed(conn: sqlite3.Connection) -> bool:
+    try:
+        conn.execute('SELECT 1')
+    except sqlite3.ProgrammingError:
+        return True
+
+    return False
+
+def test_write_csv_streams_view(tmp_path, database_path, connections, monkeypatch):
+    monkeypatch.setattr(espn_data, 'FETCH_SIZE', 10)
+    csv_path = str(tmp_path / 'games.csv')
+
+    assert espn_data.write_csv('game_view', csv_path, path=database_path) == 25
+    assert pd.read_csv(csv_path)['Score'].tolist() == [i * 1.5 for i in range(25)]
+    assert len(connections) == 1 and is_closed(connections[0])
+
+def test_write_csv_closes_connection_on_error(tmp_path, database_path, connections, monkeypatch):
+    def failing_open_atomic(*args, **kwargs):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(functions, 'open_atomic', failing_open_atomic)
+
+    with pytest.raises(OSError):
+        espn_data.write_csv('game_view', str(tmp_path / 'games.csv'), path=database_path)
+
+    assert len(connections) == 1 and is_closed(connections[0])
+
+def test_write_csv_closes_connection_on_missing_view(tmp_path, database_path, connections):
+    with pytest.raises(sqlite3.OperationalError):
+        espn_data.write_csv('missing_view', str(tmp_path / 'games.csv'), path=database_path)
+
+    assert len(connections) == 1 and is_closed(connections[0])
@@ -0,0 +1,104 @@
+import pytest
+
+from python import fetcher
+from stub_league import StubESPN, FakeClock
+
+def expected_data(season_lengths: dict) -> dict:
+    return {
+        year:{week:[f'box score {year}-{week}'] for week in range(1, weeks + 1)}
+        for year, weeks in season_lengths.items()
+    }
+
+def box_scores(data: dict) -> dict:
+    return {year:season['Box Scores'] for year, season in data.items()}
+
+def test_fetch_seasons_returns_every_season():
+    espn = StubESPN(current_week=6)
+    data = fetcher.fetch_seasons({2023:4, 2024:None}, league_factory=espn.league, fetch_week=espn.fetch_week, rate=1000, burst=100)
+
+    assert box_scores(data) == expected_data({2023:4, 2024:5})
+    assert [season['League'].year for season in data.values()] == [2023, 2024]
+    assert all(len(season['Players']) == 3 for season in data.values())
+
+def test_fetch_seasons_runs_requests_concurrently():
+    espn = StubESPN(delay=0.02)
+    fetcher.fetch_seasons({2023:8, 2024:8}, league_factory=espn.league, fetch_week=espn.fetch_week, rate=1000, burst=100, max_workers=4)
+
+    assert espn.max_in_flight == 4
+
+def test_fetch_seasons_stays_within_rate():
+    clock = FakeClock()
+    espn = StubESPN(clock=clock)
+    rate, burst = 2.0, 3
+
+    fetcher.fetch_seasons(
+        {2022:5, 2023:5, 2024:5},
+        league_factory=espn.league,
+        fetch_week=espn.fetch_week,
+        rate=rate,
+        burst=burst,
+        sleep=clock.sleep,
+        clock=clock
+    )
+
+    # The k-th request can only be made once k - burst tokens have been added
+    times = sorted(time for _, time in espn.requests)
+    assert len(times) == 3 * (1 + 1 + 5)
+    assert all(time >= (k + 1 - burst) / rate - 1e-9 for k, time in enumerate(times))
+
+def test_token_bucket_allows_burst_then_rate():
+    clock = FakeClock()
+    bucket = fetcher.TokenBucket(rate=2.0, capacity=3, clock=clock, sleep=clock.sleep)
+
+    times = []
+    for _ in range(7):
+        bucket.acquire()
+        times.append(clock())
+
+    assert times == pytest.approx([0, 0, 0, 0.5, 1.0, 1.5, 2.0])
+
+def test_fetch_seasons_retries_transient_failures():
+    clock = FakeClock()
+    failures = {('league', 2024):[ConnectionError('reset')], ('week', 2024, 3):[TimeoutError(), OSError('502')]}
+    espn = StubESPN(failures=failures)
+
+    data = fetcher.fetch_seasons(
+        {2024:4},
+        league_factory=espn.league,
+        fetch_week=espn.fetch_week,
+        rate=1000,
+        burst=100,
+        backoff=1.0,
+        sleep=clock.sleep,
+        clock=clock
+    )
+
+    assert box_scores(data) == expected_data({2024:4})
+    assert [request for request, _ in espn.requests].count(('week', 2024, 3)) == 3
+    assert sorted(clock.sleeps) == [1.0, 1.0, 2.0]
+
+def test_fetch_seasons_gives_up_after_retries():
+    clock = FakeClock()
+    espn = StubESPN(failures={('week', 2024, 2):[ConnectionError()] * 3})
+
+    with pytest.raises(ConnectionError):
+        fetcher.fetch_seasons({2024:3}, league_factory=espn.league, fetch_week=espn.fetch_week, retries=2, sleep=clock.sleep, clock=clock)
+
+def test_call_with_retry_does_not_retry_other_errors():
+    calls = []
+
+    def fail():
+        calls.append(1)
+        raise KeyError('not transient')
+
+    with pytest.raises(KeyError):
+        fetcher.call_with_retry(fail, sleep=lambda seconds: None)
+
+    assert len(calls) == 1
+
+def test_espn_http_errors_are_retried():
+    espn_requests = pytest.importorskip('espn_api.requests.espn_requests')
+
+    assert issubclass(espn_requests.ESPNUnknownError, fetcher.RETRY_ON)
+    assert not issubclass(espn_requests.ESPNAccessDenied, fetcher.RETRY_ON)
+    assert not issubclass(espn_requests.ESPNInvalidLeague, fetcher.RETRY_ON)
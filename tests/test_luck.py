@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from python import functions, constants
+
+def loop_summary_table(data: pd.DataFrame, year: int, week: int = None) -> pd.DataFrame:
+    '''
+    summary_table() as it was before luck_scores(): one scalar luck call per game and one pass per team
+    '''
+    temp = data.loc[(data['Year'] == year) & (data['Playoff Flag'] == False)].copy()
+    if week != None:
+        temp = temp.loc[(data['Week'] <= week)]
+
+    mean = temp['Score'].mean()
+    std = temp['Score'].std() * 0.5
+
+    temp['Luck Score'] = [
+        functions.opp_luck_score(opp_score=opp_score, mean=mean, std=std)
+        + functions.your_luck_score(your_score=your_score, opp_score=opp_score, mean=mean, std=std)
+        + functions.close_luck_score(your_score=your_score, opp_score=opp_score)
+        for your_score, opp_score in temp[['Score','Opp Score']].values
+    ]
+
+    champ = functions.season_champion(data, year)
+    league_pfpg = round(temp['Score'].mean(), 2)
+
+    rows = []
+    for team in temp['Team'].unique():
+        temp_team = temp.loc[temp['Team'] == team]
+        wins = temp_team['Win'].sum()
+        losses = temp_team['Win'].eq(0).sum()
+        pf = round(temp_team['Score'].sum(), 2)
+        pfpg = round(temp_team['Score'].mean(), 2)
+        pa = round(temp_team['Opp Score'].sum(), 2)
+        papg = round(temp_team['Opp Score'].mean(), 2)
+
+        rows.append({
+            'Week':week,
+            'Year':year,
+            'Team':team,
+            'Wins':wins,
+            'Losses':losses,
+            'Record':f'{wins}-{losses}',
+            'Points For':pf,
+            'Points Against':pa,
+            'PF/G':pfpg,
+            'PF/G+':int(pfpg / league_pfpg * 100),
+            'PA/G':papg,
+            'PA/G+':int(papg / league_pfpg * 100),
+            'Avg Margin':round((pf - pa) / len(temp_team), 2),
+            'Luck Score':temp_team['Luck Score'].sum(),
+            'Champ Flag':int(champ == team)
+        })
+
+    standings = pd.DataFrame(rows)
+    standings.sort_values(['Wins','Points For'], ascending=False, ignore_index=True, inplace=True)
+    standings['Ranking'] = [i + 1 for i in standings.index]
+
+    return standings
+
+def year_weeks() -> list[tuple[int, int]]:
+    return [(year, week) for year, weeks in constants.YEARS_WEEKS for week in [*range(1, weeks + 1), None]]
+
+def test_luck_scores_match_scalar_functions():
+    games = constants.GAME_DATA.loc[constants.GAME_DATA['Playoff Flag'] == False]
+    mean, std = games['Score'].mean(), games['Score'].std() * 0.5
+
+    # Real games plus a tie and close wins and losses on both sides of the mean
+    your_score = np.concatenate([games['Score'].values, [100.0, mean + 1, mean - 1, 150.0, 80.0]])
+    opp_score = np.concatenate([games['Opp Score'].values, [100.0, mean - 1, mean + 1, 148.5, 82.99]])
+
+    opp_luck, your_luck, close_luck = functions.luck_scores(your_score=your_score, opp_score=opp_score, mean=mean, std=std)
+
+    assert opp_luck.tolist() == [functions.opp_luck_score(opp_score=opp, mean=mean, std=std) for opp in opp_score]
+    assert your_luck.tolist() == [
+        functions.your_luck_score(your_score=your, opp_score=opp, mean=mean, std=std)
+        for your, opp in zip(your_score, opp_score)
+    ]
+    assert close_luck.tolist() == [functions.close_luck_score(your_score=your, opp_score=opp) for your, opp in zip(your_score, opp_score)]
+    assert close_luck[len(games):].tolist() == [0, 1, -1, 1, -1]
+
+def scalar_luck_scores(your_score, opp_score, mean, std) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    luck = [
+        (
+            functions.opp_luck_score(opp_score=opp, mean=mean, std=std),
+            functions.your_luck_score(your_score=your, opp_score=opp, mean=mean, std=std),
+            functions.close_luck_score(your_score=your, opp_score=opp)
+        )
+        for your, opp in zip(your_score, opp_score)
+    ]
+
+    return tuple(np.array(scores) for scores in zip(*luck))
+
+@pytest.mark.parametrize('your_score, opp_score, mean, std', [
+    ([110.0, 90.0], [95.0, 120.0], 100.0, 7.5),
+    ([110.0, 90.0], [95.0, 120.0], 100.0, 0.0),
+    ([110.0, 90.0], [95.0, 120.0], 100.0, np.nan),
+    ([110.0, 90.0], [100.0, 120.0], 100.0, 7.5),
+    ([100.0, 90.0], [95.0, 120.0], 100.0, 0.0),
+    ([110.0], [95.0], 110.0, np.nan)
+], ids=['regular', 'zero std', 'nan std', 'opponent at mean', 'score at mean, zero std', 'one game'])
+def test_luck_scores_match_scalar_functions_on_degenerate_std(your_score, opp_score, mean, std):
+    try:
+        expected = scalar_luck_scores(your_score, opp_score, mean=mean, std=std)
+    except (ValueError, OverflowError) as error:
+        with pytest.raises(type(error)):
+            functions.luck_scores(your_score=your_score, opp_score=opp_score, mean=mean, std=std)
+        return
+
+    result = functions.luck_scores(your_score=your_score, opp_score=opp_score, mean=mean, std=std)
+    for scores, expected_scores in zip(result, expected):
+        assert scores.dtype == expected_scores.dtype
+        np.testing.assert_array_equal(scores, expected_scores)
+
+def test_summary_table_of_one_game_raises_like_loop():
+    game = constants.GAME_DATA.loc[constants.GAME_DATA['Playoff Flag'] == False].head(1)
+    year = int(game['Year'].iloc[0])
+
+    with pytest.raises(ValueError):
+        loop_summary_table(game, year=year)
+    with pytest.raises(ValueError):
+        functions.summary_table(game, year=year)
+
+@pytest.mark.parametrize('year, week', year_weeks())
+def test_summary_table_matches_loop(year, week):
+    expected = loop_summary_table(constants.GAME_DATA, year=year, week=week)
+    result = functions.summary_table(constants.GAME_DATA, year=year, week=week)
+
+    # Team is categorical and Wins narrow in the loaded tables, the luck scores keep the loop's integers
+    pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_categorical=False)
+    assert result['Luck Score'].dtype == expected['Luck Score'].dtype
+
+@pytest.fixture(scope='module')
+def cube():
+    return functions.standings_cube(constants.GAME_DATA)
+
+@pytest.mark.parametrize('year, week', year_weeks())
+def test_standings_cube_matches_loop(cube, year, week):
+    expected = loop_summary_table(constants.GAME_DATA, year=year, week=week)
+    result = functions.cube_standings(cube, year=year, week=week)
+
+    pd.testing.assert_frame_equal(result.reset_index(drop=True), expected, check_dtype=False, check_categorical=False)
@@ -0,0 +1,13 @@
+from python import constants, document
+
+def test_nav_follows_teams_and_weeks_without_invalidate(monkeypatch):
+    before = document.page_shell(active_year='team')[0]
+
+    monkeypatch.setattr(constants, 'TEAMS', [*constants.TEAMS, 'Newcomer'])
+    teams = document.page_shell(active_year='team')[0]
+    assert 'teams/Newcomer.html' in teams and 'teams/Newcomer.html' not in before
+
+    year, weeks = constants.YEARS_WEEKS[-1]
+    monkeypatch.setattr(constants, 'YEARS_WEEKS', [*constants.YEARS_WEEKS[:-1], (year, weeks + 1)])
+    shell = document.page_shell(active_year='team')[0]
+    assert f'seasons/{year}/week-{weeks + 1}.html' in shell and f'seasons/{year}/week-{weeks + 1}.html' not in teams
@@ -0,0 +1,90 @@
+import numpy as np
+import pytest
+
+from python import playoff_odds, home_page, standings, functions, cache
+
+def season(team_count: int, weeks: int = 3) -> dict:
+    '''
+    simulate() arguments for a league part way through its season: one scheduled week, then unscheduled weeks
+    '''
+    rng = np.random.default_rng(team_count)
+    teams = np.arange(team_count)
+
+    return dict(
+        wins=rng.integers(0, 6, team_count),
+        points_for=rng.normal(600, 50, team_count).round(2),
+        means=rng.normal(100, 10, team_count),
+        stds=np.full(team_count, 15.0),
+        schedule=[(teams[0:team_count - 1:2], teams[1::2]), *[None] * (weeks - 1)],
+        simulations=2000
+    )
+
+@pytest.mark.parametrize('playoff_teams', sorted(playoff_odds.BRACKETS))
+def test_simulate_same_seed_same_odds(playoff_teams):
+    first = playoff_odds.simulate(**season(10), playoff_teams=playoff_teams, seed=7)
+    second = playoff_odds.simulate(**season(10), playoff_teams=playoff_teams, seed=7)
+    other = playoff_odds.simulate(**season(10), playoff_teams=playoff_teams, seed=8)
+
+    for column in first:
+        np.testing.assert_array_equal(first[column], second[column])
+    assert any(not np.array_equal(first[column], other[column]) for column in first)
+
+@pytest.mark.parametrize('team_count', [8, 9, 12])
+@pytest.mark.parametrize('playoff_teams', sorted(playoff_odds.BRACKETS))
+def test_simulate_probabilities_sum_to_places(team_count, playoff_teams):
+    odds = playoff_odds.simulate(**season(team_count), playoff_teams=playoff_teams)
+    byes = playoff_odds.bye_seeds(playoff_odds.BRACKETS[playoff_teams])
+
+    assert odds['Playoffs'].sum() == pytest.approx(playoff_teams)
+    assert odds['Bye'].sum() == pytest.approx(byes)
+    assert odds['Champion'].sum() == pytest.approx(1)
+    for column in ['Playoffs','Bye','Champion']:
+        assert ((odds[column] >= 0) & (odds[column] <= 1)).all()
+
+def test_simulate_clinched_and_eliminated_teams():
+    # Two weeks left: the first six teams are in whatever happens and the last two are out,
+    # the first team has the bye locked up
+    wins = np.array([14, 9, 8, 8, 8, 8, 1, 0])
+    odds = playoff_odds.simulate(
+        wins=wins,
+        points_for=np.full(8, 1000.0),
+        means=np.full(8, 100.0),
+        stds=np.full(8, 20.0),
+        schedule=[None, None],
+        playoff_teams=6,
+        simulations=2000
+    )
+
+    assert odds['Playoffs'].tolist() == [1.0] * 6 + [0.0] * 2
+    assert odds['Bye'][0] == 1.0
+    assert odds['Bye'][6:].tolist() == [0.0, 0.0]
+    assert odds['Champion'][6:].tolist() == [0.0, 0.0]
+    assert (odds['Proj Wins'] >= wins).all() and (odds['Proj Wins'] <= wins + 2).all()
+
+def test_simulate_rejects_unknown_bracket():
+    with pytest.raises(ValueError):
+        playoff_odds.simulate(**season(10), playoff_teams=5)
+
+def test_playoff_odds_in_standings_order():
+    odds = playoff_odds.playoff_odds(year=home_page.YEAR, week=playoff_odds.odds_week(year=home_page.YEAR, week=99))
+    order = odds[['Playoffs','Bye','Champion','Proj Wins']].apply(tuple, axis=1).tolist()
+
+    assert order == sorted(order, reverse=True)
+
+def test_home_page_playoff_week_shows_last_regular_week_odds():
+    last_week = max(int(week) for week in standings.standings_cube().loc[home_page.YEAR, 'Week'])
+    playoff_week = last_week + 9
+
+    assert playoff_odds.odds_week(year=home_page.YEAR, week=playoff_week) == last_week
+    assert playoff_odds.odds_week(year=home_page.YEAR, week=0) is None
+
+    html = home_page.home_html(week=playoff_week)
+    expected = functions.df_to_table(
+        data=playoff_odds.odds_table(playoff_odds.playoff_odds(year=home_page.YEAR, week=last_week)),
+        table_id='playoff-odds-table'
+    )
+    rows = [line.strip() for line in expected.render().splitlines() if '<td' in line]
+    assert rows and all(row in html for row in rows)
+    dependencies = [cache.hash_data(data) for data in home_page.home_dependencies(week=playoff_week)[1:]]
+    assert dependencies == [cache.hash_data(data) for data in playoff_odds.odds_dependencies(year=home_page.YEAR, week=last_week)]
+    assert 'playoff-odds-table' not in home_page.home_html(week=0)
@@ -0,0 +1,65 @@
+from types import SimpleNamespace
+
+import pytest
+
+from python import raw_store
+
+def owner(name: str) -> SimpleNamespace:
+    return SimpleNamespace(owners=[{'firstName':name}])
+
+def season_data(weeks: int, home_score: float = 100.0) -> dict:
+    '''
+    fetcher.fetch_seasons() result of one season, with stand-ins for the espn_api objects
+    '''
+    league = SimpleNamespace(teams=[owner('Kevin'), owner('Zach')], draft=[])
+    matchup = lambda: SimpleNamespace(
+        matchup_type='NONE',
+        is_playoff=False,
+        home_team=owner('Kevin'),
+        home_score=home_score,
+        away_team=owner('Zach'),
+        away_score=90.0
+    )
+
+    return {'League':league, 'Players':[], 'Box Scores':{week:[matchup()] for week in range(1, weeks + 1)}}
+
+@pytest.fixture
+def index_writes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    writes = []
+    write_index = raw_store.write_index
+    monkeypatch.setattr(raw_store, 'write_index', lambda version, index: (writes.append(version), write_index(version, index)))
+
+    return writes
+
+def test_store_season_writes_index_once(index_writes):
+    written = raw_store.store_season(version=1, year=2024, season_data=season_data(weeks=14))
+
+    assert written == ['season'] + [f'week-{week}' for week in range(1, 15)]
+    assert index_writes == [1]
+    assert raw_store.weeks(1, 2024) == list(range(1, 15))
+    assert raw_store.read_week(1, 2024, 3)['matchups'][0]['home_score'] == 100.0
+
+def test_store_season_unchanged_writes_nothing(index_writes):
+    raw_store.store_season(version=1, year=2024, season_data=season_data(weeks=4))
+    index_writes.clear()
+
+    assert raw_store.store_season(version=1, year=2024, season_data=season_data(weeks=4)) == []
+    assert index_writes == []
+
+def test_store_season_rewrites_changed_weeks(index_writes):
+    raw_store.store_season(version=1, year=2024, season_data=season_data(weeks=4))
+    raw_store.store_season(version=1, year=2023, season_data=season_data(weeks=2))
+
+    assert raw_store.store_season(version=1, year=2024, season_data=season_data(weeks=5, home_score=120.0)) == ['week-1', 'week-2', 'week-3', 'week-4', 'week-5']
+    assert raw_store.years(1) == [2023, 2024]
+    assert raw_store.read_week(1, 2024, 1)['matchups'][0]['home_score'] == 120.0
+
+def test_write_week_without_index_updates_index(index_writes):
+    payload = {'year':2024, 'week':1, 'matchups':[]}
+
+    assert raw_store.write_week(1, 2024, 1, payload)
+    assert not raw_store.write_week(1, 2024, 1, payload)
+    assert index_writes == [1]
+    assert raw_store.weeks(1, 2024) == [1]
@@ -0,0 +1,104 @@
+import numpy as np
+import pandas as pd
+import pytest
+from dominate.tags import table, thead, tbody, tr, th, td, div
+
+from python import functions, constants
+
+def dominate_df_to_table(
+        data: pd.DataFrame,
+        custom_columns: list[str] = None,
+        row_id_columns: list[str] = None,
+        table_id: str = None,
+        champ_class: bool = False
+):
+    '''
+    df_to_table() as it was before table_rows(): one dominate tr and td per row and cell
+    '''
+    t = table()
+    head = thead()
+    body = tbody()
+
+    records = data.to_dict('records')
+
+    columns = data.columns
+    if custom_columns:
+        columns = custom_columns
+
+    column_row = tr()
+    for column in columns:
+        column_row.add(th(column, _class=str(column).lower().replace(' ','-')))
+    head.add(column_row)
+
+    for record in records:
+        data_row = tr(__pretty=False)
+        if champ_class:
+            if record['Champ Flag'] == 1:
+                data_row['class'] = 'champ'
+        if row_id_columns:
+            row_id = 'row'
+            for column in row_id_columns:
+                row_id += ('-' + str(record[column]).lower().replace(' ',''))
+            data_row['id'] = row_id
+
+        for column in columns:
+            data_row.add(td(record[column], _class=str(column).lower().replace(' ','-')))
+        body.add(data_row)
+
+    t.add(head)
+    t.add(body)
+    if table_id:
+        t['id'] = table_id
+
+    if len(data) > 20:
+        scroll_div = div(_class='scroll-table')
+        scroll_div.add(t)
+        return scroll_div
+
+    return t
+
+def mixed_frame(rows: int) -> pd.DataFrame:
+    '''
+    Frame with the cell types the site renders: text needing escaping, NaN, ints, floats and categoricals with missing values
+    '''
+    rng = np.random.default_rng(rows)
+    names = ['Kevin', 'A & B', '<b>Bold</b>', 'Quote "Q"', "O'Neil", 'Ünïcode', 'Two Words']
+
+    return pd.DataFrame({
+        'Team':[names[i % len(names)] for i in range(rows)],
+        'Year':np.arange(rows, dtype='int16') + 2018,
+        'Points For':np.round(rng.normal(1500, 100, rows), 2),
+        'Avg Margin':[np.nan if i % 5 == 0 else round(float(rng.normal(0, 10)), 2) for i in range(rows)],
+        'Player':pd.Categorical([None if i % 4 == 0 else names[(i * 3) % len(names)] for i in range(rows)]),
+        'Note':[np.nan if i % 3 == 0 else f'{i} > {i - 1}' for i in range(rows)],
+        'Champ Flag':[int(i % 6 == 1) for i in range(rows)]
+    })
+
+CASES = {
+    'plain':dict(),
+    'custom columns':dict(custom_columns=['Year','Team','Avg Margin']),
+    'champ class':dict(champ_class=True, table_id='season-summary-table'),
+    'row ids':dict(row_id_columns=['Team','Year'], table_id='league-draft-table'),
+    'champ class and row ids':dict(champ_class=True, row_id_columns=['Player','Note'])
+}
+
+@pytest.mark.parametrize('rows', [0, 1, 20, 21, 75])
+@pytest.mark.parametrize('case', CASES)
+def test_df_to_table_matches_dominate(rows, case):
+    data = mixed_frame(rows)
+
+    assert functions.df_to_table(data, **CASES[case]).render() == dominate_df_to_table(data, **CASES[case]).render()
+
+@pytest.mark.parametrize('pretty', [True, False])
+def test_df_to_table_matches_dominate_on_site_data(pretty):
+    data = constants.DRAFT_DATA
+    data = data.loc[data['Year'] == data['Year'].max()]
+    options = dict(row_id_columns=['Team','Round','Pick'], table_id='league-draft-table')
+
+    assert functions.df_to_table(data, **options).render(pretty=pretty) == dominate_df_to_table(data, **options).render(pretty=pretty)
+
+def test_table_rows_escape_attributes():
+    data = pd.DataFrame({'Team':['a"b'], 'Champ Flag':[1]})
+    rows = functions.table_rows(data, columns=['Team'], row_id_columns=['Team'], champ_class=True)
+
+    assert rows == ['<tr class="champ" id="row-a&quot;b"><td class="team">a&quot;b</td></tr>']